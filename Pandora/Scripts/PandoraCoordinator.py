@@ -33,11 +33,20 @@
 
 import os
 
-import sys, os, io, time, shutil, socket, traceback, subprocess, json
+import sys, os, io, time, shutil, socket, traceback, subprocess, json, threading
+import select, struct
 import random
 import string
+import heapq
+import sqlite3
+from collections import OrderedDict
 from functools import wraps
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 if sys.version[0] == "3":
     pyLibs = "Python37"
     pVersion = 3
@@ -53,12 +62,1288 @@ pndPath = os.path.join(
 sys.path.append(pndPath)
 import psutil
 
+# the file, log and command helpers are shared with the slave and the tray
+from PandoraCore import hashFile, FileTransfer, shipLog, isTransferTemp
+from PandoraCore import LogWriter, WarningStore, getLogIndexPath, getLogArchives
+from PandoraCore import strTypes, formatCmd, getCmdOrder, CommandChannel, parseCmds
+from PandoraCore import parseMethodCall
+
+
+# types of the required arguments of every command, which the coordinator accepts.
+# Additional arguments are allowed.
+cmdSchemas = {
+    "taskUpdate": [strTypes, strTypes, strTypes, object, object, object],
+    "setSetting": [strTypes, strTypes, strTypes, object],
+    "deleteJob": [strTypes],
+    "restartTask": [strTypes, object],
+    "disableTask": [strTypes, object, object],
+    "deleteWarning": [strTypes, strTypes, strTypes, object],
+    "clearWarnings": [strTypes, strTypes],
+    "clearLog": [strTypes, strTypes],
+    "collectJob": [strTypes],
+    "outputUpdate": [strTypes, list],
+}
+
+
+# watches folders for new or modified files with inotify. On platforms without inotify, or
+# when no watch could be added, "available" is False and the coordinator keeps polling.
+class FolderWatcher(object):
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+
+    def __init__(self):
+        self.fd = None
+        self.watches = {}
+        self.paths = {}
+
+        if not sys.platform.startswith("linux"):
+            return
+
+        try:
+            import ctypes, ctypes.util
+
+            self.libc = ctypes.CDLL(
+                ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+            )
+            fd = self.libc.inotify_init1(os.O_NONBLOCK)
+        except Exception:
+            return
+
+        if fd >= 0:
+            self.fd = fd
+
+    @property
+    def available(self):
+        return self.fd is not None and len(self.watches) > 0
+
+    def addWatch(self, path):
+        if self.fd is None or path in self.watches:
+            return
+
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_ONLYDIR
+        wd = self.libc.inotify_add_watch(
+            self.fd, path.encode(sys.getfilesystemencoding()), mask
+        )
+        if wd < 0:
+            return
+
+        self.watches[path] = wd
+        self.paths[wd] = path
+
+    # blocks until files changed in a watched folder or the timeout elapsed. Events, which
+    # arrive shortly after the first one, are collected into the same result.
+    def wait(self, timeout, collectTime=0.2):
+        changedPaths = set()
+        if self.fd is None:
+            return changedPaths
+
+        if not select.select([self.fd], [], [], max(timeout, 0))[0]:
+            return changedPaths
+
+        endTime = time.time() + collectTime
+        while True:
+            self.readEvents(changedPaths)
+            remaining = endTime - time.time()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                break
+
+        return changedPaths
+
+    def readEvents(self, changedPaths):
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError:
+            return
+
+        pos = 0
+        while pos + 16 <= len(data):
+            wd, mask, cookie, nameLen = struct.unpack_from("iIII", data, pos)
+            name = data[pos + 16 : pos + 16 + nameLen].rstrip(b"\0")
+            pos += 16 + nameLen
+
+            if mask & self.IN_IGNORED:
+                path = self.paths.pop(wd, None)
+                self.watches.pop(path, None)
+                continue
+
+            if wd not in self.paths:
+                continue
+
+            name = name.decode(sys.getfilesystemencoding(), "replace")
+            changedPaths.add(os.path.join(self.paths[wd], name))
+
+
+# keeps the ready tasks of every job in a heap, so that the assignment doesn't have to scan all
+# tasks in every cycle. Entries are validated lazily against the job config when they are popped.
+class ReadyQueue(object):
+    def __init__(self, jobIndex):
+        self.jobIndex = jobIndex
+        self.tasks = {}
+        self.queued = {}
+        self.priorities = {}
+        self.submitOrders = {}
+
+    def getSubmitOrder(self, jobConfig):
+        try:
+            submitDate = jobConfig["information"]["submitDate"]
+            return time.mktime(time.strptime(submitDate, "%d.%m.%y, %H:%M:%S"))
+        except Exception:
+            return 0
+
+    # rebuilds the queue of a job after its config was (re)loaded
+    def updateJob(self, jobCode, jobConfig):
+        self.tasks[jobCode] = []
+        self.queued[jobCode] = set()
+        self.submitOrders[jobCode] = self.getSubmitOrder(jobConfig)
+
+        for taskName, taskData in jobConfig.get("jobtasks", {}).items():
+            if self.isReady(taskData):
+                self.queued[jobCode].add(taskName)
+                self.tasks[jobCode].append(taskName)
+
+        heapq.heapify(self.tasks[jobCode])
+
+    def removeJob(self, jobCode):
+        self.tasks.pop(jobCode, None)
+        self.queued.pop(jobCode, None)
+        self.submitOrders.pop(jobCode, None)
+
+    def isReady(self, taskData):
+        return type(taskData) == list and len(taskData) == 7 and taskData[2] == "ready"
+
+    def updateTask(self, jobCode, taskName, taskData):
+        if jobCode not in self.tasks or not self.isReady(taskData):
+            return
+
+        if taskName not in self.queued[jobCode]:
+            self.queued[jobCode].add(taskName)
+            heapq.heappush(self.tasks[jobCode], taskName)
+
+    # takes the priorities from the PriorityList. Jobs, which are not listed there, don't get assigned.
+    def setPriorities(self, jobPrios):
+        self.priorities = {}
+        for jobCode in jobPrios:
+            try:
+                self.priorities[jobCode] = float(jobPrios[jobCode]["priority"])
+            except Exception:
+                continue
+
+    # returns the jobs, which have ready tasks, sorted by priority and submit order
+    def getJobs(self):
+        jobCodes = [x for x in self.priorities if self.tasks.get(x)]
+        return sorted(
+            jobCodes,
+            key=lambda x: (-self.priorities[x], self.submitOrders.get(x, 0), x),
+        )
+
+    # returns the first task of the job, which is still ready. The task stays in the queue until
+    # it is assigned and then gets dropped the next time the queue of the job is accessed.
+    def getNextTask(self, jobCode):
+        heap = self.tasks.get(jobCode)
+        while heap:
+            taskName = heap[0]
+            if self.isReady(self.jobIndex.getTask(jobCode, taskName)):
+                return taskName
+
+            heapq.heappop(heap)
+            self.queued[jobCode].discard(taskName)
+
+        return None
+
+    # yields the ready tasks of the job in order. The heap is walked through a second heap of
+    # positions, so that only the tasks, which are looked at, get ordered.
+    def iterReadyTasks(self, jobCode):
+        if self.getNextTask(jobCode) is None:
+            return
+
+        heap = list(self.tasks[jobCode])
+        candidates = [(heap[0], 0)]
+        while candidates:
+            taskName, pos = heapq.heappop(candidates)
+            if self.isReady(self.jobIndex.getTask(jobCode, taskName)):
+                yield taskName
+
+            for child in [2 * pos + 1, 2 * pos + 2]:
+                if child < len(heap):
+                    heapq.heappush(candidates, (heap[child], child))
+
+    def getReadyCount(self):
+        return sum(len(x) for x in self.tasks.values())
+
+
+# keeps the deadlines of all assigned and rendering tasks in a heap and the tasks, which
+# occupy every slave. Both are updated with every task change, so that a cycle only needs
+# to look at the expired tasks. Entries are validated lazily, when they are popped.
+class TaskTracker(object):
+    def __init__(self, jobIndex):
+        self.jobIndex = jobIndex
+        self.deadlines = []
+        self.slaveTasks = {}
+        self.taskSlaves = {}
+
+    def isActive(self, taskData):
+        return (
+            type(taskData) == list
+            and len(taskData) == 7
+            and taskData[2] in ["assigned", "rendering"]
+        )
+
+    # returns the time, when the task times out or None, if it has no timeout
+    def getDeadline(self, jobCode, taskData):
+        try:
+            startTime = float(taskData[5])
+        except (TypeError, ValueError):
+            return None
+
+        if taskData[2] == "assigned":
+            timeout = getattr(self.jobIndex.coord, "assignTimeout", 15)
+        else:
+            timeout = self.jobIndex.getValue(jobCode, "jobglobals", "taskTimeout")
+
+        try:
+            return startTime + float(timeout) * 60
+        except (TypeError, ValueError):
+            return None
+
+    def updateTask(self, jobCode, taskName, taskData):
+        key = (jobCode, taskName)
+        slaveName = self.taskSlaves.pop(key, None)
+        if slaveName is not None:
+            self.slaveTasks[slaveName].discard(key)
+            if len(self.slaveTasks[slaveName]) == 0:
+                del self.slaveTasks[slaveName]
+
+        if not self.isActive(taskData):
+            return
+
+        self.taskSlaves[key] = taskData[3]
+        self.slaveTasks.setdefault(taskData[3], set()).add(key)
+
+        deadline = self.getDeadline(jobCode, taskData)
+        if deadline is not None:
+            heapq.heappush(self.deadlines, (deadline, jobCode, taskName))
+
+    def updateJob(self, jobCode, jobConfig):
+        self.removeJob(jobCode)
+        for taskName, taskData in jobConfig.get("jobtasks", {}).items():
+            self.updateTask(jobCode, taskName, taskData)
+
+    def removeJob(self, jobCode):
+        for key in [x for x in self.taskSlaves if x[0] == jobCode]:
+            self.updateTask(key[0], key[1], None)
+
+    # recalculates all deadlines, e.g. after a timeout setting changed
+    def rebuildDeadlines(self):
+        self.deadlines = []
+        for jobCode, taskName in self.taskSlaves:
+            taskData = self.jobIndex.getTask(jobCode, taskName)
+            deadline = self.getDeadline(jobCode, taskData)
+            if deadline is not None:
+                self.deadlines.append((deadline, jobCode, taskName))
+
+        heapq.heapify(self.deadlines)
+
+    # returns the tasks, which are assigned or rendering for longer than their timeout
+    def popExpired(self, curTime):
+        expired = []
+        while self.deadlines and self.deadlines[0][0] <= curTime:
+            deadline, jobCode, taskName = heapq.heappop(self.deadlines)
+            taskData = self.jobIndex.getTask(jobCode, taskName)
+            if not self.isActive(taskData):
+                continue
+
+            curDeadline = self.getDeadline(jobCode, taskData)
+            if curDeadline is None:
+                continue
+
+            if curDeadline > curTime:
+                if curDeadline != deadline:
+                    heapq.heappush(self.deadlines, (curDeadline, jobCode, taskName))
+                continue
+
+            if (jobCode, taskName) not in expired:
+                expired.append((jobCode, taskName))
+
+        return expired
+
+    def getSlaveTasks(self, slaveName):
+        return self.slaveTasks.get(slaveName, set())
+
+
+# keeps the dependencies between the jobs and which tasks of every job are not finished yet.
+# It is updated with every task change, so that the scheduler can check the dependencies of a
+# job without reading the configs of the dependent jobs.
+# A dependency is [jobCode, nodePath] or [jobCode, nodePath, "frames"]. The first one waits for
+# the whole job, the second one only for the tasks of the job, which overlap the frames of a task.
+class DependencyGraph(object):
+    def __init__(self, jobIndex):
+        self.jobIndex = jobIndex
+        self.deps = {}
+        self.frameDeps = {}
+        self.unfinished = {}
+        self.taskSlaves = {}
+        self.taskRanges = {}
+        self.slaveCache = {}
+
+    def isFinishedTask(self, taskData):
+        return type(taskData) == list and len(taskData) == 7 and taskData[2] == "finished"
+
+    def getTaskRange(self, taskData):
+        try:
+            return (float(taskData[0]), float(taskData[1]))
+        except (IndexError, TypeError, ValueError):
+            return None
+
+    def updateJob(self, jobCode, jobConfig):
+        self.updateDeps(jobCode, jobConfig)
+
+        self.unfinished[jobCode] = set()
+        self.taskSlaves[jobCode] = {}
+        self.taskRanges[jobCode] = {}
+        self.slaveCache.pop(jobCode, None)
+        for taskName, taskData in jobConfig.get("jobtasks", {}).items():
+            self.updateTask(jobCode, taskName, taskData)
+
+    def updateDeps(self, jobCode, jobConfig):
+        jobDeps = jobConfig.get("jobglobals", {}).get("jobDependecies") or []
+        self.deps[jobCode] = [x[0] for x in jobDeps if len(x) >= 2]
+        self.frameDeps[jobCode] = [
+            x[0] for x in jobDeps if len(x) >= 3 and x[2] == "frames"
+        ]
+
+    def updateTask(self, jobCode, taskName, taskData):
+        if jobCode not in self.unfinished:
+            return
+
+        self.slaveCache.pop(jobCode, None)
+        taskRange = self.getTaskRange(taskData)
+        if taskRange is not None:
+            self.taskRanges[jobCode][taskName] = taskRange
+
+        if self.isFinishedTask(taskData):
+            self.unfinished[jobCode].discard(taskName)
+            self.taskSlaves[jobCode][taskName] = taskData[3]
+        else:
+            self.unfinished[jobCode].add(taskName)
+            self.taskSlaves[jobCode].pop(taskName, None)
+
+    def removeJob(self, jobCode):
+        self.deps.pop(jobCode, None)
+        self.frameDeps.pop(jobCode, None)
+        self.unfinished.pop(jobCode, None)
+        self.taskSlaves.pop(jobCode, None)
+        self.taskRanges.pop(jobCode, None)
+        self.slaveCache.pop(jobCode, None)
+
+    def getDeps(self, jobCode):
+        return self.deps.get(jobCode, [])
+
+    def getFrameDeps(self, jobCode):
+        return self.frameDeps.get(jobCode, [])
+
+    def isFinished(self, jobCode):
+        return jobCode in self.unfinished and len(self.unfinished[jobCode]) == 0
+
+    # returns the slaves, which rendered the tasks of a finished job
+    def getFinishedSlaves(self, jobCode):
+        if jobCode not in self.slaveCache:
+            self.slaveCache[jobCode] = set(self.taskSlaves.get(jobCode, {}).values())
+
+        return self.slaveCache[jobCode]
+
+    # returns if the tasks of a job, which overlap the frame range, are finished and the slaves,
+    # which rendered them. Frames, which are not part of the job, wait for the whole job.
+    def getRangeState(self, jobCode, taskData):
+        taskRange = self.getTaskRange(taskData)
+        overlapping = []
+        if taskRange is not None:
+            overlapping = [
+                x
+                for x, y in self.taskRanges.get(jobCode, {}).items()
+                if y[0] <= taskRange[1] and y[1] >= taskRange[0]
+            ]
+
+        if len(overlapping) == 0:
+            if self.isFinished(jobCode):
+                return True, self.getFinishedSlaves(jobCode)
+            else:
+                return False, set()
+
+        unfinished = self.unfinished.get(jobCode, set())
+        if any(x in unfinished for x in overlapping):
+            return False, set()
+
+        taskSlaves = self.taskSlaves[jobCode]
+        return True, set(taskSlaves[x] for x in overlapping if x in taskSlaves)
+
+    def getMissingDeps(self, jobCode):
+        return [x for x in self.getDeps(jobCode) if self.jobIndex.getJob(x) is None]
+
+    # returns the list of jobs, which form a dependency cycle starting at jobCode or None
+    def findCycle(self, jobCode):
+        path = []
+        visited = set()
+
+        def visit(curJob):
+            if curJob in path:
+                return path[path.index(curJob) :] + [curJob]
+
+            if curJob in visited:
+                return None
+
+            visited.add(curJob)
+            if self.jobIndex.getJob(curJob) is None:
+                return None
+
+            path.append(curJob)
+            for dep in self.getDeps(curJob):
+                cycle = visit(dep)
+                if cycle is not None:
+                    return cycle
+
+            path.pop()
+            return None
+
+        return visit(jobCode)
+
+
+# stores every job in its PandoraJob.json file in the job folder
+class JsonJobStore(object):
+    name = "json"
+
+    def __init__(self, coordinator, jobPath):
+        self.coord = coordinator
+        self.jobPath = jobPath
+
+    def getConfPath(self, jobCode):
+        return os.path.join(self.jobPath, jobCode, "PandoraJob.json")
+
+    def getKey(self, jobCode):
+        confPath = self.getConfPath(jobCode)
+        try:
+            fstat = os.stat(confPath)
+        except OSError:
+            return None
+
+        return (confPath, fstat.st_mtime, fstat.st_size)
+
+    def getKeys(self):
+        keys = {}
+        for jobCode in os.listdir(self.jobPath):
+            keys[jobCode] = self.getKey(jobCode)
+
+        return keys
+
+    def loadJob(self, jobCode):
+        return self.coord.getConfig(configPath=self.getConfPath(jobCode), getConf=True)
+
+    def writeJob(self, jobCode, jobConfig, suppressError=True):
+        self.coord.setConfig(
+            configPath=self.getConfPath(jobCode),
+            confData=jobConfig,
+            suppressError=suppressError,
+        )
+        return self.getKey(jobCode)
+
+    def writeTasks(self, jobCode, taskNames, jobConfig, suppressError=True):
+        return self.writeJob(jobCode, jobConfig, suppressError=suppressError)
+
+    def removeJob(self, jobCode):
+        pass
+
+    def exportJob(self, jobCode):
+        pass
+
+    def exportJobs(self):
+        pass
+
+
+# stores the jobs in a SQLite database with one row per task, so that a task update doesn't
+# rewrite the whole job. The job folders stay in the repository. New job folders and
+# PandoraJob.json files, which were modified outside of the store, get imported automatically.
+# The PandoraJob.json files are only written as snapshots for the workstations and slaves.
+class SqliteJobStore(object):
+    name = "sqlite"
+
+    def __init__(self, coordinator, jobPath, dbPath):
+        self.coord = coordinator
+        self.jobPath = jobPath
+        self.dbPath = dbPath
+        self.dirtyJobs = set()
+
+        self.conn = sqlite3.connect(dbPath)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (jobCode TEXT PRIMARY KEY, config TEXT NOT NULL, version INTEGER NOT NULL, fileTime REAL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks (jobCode TEXT NOT NULL, taskName TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (jobCode, taskName))"
+            )
+
+    def getConfPath(self, jobCode):
+        return os.path.join(self.jobPath, jobCode, "PandoraJob.json")
+
+    def getVersion(self, jobCode):
+        row = self.conn.execute(
+            "SELECT version FROM jobs WHERE jobCode = ?", (jobCode,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return row[0]
+
+    def getFileTime(self, jobCode):
+        try:
+            return os.path.getmtime(self.getConfPath(jobCode))
+        except OSError:
+            return None
+
+    # returns the current version of the job and imports the PandoraJob.json, if the job is
+    # not in the database yet or the file was modified since it was imported or exported
+    def checkJob(self, jobCode, row):
+        fileTime = self.getFileTime(jobCode)
+        if row is None or (
+            fileTime is not None and jobCode not in self.dirtyJobs and fileTime != row[1]
+        ):
+            return self.importJob(jobCode)
+
+        return row[0]
+
+    def getKey(self, jobCode):
+        if not os.path.isdir(os.path.join(self.jobPath, jobCode)):
+            self.removeJob(jobCode)
+            return None
+
+        row = self.conn.execute(
+            "SELECT version, fileTime FROM jobs WHERE jobCode = ?", (jobCode,)
+        ).fetchone()
+        version = self.checkJob(jobCode, row)
+        if version is None:
+            return None
+
+        return (self.dbPath, version)
+
+    def getKeys(self):
+        jobCodes = [
+            x for x in os.listdir(self.jobPath) if os.path.isdir(os.path.join(self.jobPath, x))
+        ]
+        rows = dict(
+            (x[0], x[1:])
+            for x in self.conn.execute("SELECT jobCode, version, fileTime FROM jobs")
+        )
+
+        for jobCode in rows:
+            if jobCode not in jobCodes:
+                self.removeJob(jobCode)
+
+        keys = {}
+        for jobCode in jobCodes:
+            version = self.checkJob(jobCode, rows.get(jobCode))
+            if version is not None:
+                keys[jobCode] = (self.dbPath, version)
+
+        return keys
+
+    # reads the PandoraJob.json of a job folder into the database
+    def importJob(self, jobCode):
+        fileTime = self.getFileTime(jobCode)
+        jobConfig = self.coord.getConfig(configPath=self.getConfPath(jobCode), getConf=True)
+        if not jobConfig:
+            return None
+
+        version = (self.getVersion(jobCode) or 0) + 1
+        self.saveJob(jobCode, jobConfig, version, fileTime)
+        self.dirtyJobs.discard(jobCode)
+        return version
+
+    def importJobs(self):
+        self.exportJobs()
+        jobCodes = [
+            x for x in os.listdir(self.jobPath) if os.path.isdir(os.path.join(self.jobPath, x))
+        ]
+        imported = 0
+        for jobCode in jobCodes:
+            if self.importJob(jobCode) is not None:
+                imported += 1
+
+        return imported
+
+    def saveJob(self, jobCode, jobConfig, version, fileTime):
+        jobSettings = dict((k, v) for k, v in jobConfig.items() if k != "jobtasks")
+        tasks = [
+            (jobCode, k, json.dumps(v)) for k, v in jobConfig.get("jobtasks", {}).items()
+        ]
+
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE jobCode = ?", (jobCode,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO jobs (jobCode, config, version, fileTime) VALUES (?, ?, ?, ?)",
+                (jobCode, json.dumps(jobSettings), version, fileTime),
+            )
+            self.conn.executemany(
+                "INSERT INTO tasks (jobCode, taskName, data) VALUES (?, ?, ?)", tasks
+            )
+
+    def loadJob(self, jobCode):
+        row = self.conn.execute(
+            "SELECT config FROM jobs WHERE jobCode = ?", (jobCode,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        jobConfig = json.loads(row[0])
+        jobConfig["jobtasks"] = OrderedDict()
+        for taskName, data in self.conn.execute(
+            "SELECT taskName, data FROM tasks WHERE jobCode = ? ORDER BY taskName", (jobCode,)
+        ):
+            jobConfig["jobtasks"][taskName] = json.loads(data)
+
+        return jobConfig
+
+    def writeJob(self, jobCode, jobConfig, suppressError=True):
+        row = self.conn.execute(
+            "SELECT version, fileTime FROM jobs WHERE jobCode = ?", (jobCode,)
+        ).fetchone() or (0, None)
+        version = row[0] + 1
+        self.saveJob(jobCode, jobConfig, version, row[1])
+        self.dirtyJobs.add(jobCode)
+        return (self.dbPath, version)
+
+    def writeTasks(self, jobCode, taskNames, jobConfig, suppressError=True):
+        tasks = [
+            (jobCode, x, json.dumps(jobConfig["jobtasks"][x]))
+            for x in taskNames
+            if x in jobConfig["jobtasks"]
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tasks (jobCode, taskName, data) VALUES (?, ?, ?)",
+                tasks,
+            )
+            self.conn.execute(
+                "UPDATE jobs SET version = version + 1 WHERE jobCode = ?", (jobCode,)
+            )
+
+        self.dirtyJobs.add(jobCode)
+        return (self.dbPath, self.getVersion(jobCode))
+
+    def removeJob(self, jobCode):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE jobCode = ?", (jobCode,))
+            self.conn.execute("DELETE FROM jobs WHERE jobCode = ?", (jobCode,))
+
+        self.dirtyJobs.discard(jobCode)
+
+    # writes the PandoraJob.json snapshot of a job, if it changed since the last export
+    def exportJob(self, jobCode):
+        if jobCode not in self.dirtyJobs:
+            return
+
+        self.dirtyJobs.discard(jobCode)
+        jobConfig = self.loadJob(jobCode)
+        if jobConfig is None or not os.path.isdir(os.path.join(self.jobPath, jobCode)):
+            return
+
+        self.coord.setConfig(configPath=self.getConfPath(jobCode), confData=jobConfig)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET fileTime = ? WHERE jobCode = ?",
+                (self.getFileTime(jobCode), jobCode),
+            )
+
+    def exportJobs(self):
+        for jobCode in list(self.dirtyJobs):
+            self.exportJob(jobCode)
+
+    def close(self):
+        self.exportJobs()
+        self.conn.close()
+
+
+# holds the parsed config of every job in the repository. A job is only loaded again from the
+# job store when its key (file mtime for json, row version for sqlite) changed since it was loaded.
+class JobIndex(object):
+    def __init__(self, coordinator, jobPath, store=None):
+        self.coord = coordinator
+        self.jobPath = jobPath
+        self.store = store or JsonJobStore(coordinator, jobPath)
+        self.jobs = {}
+        self.hits = 0
+        self.misses = 0
+        self.readyQueue = ReadyQueue(self)
+        self.taskTracker = TaskTracker(self)
+        self.depGraph = DependencyGraph(self)
+        self.batchJobs = None
+        self.unwrittenJobs = {}  # changes, which couldn't be written and are written again
+
+    def getConfPath(self, jobCode):
+        return self.store.getConfPath(jobCode)
+
+    # keeps all changes in memory until commitBatch is called, so that every job gets written
+    # only once. The changed tasks of a job are collected, None means the whole job changed.
+    def beginBatch(self):
+        self.batchJobs = {}
+
+    # writes all jobs, which changed since beginBatch. Returns False, if a job couldn't be written.
+    # The changes of such a job stay in memory and are written again with the next batch, so that
+    # the commands, which caused them, don't need to be applied again.
+    def commitBatch(self):
+        batchJobs = self.batchJobs or {}
+        self.batchJobs = None
+
+        unwrittenJobs = self.unwrittenJobs
+        self.unwrittenJobs = {}
+        for jobCode, taskNames in unwrittenJobs.items():
+            if jobCode not in batchJobs:
+                batchJobs[jobCode] = taskNames
+            elif batchJobs[jobCode] is None or taskNames is None:
+                batchJobs[jobCode] = None
+            else:
+                batchJobs[jobCode] = batchJobs[jobCode] | taskNames
+
+        success = True
+        for jobCode in sorted(batchJobs):
+            if not self.flushJob(jobCode, batchJobs[jobCode]):
+                self.unwrittenJobs[jobCode] = batchJobs[jobCode]
+                success = False
+
+        return success
+
+    def flushJob(self, jobCode, taskNames):
+        if jobCode not in self.jobs:
+            return True
+
+        jobConfig = self.jobs[jobCode]["config"]
+        try:
+            if taskNames is None:
+                jobKey = self.store.writeJob(jobCode, jobConfig, suppressError=False)
+            else:
+                jobKey = self.store.writeTasks(
+                    jobCode, sorted(taskNames), jobConfig, suppressError=False
+                )
+        except Exception as e:
+            self.coord.writeLog("ERROR - could not write job %s - %s" % (jobCode, e), 3)
+            return False
+
+        self.jobs[jobCode]["key"] = jobKey
+        return True
+
+    # checks the key of every job and reloads only the ones, which changed in the store
+    def refresh(self):
+        if not os.path.exists(self.jobPath):
+            self.jobs = {}
+            return
+
+        jobKeys = self.store.getKeys()
+        for jobCode in list(self.jobs):
+            if jobCode not in jobKeys:
+                self.removeJob(jobCode)
+
+        for jobCode in jobKeys:
+            self.loadJob(jobCode, jobKeys[jobCode])
+
+    def loadJob(self, jobCode, jobKey=None):
+        if jobKey is None:
+            jobKey = self.store.getKey(jobCode)
+
+        if jobKey is None:
+            self.removeJob(jobCode)
+            return None
+
+        entry = self.jobs.get(jobCode)
+        if entry is not None and entry["key"] == jobKey:
+            self.hits += 1
+            return entry["config"]
+
+        self.misses += 1
+        jobConfig = self.store.loadJob(jobCode)
+        if jobConfig is None:
+            self.removeJob(jobCode)
+            return None
+
+        self.jobs[jobCode] = {"key": jobKey, "config": jobConfig}
+        self.readyQueue.updateJob(jobCode, jobConfig)
+        self.taskTracker.updateJob(jobCode, jobConfig)
+        self.depGraph.updateJob(jobCode, jobConfig)
+        return jobConfig
+
+    def getJob(self, jobCode):
+        if jobCode in self.jobs:
+            return self.jobs[jobCode]["config"]
+
+        return self.loadJob(jobCode)
+
+    def getJobCodes(self):
+        return sorted(self.jobs)
+
+    def getValue(self, jobCode, cat, param):
+        jobConfig = self.getJob(jobCode)
+        if jobConfig is None or cat not in jobConfig:
+            return None
+
+        return jobConfig[cat].get(param)
+
+    def getJobName(self, jobCode):
+        jobName = self.getValue(jobCode, "information", "jobName")
+        if jobName is None:
+            return jobCode
+
+        return jobName
+
+    def getTask(self, jobCode, taskName):
+        return self.getValue(jobCode, "jobtasks", taskName)
+
+    def setValue(self, jobCode, cat, param, val):
+        jobConfig = self.getJob(jobCode)
+        if jobConfig is None:
+            return False
+
+        if cat not in jobConfig:
+            jobConfig[cat] = {}
+
+        jobConfig[cat][param] = val
+        if cat == "jobtasks":
+            self.readyQueue.updateTask(jobCode, param, val)
+            self.taskTracker.updateTask(jobCode, param, val)
+            self.depGraph.updateTask(jobCode, param, val)
+        elif cat == "jobglobals" and param == "taskTimeout":
+            self.taskTracker.updateJob(jobCode, jobConfig)
+        elif cat == "jobglobals" and param == "jobDependecies":
+            self.depGraph.updateDeps(jobCode, jobConfig)
+
+        if self.batchJobs is not None:
+            if cat == "jobtasks" and self.batchJobs.get(jobCode, set()) is not None:
+                self.batchJobs.setdefault(jobCode, set()).add(param)
+            else:
+                self.batchJobs[jobCode] = None
+        elif cat == "jobtasks":
+            self.jobs[jobCode]["key"] = self.store.writeTasks(jobCode, [param], jobConfig)
+        else:
+            self.writeJob(jobCode)
+
+        return True
+
+    def setTask(self, jobCode, taskName, taskData):
+        return self.setValue(jobCode, "jobtasks", taskName, taskData)
+
+    def writeJob(self, jobCode):
+        self.jobs[jobCode]["key"] = self.store.writeJob(jobCode, self.jobs[jobCode]["config"])
+
+    def removeJob(self, jobCode):
+        self.jobs.pop(jobCode, None)
+        self.readyQueue.removeJob(jobCode)
+        self.taskTracker.removeJob(jobCode)
+        self.depGraph.removeJob(jobCode)
+        self.store.removeJob(jobCode)
+        self.unwrittenJobs.pop(jobCode, None)
+        if self.batchJobs is not None:
+            self.batchJobs.pop(jobCode, None)
+
+    def exportJob(self, jobCode):
+        if self.batchJobs is not None and jobCode in self.batchJobs:
+            taskNames = self.batchJobs.pop(jobCode)
+            if not self.flushJob(jobCode, taskNames):
+                self.unwrittenJobs[jobCode] = taskNames
+
+        self.store.exportJob(jobCode)
+
+    def exportJobs(self):
+        self.store.exportJobs()
+
+    def getStats(self):
+        return "%s: %s jobs, %s hits, %s misses, %s queued tasks" % (
+            self.store.name,
+            len(self.jobs),
+            self.hits,
+            self.misses,
+            self.readyQueue.getReadyCount(),
+        )
+
+
+# caches the slaveSettings of every slave. A settings file is only parsed again, when the
+# (path, mtime, size) key of the file changed. The members of every slave group are kept in
+# sets, so that the slaves of a job can be found with set operations.
+class SlaveRegistry(object):
+    def __init__(self, coordinator, slavePath):
+        self.coord = coordinator
+        self.slavePath = slavePath
+        self.slaves = {}
+        self.heartbeats = {}
+        self.groupSlaves = None
+        self.loads = 0
+
+    def getConfPath(self, slaveName):
+        return os.path.join(
+            self.slavePath, "S_%s" % slaveName, "slaveSettings_%s.json" % slaveName
+        )
+
+    def getHeartbeatPath(self, slaveName):
+        return os.path.join(
+            self.slavePath, "S_%s" % slaveName, "slaveHeartbeat_%s.json" % slaveName
+        )
+
+    # reads the heartbeat, which the slave writes every cycle. The modification time of the
+    # file is used as contact time, so that the clock of the slave doesn't matter.
+    def loadHeartbeat(self, slaveName):
+        try:
+            with open(self.getHeartbeatPath(slaveName), "r") as heartbeatFile:
+                heartbeat = json.load(heartbeatFile)
+                heartbeat["mtime"] = os.fstat(heartbeatFile.fileno()).st_mtime
+        except Exception:
+            self.heartbeats.pop(slaveName, None)
+            return None
+
+        self.heartbeats[slaveName] = heartbeat
+        return heartbeat
+
+    def getFileKey(self, confPath):
+        try:
+            fstat = os.stat(confPath)
+        except OSError:
+            return None
+
+        return (confPath, fstat.st_mtime, fstat.st_size)
+
+    def refresh(self):
+        if not os.path.exists(self.slavePath):
+            self.slaves = {}
+            self.groupSlaves = None
+            return
+
+        slaveNames = [x[len("S_") :] for x in os.listdir(self.slavePath) if x.startswith("S_")]
+        for slaveName in list(self.slaves):
+            if slaveName not in slaveNames:
+                del self.slaves[slaveName]
+                self.groupSlaves = None
+
+        for slaveName in slaveNames:
+            self.loadSlave(slaveName)
+
+    def loadSlave(self, slaveName):
+        fileKey = self.getFileKey(self.getConfPath(slaveName))
+        if fileKey is None:
+            if self.slaves.pop(slaveName, None) is not None:
+                self.groupSlaves = None
+            return None
+
+        entry = self.slaves.get(slaveName)
+        if entry is not None and entry["key"] == fileKey:
+            return entry["config"]
+
+        self.loads += 1
+        slaveConfig = self.coord.getConfig(configPath=fileKey[0], getConf=True)
+        if slaveConfig is None:
+            slaveConfig = {}
+
+        self.slaves[slaveName] = {"key": fileKey, "config": slaveConfig}
+        self.groupSlaves = None
+        return slaveConfig
+
+    def getSlave(self, slaveName):
+        if slaveName in self.slaves:
+            return self.slaves[slaveName]["config"]
+
+        return self.loadSlave(slaveName)
+
+    def getValue(self, slaveName, cat, param):
+        slaveConfig = self.getSlave(slaveName)
+        if slaveConfig is None or cat not in slaveConfig:
+            return None
+
+        return slaveConfig[cat].get(param)
+
+    def getGroups(self, slaveName):
+        return self.getValue(slaveName, "settings", "slaveGroup")
+
+    def getMaxTasks(self, slaveName):
+        return self.getValue(slaveName, "settings", "maxConcurrentTasks")
+
+    # slaves, which don't write a heartbeat yet, store their state in the settings
+    def getStatus(self, slaveName):
+        if slaveName in self.heartbeats:
+            return self.heartbeats[slaveName].get("state")
+
+        return self.getValue(slaveName, "slaveinfo", "status")
+
+    def getCurTasks(self, slaveName):
+        if slaveName in self.heartbeats:
+            return self.heartbeats[slaveName].get("curtasks")
+
+        return self.getValue(slaveName, "slaveinfo", "curtasks")
+
+    def getGroupSlaves(self):
+        if self.groupSlaves is None:
+            self.groupSlaves = {None: set()}
+            for slaveName in self.slaves:
+                slaveGroups = self.getGroups(slaveName)
+                if slaveGroups is None:
+                    continue
+
+                # slaves with a group list, including an empty one
+                self.groupSlaves[None].add(slaveName)
+                for group in slaveGroups:
+                    self.groupSlaves.setdefault(group, set()).add(slaveName)
+
+        return self.groupSlaves
+
+    # returns the slaves, which are in all of the groups (whiteList) or in none of them
+    def getSlavesInGroups(self, groups, whiteList=True):
+        groupSlaves = self.getGroupSlaves()
+        if whiteList:
+            slaves = set(groupSlaves[None])
+            for group in groups:
+                slaves &= groupSlaves.get(group, set())
+        else:
+            slaves = set(groupSlaves[None])
+            for group in groups:
+                slaves -= groupSlaves.get(group, set())
+
+        return slaves
+
+    def getStats(self):
+        return "%s slaves, %s loads" % (len(self.slaves), self.loads)
+
+
+# keeps the output files, which the slaves published with their finished tasks, and if they
+# were collected already. Every job has its own index file, so that the output folders don't
+# need to be walked to find the files, which still have to be collected.
+class OutputIndex(object):
+    def __init__(self, coordinator, indexPath):
+        self.coord = coordinator
+        self.indexPath = indexPath
+        self.jobs = {}
+        self.dirty = set()
+
+    def getIndexPath(self, jobCode):
+        return os.path.join(self.indexPath, "%s.json" % jobCode)
+
+    # returns {relPath: [size, mtime, hash, slave, collected]}
+    def getJob(self, jobCode):
+        if jobCode not in self.jobs:
+            try:
+                self.jobs[jobCode] = self.coord.readConfigFile(self.getIndexPath(jobCode))
+            except Exception:
+                self.jobs[jobCode] = {}
+
+        return self.jobs[jobCode]
+
+    # adds the manifest of a finished task. A manifest entry is [relPath, size, mtime, hash]
+    def addManifest(self, jobCode, slave, manifest):
+        jobFiles = self.getJob(jobCode)
+        for entry in manifest:
+            if type(entry) != list or len(entry) < 3:
+                continue
+
+            relPath = entry[0].replace("\\", "/")
+            if isTransferTemp(relPath):
+                continue
+
+            fileHash = entry[3] if len(entry) > 3 else None
+            curEntry = jobFiles.get(relPath)
+            collected = (
+                curEntry is not None
+                and curEntry[4]
+                and curEntry[0] == entry[1]
+                and curEntry[1] == entry[2]
+            )
+            jobFiles[relPath] = [entry[1], entry[2], fileHash, slave, collected]
+
+        self.dirty.add(jobCode)
+
+    def hasManifest(self, jobCode, slave=None):
+        return any(
+            slave is None or x[3] == slave for x in self.getJob(jobCode).values()
+        )
+
+    def getPending(self, jobCode, slave=None):
+        return sorted(
+            x
+            for x, y in self.getJob(jobCode).items()
+            if not y[4] and (slave is None or y[3] == slave)
+        )
+
+    def isCollected(self, jobCode, relPath, size, mtime):
+        entry = self.getJob(jobCode).get(relPath.replace("\\", "/"))
+        return entry is not None and entry[4] and entry[0] == size and entry[1] == mtime
+
+    def setCollected(self, jobCode, relPath, size=None, mtime=None, slave=None):
+        jobFiles = self.getJob(jobCode)
+        relPath = relPath.replace("\\", "/")
+        if relPath in jobFiles:
+            jobFiles[relPath][4] = True
+        else:
+            jobFiles[relPath] = [size, mtime, None, slave, True]
+
+        self.dirty.add(jobCode)
+
+    def removeJob(self, jobCode):
+        self.jobs.pop(jobCode, None)
+        self.dirty.discard(jobCode)
+        try:
+            os.remove(self.getIndexPath(jobCode))
+        except OSError:
+            pass
+
+    def save(self):
+        if len(self.dirty) > 0 and not os.path.exists(self.indexPath):
+            os.makedirs(self.indexPath)
+
+        for jobCode in sorted(self.dirty):
+            self.coord.writeConfigFile(self.getIndexPath(jobCode), self.jobs[jobCode])
+
+        self.dirty = set()
+
+
+# distributes job files and project assets to the slave folders. Files are reflinked or
+# hardlinked, when the source and the target are on the same volume, and copied otherwise.
+# Configs are replaced and never modified in place, so a linked file doesn't change later.
+class FileDistributor(object):
+    FICLONE = 0x40049409
+
+    def __init__(self, coordinator):
+        self.coord = coordinator
+        self.enabled = True
+        self.linkModes = {}
+        self.transfer = FileTransfer()
+        self.resetStats()
+
+    def resetStats(self):
+        self.linkedBytes = 0
+        self.linkedFiles = 0
+        self.copiedBytes = 0
+        self.copiedFiles = 0
+
+    def reflink(self, src, dst):
+        if fcntl is None:
+            return False
+
+        try:
+            with open(src, "rb") as srcFile:
+                with open(dst, "wb") as dstFile:
+                    fcntl.ioctl(dstFile.fileno(), self.FICLONE, srcFile.fileno())
+        except (IOError, OSError):
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            return False
+
+        shutil.copystat(src, dst)
+        return True
+
+    def hardlink(self, src, dst):
+        if not hasattr(os, "link"):
+            return False
+
+        try:
+            os.link(src, dst)
+        except (IOError, OSError):
+            return False
+
+        return True
+
+    # links the file, if the volume supports it. The first file on a volume decides, which
+    # link mode is used for the following files.
+    def linkFile(self, src, dst, device):
+        linkMode = self.linkModes.get(device)
+        if linkMode == "copy":
+            return False
+
+        if linkMode in [None, "reflink"] and self.reflink(src, dst):
+            self.linkModes[device] = "reflink"
+            return True
+
+        if linkMode in [None, "hardlink"] and self.hardlink(src, dst):
+            self.linkModes[device] = "hardlink"
+            return True
+
+        if linkMode is None:
+            self.linkModes[device] = "copy"
+            self.coord.writeLog(
+                "Job files can't be linked on the volume of %s. They will be copied."
+                % os.path.dirname(dst),
+                1,
+            )
+
+        return False
+
+    # links the file or copies it. With queue=True the copy is only added to the transfer and
+    # happens, when the transfer runs.
+    def copyFile(self, src, dst, queue=False):
+        srcStat = os.stat(src)
+        if os.path.exists(dst):
+            os.remove(dst)
+
+        if self.enabled:
+            try:
+                dstDevice = os.stat(os.path.dirname(dst)).st_dev
+            except OSError:
+                dstDevice = None
+
+            if srcStat.st_dev == dstDevice and self.linkFile(src, dst, dstDevice):
+                self.linkedBytes += srcStat.st_size
+                self.linkedFiles += 1
+                return dst
+
+        if queue:
+            self.transfer.add(src, dst)
+        else:
+            self.transfer.copyFile(src, dst)
+
+        self.copiedBytes += srcStat.st_size
+        self.copiedFiles += 1
+        return dst
+
+    def copyTree(self, src, dst):
+        for root, folders, files in os.walk(src):
+            targetPath = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+            if not os.path.exists(targetPath):
+                os.makedirs(targetPath)
+
+            for fileName in files:
+                self.copyFile(
+                    os.path.join(root, fileName),
+                    os.path.join(targetPath, fileName),
+                    queue=True,
+                )
+
+        errors = self.transfer.run()
+        if errors > 0:
+            raise IOError(
+                "%s files couldn't be copied to %s: %s" % (errors, dst, self.transfer.errors[-1])
+            )
+
+    def getStats(self):
+        stats = "linked %s files (%.1f MB saved), copied %s files (%.1f MB)" % (
+            self.linkedFiles,
+            self.linkedBytes / 1024.0 / 1024.0,
+            self.copiedFiles,
+            self.copiedBytes / 1024.0 / 1024.0,
+        )
+        if self.transfer.copiedFiles > 0 or len(self.transfer.errors) > 0:
+            stats += " - transfer: %s" % self.transfer.getStats()
+
+        return stats
+
 
 class PandoraCoordinator:
     def __init__(self):
         try:
             self.version = "v1.1.0.6"
 
+            self.debugMode = False
+            self.logWriter = LogWriter(
+                os.path.join(
+                    os.path.dirname(__file__), "Coordinator_Log_%s.txt" % socket.gethostname()
+                )
+            )
+            self.configBackups = {}  # configs, which couldn't be replaced atomically
+            self.fsyncConfigs = False  # flush config writes to disk before replacing
             self.coordUpdateTime = 5  # seconds
             self.activeThres = 10  # time in min after a slave becomes inactive
             self.notifySlaveInterval = (
@@ -69,6 +1354,17 @@ class PandoraCoordinator:
             )  # time in min in which interval a to check if a connection to the slave exists
             self.lastConnectionCheckTime = time.time()
             self.lastNotifyTime = time.time()
+            self.watchMode = False  # wake up on filesystem changes instead of polling only
+            self.folderWatcher = None
+            self.lastFullCycleTime = 0
+            self.jobRepository = "json"  # "json" or "sqlite"
+            self.cmdChannels = {}  # command channels to the slaves
+            self.assignTimeout = 15  # time in min in which a slave has to start an assigned task
+            self.linkJobFiles = True  # hardlink or reflink job files to the slaves if possible
+            self.transferThreads = 4  # number of parallel file copies for output collection
+            self.logMaxSize = 10  # size in MB after which the log gets rotated, 0 disables it
+            self.logMaxAge = 0  # age in hours after which the log gets rotated, 0 disables it
+            self.logGenerations = 5  # number of compressed logs, which are kept
 
             pandoraConfig = os.path.join(
                 os.environ["userprofile"], "Documents", "Pandora", "Pandora.json"
@@ -172,7 +1468,14 @@ class PandoraCoordinator:
             self.coordWarningsConf = os.path.join(
                 self.coordBasePath, "Coordinator_Warnings_%s.json" % socket.gethostname()
             )
+            self.warningStore = WarningStore()
+            self.warningStore.load(
+                self.getConfig(
+                    configPath=self.coordWarningsConf, getConf=True, suppressError=True
+                )
+            )
             self.logCache = os.path.join(self.slPath, "Workstations", "Logs", "Coordinator", "LogCache.json")
+            self.updateDebugMode()
 
             self.close = False
             self.tvRequests = []
@@ -180,6 +1483,7 @@ class PandoraCoordinator:
             self.renderingTasks = []
             self.collectTasks = {}
             self.jobDirs = []
+            self.logShipStats = {"append": 0, "copy": 0, "bytes": 0, "lag": 0}
 
             self.writeLog(
                 "Starting Coordinator - %s - %s" % (self.version, socket.gethostname()), 1
@@ -207,12 +1511,17 @@ class PandoraCoordinator:
 
             self.pAssetPath = os.path.join(self.repPath, "ProjectAssets")
             self.jobPath = os.path.join(self.repPath, "Jobs")
+            self.jobIndex = JobIndex(self, self.jobPath)
+            self.slaveRegistry = SlaveRegistry(self, os.path.join(self.slPath, "Slaves"))
+            self.fileDistributor = FileDistributor(self)
+            self.outputIndex = OutputIndex(self, os.path.join(self.repPath, "OutputIndex"))
 
             self.prioList = os.path.join(self.repPath, "PriorityList.json")
 
             self.getGDrivePath()
 
             cmdPath = os.path.join(self.coordBasePath, "command.txt")
+            changedPaths = None
 
             while not self.close:
                 if os.path.exists(cmdPath):
@@ -229,10 +1538,16 @@ class PandoraCoordinator:
                         if closeCoord:
                             break
 
-                self.startCoordination()
-                time.sleep(self.coordUpdateTime)
+                if changedPaths is None:
+                    self.startCoordination()
+                else:
+                    self.startEventCycle(changedPaths)
+
+                changedPaths = self.waitForChanges()
 
             self.writeLog("Coordinator closed", 1)
+            self.flushCommands()
+            self.flushWarnings()
             self.notifyWorkstations()
 
         except Exception as e:
@@ -261,70 +1576,50 @@ class PandoraCoordinator:
 
     def writeLog(self, text, level=0, writeWarning=True):
         # print text
-        if not hasattr(self, "coordLog") or not os.path.exists(self.coordLog):
-            try:
-                logPath = self.coordLog
-                if not os.path.exists(os.path.dirname(self.coordLog)):
-                    os.makedirs(os.path.dirname(self.coordLog))
-            except:
-                logPath = os.path.join(
-                    os.path.dirname(__file__),
-                    "Coordinator_Log_%s.txt" % socket.gethostname(),
-                )
-        else:
-            logPath = self.coordLog
-
-        if hasattr(self, "coordConf"):
-            debug = self.getConfig("settings", "debugMode", suppressError=True)
-            if debug is None and self.coordConf != "":
-                self.setConfig("settings", "debugMode", False, suppressError=True)
-                debug = False
-        else:
-            debug = True
-
-        if level == 0 and not debug:
+        if level == 0 and not self.debugMode:
             return
         elif level > 1 and writeWarning:
             self.writeWarning(text, level)
 
-        with io.open(logPath, "a", encoding="utf-16") as log:
-            log.write(
-                    "[%s] %s - %s : %s\n"
-                    % (level, os.getpid(), time.strftime("%d/%m/%y %X"), text)
-            )
+        if hasattr(self, "coordLog"):
+            logPath = self.coordLog
+        else:
+            logPath = self.logWriter.fallbackPath
+
+        self.logWriter.write(
+            logPath,
+            "[%s] %s - %s : %s\n" % (level, os.getpid(), time.strftime("%d/%m/%y %X"), text),
+        )
 
         # print "[%s] %s : %s\n" % (level, time.strftime("%d/%m/%y %X"), text)
 
-    def writeWarning(self, text, level=2):
-        if not os.path.exists(self.coordWarningsConf):
-            try:
-                open(self.coordWarningsConf, "a").close()
-            except:
-                self.writeLog("Cannot create warning config", 2, writeWarning=False)
-                return None
+    # the debug setting is read once per cycle instead of on every log line
+    def updateDebugMode(self):
+        debug = self.getConfig("settings", "debugMode", suppressError=True)
+        if debug is None:
+            self.setConfig("settings", "debugMode", False, suppressError=True)
+            debug = False
 
-        warningConfig = self.getConfig(
-            configPath=self.coordWarningsConf, getConf=True, suppressError=True
-        )
-        if warningConfig is None:
-            return
-
-        warnings = []
-        if "warnings" in warningConfig:
-            for i in warningConfig["warnings"]:
-                warnings.append(warningConfig["warnings"][i])
+        self.debugMode = debug
 
-            warnings = [x for x in warnings if x[0] != text]
+    def writeWarning(self, text, level=2):
+        if not hasattr(self, "warningStore"):
+            return
 
-        warnings.insert(0, [text, time.time(), level])
+        self.warningStore.add(text, level)
 
-        warningConfig = {"warnings": {}}
+    # writes the warnings to disk, if they changed since the last flush
+    def flushWarnings(self):
+        if not hasattr(self, "warningStore"):
+            return
 
-        for idx, val in enumerate(warnings):
-            warningConfig["warnings"]["warning%s" % idx] = val
+        if not self.warningStore.dirty and os.path.exists(self.coordWarningsConf):
+            return
 
         self.setConfig(
-            configPath=self.coordWarningsConf, confData=warningConfig, suppressError=True
+            configPath=self.coordWarningsConf,
+            confData=self.warningStore.getConfig(),
+            suppressError=True,
         )
 
     @err_decorator
@@ -336,7 +1631,12 @@ class PandoraCoordinator:
         if val is not None and val != "":
             self.writeLog("CheckCommands - execute: %s" % val, 1)
             try:
-                exec(val)
+                methodName, args, kwargs = parseMethodCall(val)
+                method = getattr(self, methodName, None)
+                if not callable(method):
+                    raise ValueError("unknown method: %s" % methodName)
+
+                method(*args, **kwargs)
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
                 self.writeLog(
@@ -372,21 +1672,13 @@ class PandoraCoordinator:
             if not os.path.exists(os.path.dirname(configPath)):
                 return
 
-            if len(
-                [
-                    x
-                    for x in os.listdir(os.path.dirname(configPath))
-                    if x.startswith(os.path.basename(configPath) + ".bak")
-                ]
-            ):
+            if configPath in self.configBackups:
                 self.restoreConfig(configPath)
 
             userConfig = {}
 
             try:
-                if os.path.exists(configPath):
-                    with open(configPath, "r") as f:
-                        userConfig = json.load(f)
+                userConfig = self.readConfigFile(configPath)
             except:
                 if isCoordConf:
                     warnStr = "The coordinator preferences file seems to be corrupt.\n\nIt will be reset, which means all coordinator settings will fall back to their defaults."
@@ -469,18 +1761,13 @@ class PandoraCoordinator:
             if isCoordConf and not os.path.exists(configPath):
                 self.createUserPrefs()
 
-            fcontent = os.listdir(os.path.dirname(configPath))
-            if len(
-                [x for x in fcontent if x.startswith(os.path.basename(configPath) + ".bak")]
-            ):
+            if configPath in self.configBackups:
                 self.restoreConfig(configPath)
 
             if confData is None:
                 userConfig = {}
                 try:
-                    if os.path.exists(configPath):
-                        with open(configPath, "r") as f:
-                            userConfig = json.load(f)
+                    userConfig = self.readConfigFile(configPath)
                 except:
                     if isCoordConf:
                         warnStr = "The coordinator preferences file seems to be corrupt.\n\nIt will be reset, which means all coordinator settings will fall back to their defaults."
@@ -523,21 +1810,7 @@ class PandoraCoordinator:
             else:
                 userConfig = confData
 
-            with open(configPath, "w") as inifile:
-                json.dump(userConfig, inifile, indent=4)
-
-            try:
-                with open(configPath, "r") as f:
-                    testConfig = json.load(f)
-                if confData is None:
-                    for i in userConfig:
-                        for k in userConfig[i]:
-                            if k not in testConfig[i]:
-                                raise RuntimeError
-            except:
-                backupPath = configPath + ".bak" + str(random.randint(1000000, 9999999))
-                with open(backupPath, "w") as inifile:
-                    json.dump(userConfig, inifile, indent=4)
+            self.writeConfigFile(configPath, userConfig)
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             errStr = "%s ERROR - getconfig %s:\n%s\n\n%s" % (
@@ -550,12 +1823,59 @@ class PandoraCoordinator:
             if not suppressError:
                 raise e
 
+    # reads a json config. If the file can't be parsed, the latest backup gets restored
+    def readConfigFile(self, configPath):
+        if not os.path.exists(configPath):
+            return {}
+
+        try:
+            with open(configPath, "r") as f:
+                return json.load(f)
+        except Exception:
+            if not self.restoreConfig(configPath):
+                raise
+
+        with open(configPath, "r") as f:
+            return json.load(f)
+
+    # writes a json config to a temp file and replaces the original file with it, so that
+    # readers never see a partially written config
+    def writeConfigFile(self, configPath, userConfig):
+        tmpPath = "%s.tmp%s" % (configPath, os.getpid())
+        try:
+            with open(tmpPath, "w") as inifile:
+                json.dump(userConfig, inifile, indent=4)
+                if self.fsyncConfigs:
+                    inifile.flush()
+                    os.fsync(inifile.fileno())
+        except Exception:
+            try:
+                os.remove(tmpPath)
+            except Exception:
+                pass
+            raise
+
+        try:
+            if pVersion == 3:
+                os.replace(tmpPath, configPath)
+            else:
+                if os.path.exists(configPath):
+                    os.remove(configPath)
+                os.rename(tmpPath, configPath)
+        except Exception:
+            # the config is probably locked by another process or a sync client. The new
+            # content is kept as a backup and restored on the next access of this config
+            backupPath = configPath + ".bak" + str(random.randint(1000000, 9999999))
+            os.rename(tmpPath, backupPath)
+            self.configBackups[configPath] = backupPath
+
     @err_decorator
     def restoreConfig(self, configPath):
+        self.configBackups.pop(configPath, None)
         path = os.path.dirname(configPath)
         backups = []
         for i in os.listdir(path):
-            if not i.startswith(os.path.basename(configPath) + "."):
+            if not i.startswith(os.path.basename(configPath) + ".bak"):
                 continue
 
             try:
@@ -633,14 +1953,22 @@ class PandoraCoordinator:
                 "repository": "",
                 "notifySlaveInterval": 10,
                 "restartGDrive": False,
+                "fsyncConfigs": False,
+                "watchMode": False,
+                "jobRepository": self.jobRepository,
+                "assignTimeout": self.assignTimeout,
+                "linkJobFiles": self.linkJobFiles,
+                "logMaxSize": self.logMaxSize,
+                "logMaxAge": self.logMaxAge,
+                "logGenerations": self.logGenerations,
             }
         }
 
-        with open(self.coordConf, "w") as inifile:
-            json.dump(uconfig, inifile, indent=4)
+        self.writeConfigFile(self.coordConf, uconfig)
 
     @err_decorator
     def startCoordination(self):
+        self.updateDebugMode()
         self.writeLog("Cycle start")
         # checking slaves
         if os.path.exists(os.path.join(self.coordBasePath, "EXIT.txt")):
@@ -679,12 +2007,76 @@ class PandoraCoordinator:
             )
             self.restartGDriveEnabled = rgdrive
 
+        fsyncConfigs = self.getConfig("settings", "fsyncConfigs")
+        if fsyncConfigs is None:
+            self.setConfig("settings", "fsyncConfigs", self.fsyncConfigs)
+        elif fsyncConfigs != self.fsyncConfigs:
+            self.writeLog(
+                "Updating fsyncConfigs from %s to %s" % (self.fsyncConfigs, fsyncConfigs),
+                1,
+            )
+            self.fsyncConfigs = fsyncConfigs
+
+        watchMode = self.getConfig("settings", "watchMode")
+        if watchMode is None:
+            self.setConfig("settings", "watchMode", self.watchMode)
+        elif watchMode != self.watchMode:
+            self.writeLog("Updating watchMode from %s to %s" % (self.watchMode, watchMode), 1)
+            self.watchMode = watchMode
+
+        jobRepository = self.getConfig("settings", "jobRepository")
+        if jobRepository is None:
+            self.setConfig("settings", "jobRepository", self.jobRepository)
+        elif jobRepository != self.jobRepository:
+            self.writeLog(
+                "Updating jobRepository from %s to %s" % (self.jobRepository, jobRepository),
+                1,
+            )
+            self.setJobRepository(jobRepository)
+
+        assignTimeout = self.getConfig("settings", "assignTimeout")
+        if assignTimeout is None:
+            self.setConfig("settings", "assignTimeout", self.assignTimeout)
+        elif assignTimeout != self.assignTimeout:
+            self.writeLog(
+                "Updating assignTimeout from %s to %s" % (self.assignTimeout, assignTimeout),
+                1,
+            )
+            self.assignTimeout = assignTimeout
+            self.jobIndex.taskTracker.rebuildDeadlines()
+
+        linkJobFiles = self.getConfig("settings", "linkJobFiles")
+        if linkJobFiles is None:
+            self.setConfig("settings", "linkJobFiles", self.linkJobFiles)
+        elif linkJobFiles != self.linkJobFiles:
+            self.writeLog(
+                "Updating linkJobFiles from %s to %s" % (self.linkJobFiles, linkJobFiles), 1
+            )
+            self.linkJobFiles = linkJobFiles
+            self.fileDistributor.enabled = linkJobFiles == True
+
+        for setting in ["logMaxSize", "logMaxAge", "logGenerations"]:
+            value = self.getConfig("settings", setting)
+            if value is None:
+                self.setConfig("settings", setting, getattr(self, setting))
+            elif value != getattr(self, setting):
+                self.writeLog(
+                    "Updating %s from %s to %s" % (setting, getattr(self, setting), value), 1
+                )
+                setattr(self, setting, value)
+
+        self.logWriter.maxSize = int(self.logMaxSize * 1024 * 1024)
+        self.logWriter.maxAge = self.logMaxAge * 3600
+        self.logWriter.generations = self.logGenerations
+
+        self.lastFullCycleTime = time.time()
         self.activeSlaves = {}
         self.availableSlaves = []
 
         if not os.path.exists(self.jobPath):
             os.makedirs(self.jobPath)
 
+        self.jobIndex.refresh()
         self.getJobAssignments()
 
         if not os.path.exists(os.path.join(self.slPath, "Slaves")):
@@ -692,37 +2084,268 @@ class PandoraCoordinator:
 
         self.checkSlaves()
         self.setConfig(configPath=self.actSlvPath, confData=self.slaveContactTimes)
+        self.slaveRegistry.refresh()
 
         if not self.localMode:
             self.checkConnection()
         self.checkRenderingTasks()
         self.getAvailableSlaves()
         self.assignJobs()
+        self.reportDistribution()
         self.checkTvRequests()
         if not self.localMode:
             self.checkCollectTasks()
+        self.flushWarnings()
         self.notifyWorkstations()
         self.notifySlaves()
+        self.flushCommands()
+        self.updateWatches()
 
+        self.writeLog("Job index: %s" % self.jobIndex.getStats())
+        self.writeLog("Slave registry: %s" % self.slaveRegistry.getStats())
         self.writeLog("Cycle finished")
 
+    # warns about dependencies of a new job, which don't exist or which depend on the job itself
+    @err_decorator
+    def checkJobDependencies(self, jobCode):
+        if self.jobIndex.getJob(jobCode) is None:
+            return
+
+        depGraph = self.jobIndex.depGraph
+        jobName = self.jobIndex.getJobName(jobCode)
+
+        missingDeps = depGraph.getMissingDeps(jobCode)
+        if len(missingDeps) > 0:
+            self.writeWarning(
+                "The dependent jobs of job %s don't exist: %s" % (jobName, ", ".join(missingDeps)),
+                2,
+            )
+
+        cycle = depGraph.findCycle(jobCode)
+        if cycle is not None:
+            self.writeWarning(
+                "Job %s has cyclic dependencies and will never start: %s"
+                % (jobName, " -> ".join([self.jobIndex.getJobName(x) for x in cycle])),
+                3,
+            )
+
+    @err_decorator
+    def setJobRepository(self, repoType):
+        if not os.path.exists(self.jobPath):
+            os.makedirs(self.jobPath)
+
+        if repoType == "sqlite":
+            store = SqliteJobStore(
+                self, self.jobPath, os.path.join(self.repPath, "JobRepository.db")
+            )
+        elif repoType == "json":
+            store = JsonJobStore(self, self.jobPath)
+        else:
+            self.writeWarning("Invalid jobRepository setting: %s" % repoType, 2)
+            return
+
+        # the json files need to be up to date, before another store takes over
+        self.jobIndex.exportJobs()
+        if hasattr(self.jobIndex.store, "close"):
+            self.jobIndex.store.close()
+
+        self.jobIndex = JobIndex(self, self.jobPath, store)
+        self.jobRepository = repoType
+        self.jobIndex.refresh()
+
+    # imports the PandoraJob.json files of all existing job folders into the sqlite job store
+    # and replaces the jobs in the database. Can be executed with the "command" setting.
+    @err_decorator
+    def migrateJobRepository(self):
+        if not isinstance(self.jobIndex.store, SqliteJobStore):
+            self.writeLog("Migrating jobs is only possible with the sqlite jobRepository", 1)
+            return
+
+        imported = self.jobIndex.store.importJobs()
+        self.jobIndex.jobs = {}
+        self.jobIndex.refresh()
+        self.writeLog(
+            "Imported %s jobs into %s" % (imported, self.jobIndex.store.dbPath), 1
+        )
+
+    # handles only the workstations and slaves, which had new files in their command or
+    # submission folders since the last cycle
+    @err_decorator
+    def startEventCycle(self, changedPaths):
+        workstations, slaves = self.getChangedFolders(changedPaths)
+        if not workstations and not slaves:
+            return
+
+        self.writeLog(
+            "Event cycle start - workstations: %s, slaves: %s"
+            % (", ".join(sorted(workstations)), ", ".join(sorted(slaves)))
+        )
+        self.availableSlaves = []
+
+        if workstations:
+            self.getJobAssignments(workstations=workstations)
+            self.updateWatches(workstations=workstations)
+
+        if slaves:
+            self.checkSlaves(slaves=slaves)
+
+        self.slaveRegistry.refresh()
+
+        self.getAvailableSlaves()
+        self.assignJobs()
+        self.reportDistribution()
+        self.flushCommands()
+        self.flushWarnings()
+
+        self.writeLog("Event cycle finished")
+
+    # returns the names of the workstation and slave folders, which contain the changed paths
+    def getChangedFolders(self, changedPaths):
+        workstations = set()
+        slaves = set()
+        for path in changedPaths:
+            if os.path.basename(path).startswith(("slaveIn_", "tmp_")):
+                continue
+
+            parts = os.path.relpath(path, self.slPath).replace("\\", "/").split("/")
+            if len(parts) < 2:
+                continue
+
+            if parts[0] == "Workstations" and parts[1].startswith("WS_"):
+                workstations.add(parts[1])
+            elif parts[0] == "Slaves" and parts[1].startswith("S_"):
+                slaves.add(parts[1])
+
+        return workstations, slaves
+
+    # waits until the next full cycle is due. In watchMode the wait ends early, when files
+    # changed in one of the watched folders. Returns None, when a full cycle should be started.
+    def waitForChanges(self):
+        if not self.watchMode:
+            time.sleep(self.coordUpdateTime)
+            return None
+
+        if self.folderWatcher is None:
+            self.folderWatcher = FolderWatcher()
+            self.updateWatches()
+            if not self.folderWatcher.available:
+                self.writeLog(
+                    "Filesystem notifications are not available. Falling back to polling.", 1
+                )
+
+        if not self.folderWatcher.available:
+            time.sleep(self.coordUpdateTime)
+            return None
+
+        timeout = self.lastFullCycleTime + self.coordUpdateTime - time.time()
+        changedPaths = self.folderWatcher.wait(timeout)
+        if not changedPaths or time.time() >= self.lastFullCycleTime + self.coordUpdateTime:
+            return None
+
+        return changedPaths
+
+    @err_decorator
+    def updateWatches(self, workstations=None):
+        if self.folderWatcher is None:
+            return
+
+        wsBase = os.path.join(self.slPath, "Workstations")
+        slaveBase = os.path.join(self.slPath, "Slaves")
+        watchPaths = [wsBase, slaveBase]
+
+        if os.path.exists(wsBase):
+            for i in os.listdir(wsBase):
+                if not i.startswith("WS_") or (workstations and i not in workstations):
+                    continue
+
+                watchPaths.append(os.path.join(wsBase, i, "Commands"))
+                jobDir = os.path.join(wsBase, i, "JobSubmissions")
+                watchPaths.append(jobDir)
+                if os.path.isdir(jobDir):
+                    watchPaths += [os.path.join(jobDir, x) for x in os.listdir(jobDir)]
+
+        if os.path.exists(slaveBase) and not workstations:
+            for i in os.listdir(slaveBase):
+                if i.startswith("S_"):
+                    watchPaths.append(os.path.join(slaveBase, i, "Communication"))
+
+        for path in watchPaths:
+            if os.path.isdir(path):
+                self.folderWatcher.addWatch(path)
+
     @err_decorator
     def handleCmd(self, cmFile, origin=""):
-        self.writeLog("Handle cmd file: %s" % cmFile)
+        commands = self.readCmd(cmFile, origin)
+        if self.applyCmds(commands, origin):
+            self.removeCmd(cmFile, origin)
 
-        with open(cmFile, "r") as comFile:
-            cmdText = comFile.read()
-            command = None
+    # handles the commands of all slaves as one batch. The job configs are written once for all
+    # commands and the command files are removed only after the jobs were written successfully.
+    @err_decorator
+    def handleCmdBatch(self, cmdFiles):
+        if len(cmdFiles) == 0 and not self.jobIndex.unwrittenJobs:
+            return
+
+        commands = []
+        for cmFile, origin in cmdFiles:
             try:
-                command = eval(cmdText)
+                commands.append([cmFile, origin, self.readCmd(cmFile, origin)])
             except Exception as e:
-                exc_type, exc_obj, exc_tb = sys.exc_info()
                 self.writeLog(
-                    "ERROR -- handleCmd evalCmd -- %s\n%s\n%s\n%s\n%s"
-                    % (str(e), exc_type, exc_tb.tb_lineno, origin, cmdText),
-                    3,
+                    "ERROR - cannot read command file: %s (%s) - %s" % (cmFile, origin, e), 3
                 )
 
+        handledFiles = []
+        self.jobIndex.beginBatch()
+        try:
+            for cmFile, origin, fileCmds in commands:
+                if self.applyCmds(fileCmds, origin):
+                    handledFiles.append([cmFile, origin])
+        finally:
+            success = self.jobIndex.commitBatch()
+
+        # the commands were applied already. Job updates, which couldn't be written, are kept
+        # by the job index and written again with the next batch.
+        if not success:
+            self.writeLog(
+                "Could not write all job updates. They will be written again with the next cycle.",
+                2,
+            )
+
+        for cmFile, origin in handledFiles:
+            self.removeCmd(cmFile, origin)
+
+    def readCmd(self, cmFile, origin=""):
+        self.writeLog("Handle cmd file: %s" % cmFile)
+
+        with open(cmFile, "r") as comFile:
+            cmdText = comFile.read()
+
+        commands = []
+        try:
+            commands = parseCmds(cmdText, cmdSchemas)
+        except Exception as e:
+            exc_type, exc_obj, exc_tb = sys.exc_info()
+            self.writeLog(
+                "ERROR -- handleCmd parseCmd -- %s\n%s\n%s\n%s\n%s"
+                % (str(e), exc_type, exc_tb.tb_lineno, origin, cmdText),
+                3,
+            )
+
+        return commands
+
+    # returns True, when all commands were handled and the command file can be removed
+    def applyCmds(self, commands, origin=""):
+        handled = True
+        for command in commands:
+            if not self.applyCmd(command, origin):
+                handled = False
+
+        return handled
+
+    # returns True, when the command was handled
+    @err_decorator
+    def applyCmd(self, command, origin=""):
         if command is not None and type(command) == list:
             for i in range(1):
                 if command[0] == "taskUpdate":
@@ -742,21 +2365,14 @@ class PandoraCoordinator:
                     if taskStatus == "finished":
                         outputFileNum = int(command[7])
 
-                    jobSettings = os.path.join(self.jobPath, jobCode, "PandoraJob.json")
-
-                    if not os.path.exists(jobSettings):
+                    if self.jobIndex.getJob(jobCode) is None:
                         self.writeLog(
                             "ERROR - jobSettings don't exist %s (%s)" % (jobCode, origin), 3
                         )
                         continue
 
-                    jName = self.getConfig("information", "jobName", configPath=jobSettings)
-                    if jName is not None:
-                        jobName = jName
-                    else:
-                        jobName = jobCode
-
-                    taskData = self.getConfig("jobtasks", taskName, configPath=jobSettings)
+                    jobName = self.jobIndex.getJobName(jobCode)
+                    taskData = self.jobIndex.getTask(jobCode, taskName)
                     if taskData is None:
                         self.writeLog(
                             "ERROR - task is not listed %s - %s (%s)"
@@ -792,7 +2408,7 @@ class PandoraCoordinator:
                     taskData[4] = taskTime
                     taskData[5] = taskStart
                     taskData[6] = taskEnd
-                    self.setConfig("jobtasks", taskName, taskData, configPath=jobSettings)
+                    self.jobIndex.setTask(jobCode, taskName, taskData)
 
                     if (
                         taskStatus == "rendering"
@@ -805,14 +2421,28 @@ class PandoraCoordinator:
                         and outputFileNum > 0
                         and not self.localMode
                     ):
+                        # slaves publish the files of the task, so that only they get collected
+                        if len(command) > 8 and type(command[8]) == list:
+                            self.outputIndex.addManifest(jobCode, origin, command[8])
+
                         if origin in self.collectTasks:
                             self.collectTasks[origin][jobCode] = outputFileNum
                         else:
                             self.collectTasks[origin] = {jobCode: outputFileNum}
 
+                    # time, which the slave needed to copy the files of the task before rendering.
+                    # It is only sent, when files were copied.
+                    stagingTime = ""
+                    if (
+                        len(command) > 9
+                        and isinstance(command[9], (int, float))
+                        and command[9] > 0
+                    ):
+                        stagingTime = " - staging %.1f s" % command[9]
+
                     self.writeLog(
-                        "Updated Task %s in %s to %s (%s)"
-                        % (taskName, jobName, str(taskData), origin),
+                        "Updated Task %s in %s to %s (%s)%s"
+                        % (taskName, jobName, str(taskData), origin, stagingTime),
                         1,
                     )
 
@@ -823,10 +2453,27 @@ class PandoraCoordinator:
                     settingVal = command[4]
 
                     if settingType == "Job":
-                        settingsPath = os.path.join(
-                            self.jobPath, parentName, "PandoraJob.json"
+                        if not self.jobIndex.setValue(
+                            parentName, "jobglobals", settingName, settingVal
+                        ):
+                            self.writeLog(
+                                "ERROR - settingsPath doesn't exist %s (%s)"
+                                % (parentName, origin),
+                                2,
+                            )
+                            continue
+
+                        if settingName == "priority":
+                            self.setConfig(
+                                parentName, "priority", settingVal, configPath=self.prioList
+                            )
+
+                        self.writeLog(
+                            "Set config setting %s - %s: %s (%s)"
+                            % (parentName, settingName, settingVal, origin),
+                            1,
                         )
-                        section = "jobglobals"
+                        continue
                     elif settingType == "Slave":
                         self.sendCommand(
                             parentName, ["setSetting", settingName, settingVal]
@@ -878,11 +2525,6 @@ class PandoraCoordinator:
                         section, settingName, settingVal, configPath=settingsPath
                     )
 
-                    if settingType == "Job" and settingName == "priority":
-                        self.setConfig(
-                            parentName, "priority", settingVal, configPath=self.prioList
-                        )
-
                     self.writeLog(
                         "Set config setting %s - %s: %s (%s)"
                         % (parentName, settingName, settingVal, origin),
@@ -898,23 +2540,15 @@ class PandoraCoordinator:
                         )
 
                     jobPath = os.path.join(self.repPath, "Jobs", command[1])
-                    jobConf = os.path.join(jobPath, "PandoraJob.json")
 
-                    projectName = ""
                     jobCode = command[1]
-                    jobName = command[1]
-
-                    if os.path.exists(jobConf):
-                        cData = {}
-                        cData["jobName"] = ["information", "jobName"]
-                        cData["projectName"] = ["information", "projectName"]
-                        cData = self.getConfig(data=cData, configPath=jobConf)
-
-                        if cData["jobName"] is not None:
-                            jobName = cData["jobName"]
-
-                        if cData["projectName"] is not None:
-                            projectName = cData["projectName"]
+                    jobName = self.jobIndex.getJobName(jobCode)
+                    projectName = (
+                        self.jobIndex.getValue(jobCode, "information", "projectName")
+                        or ""
+                    )
+                    self.jobIndex.removeJob(jobCode)
+                    self.outputIndex.removeJob(jobCode)
 
                     if os.path.exists(jobPath):
                         shutil.rmtree(jobPath)
@@ -991,16 +2625,8 @@ class PandoraCoordinator:
                     jobCode = command[1]
                     taskNum = command[2]
 
-                    jobConf = os.path.join(self.repPath, "Jobs", jobCode, "PandoraJob.json")
-                    jName = self.getConfig("information", "jobName", configPath=jobConf)
-                    if jName is not None:
-                        jobName = jName
-                    else:
-                        jobName = jobCode
-
-                    taskData = self.getConfig(
-                        "jobtasks", "task%04d" % taskNum, configPath=jobConf
-                    )
+                    jobName = self.jobIndex.getJobName(jobCode)
+                    taskData = self.jobIndex.getTask(jobCode, "task%04d" % taskNum)
                     if taskData is None:
                         self.writeLog(
                             "Job %s has no task %s (%s)" % (jobName, taskNum, origin), 2
@@ -1017,9 +2643,7 @@ class PandoraCoordinator:
                     taskData[4] = ""
                     taskData[5] = ""
                     taskData[6] = ""
-                    self.setConfig(
-                        "jobtasks", "task%04d" % taskNum, taskData, configPath=jobConf
-                    )
+                    self.jobIndex.setTask(jobCode, "task%04d" % taskNum, taskData)
 
                     self.writeLog(
                         "Restarted Task %s from Job %s (%s)" % (taskNum, jobName, origin), 1
@@ -1035,16 +2659,8 @@ class PandoraCoordinator:
                     else:
                         action = "disable"
 
-                    jobConf = os.path.join(self.repPath, "Jobs", jobCode, "PandoraJob.json")
-                    jName = self.getConfig("information", "jobName", configPath=jobConf)
-                    if jName is not None:
-                        jobName = jName
-                    else:
-                        jobName = jobCode
-
-                    taskData = self.getConfig(
-                        "jobtasks", "task%04d" % taskNum, configPath=jobConf
-                    )
+                    jobName = self.jobIndex.getJobName(jobCode)
+                    taskData = self.jobIndex.getTask(jobCode, "task%04d" % taskNum)
                     if taskData is None:
                         self.writeLog(
                             "Job %s has no task %s (%s)" % (jobName, taskNum, origin), 2
@@ -1071,9 +2687,7 @@ class PandoraCoordinator:
                         taskData[3] = "unassigned"
                         taskData[5] = ""
 
-                    self.setConfig(
-                        "jobtasks", "task%04d" % taskNum, taskData, configPath=jobConf
-                    )
+                    self.jobIndex.setTask(jobCode, "task%04d" % taskNum, taskData)
                     self.writeLog(
                         "%sd task %s from Job %s (%s)" % (action, taskNum, jobName, origin),
                         1,
@@ -1086,29 +2700,7 @@ class PandoraCoordinator:
                     warnTime = command[4]
 
                     if warnType == "Coordinator":
-                        warningConfig = self.getConfig(
-                            configPath=self.coordWarningsConf, getConf=True
-                        )
-
-                        warnings = []
-                        if "warnings" in warningConfig:
-                            for i in warningConfig["warnings"]:
-                                warnings.append(warningConfig["warnings"][i])
-
-                            warnings = [
-                                x
-                                for x in warnings
-                                if not (x[0] == warnText and x[1] == warnTime)
-                            ]
-
-                        warningConfig = {"warnings": {}}
-
-                        for idx, val in enumerate(warnings):
-                            warningConfig["warnings"]["warning%s" % idx] = val
-
-                        self.setConfig(
-                            configPath=self.coordWarningsConf, confData=warningConfig
-                        )
+                        self.warningStore.delete(warnText, warnTime)
 
                     elif warnType == "Slave":
                         self.sendCommand(slaveName, ["deleteWarning", warnText, warnTime])
@@ -1123,10 +2715,7 @@ class PandoraCoordinator:
                     slaveName = command[2]
 
                     if warnType == "Coordinator":
-                        warnConfig = {"warnings": {}}
-                        self.setConfig(
-                            confData=warnConfig, configPath=self.coordWarningsConf
-                        )
+                        self.warningStore.clear()
 
                     elif warnType == "Slave":
                         self.sendCommand(slaveName, ["clearWarnings"])
@@ -1142,6 +2731,7 @@ class PandoraCoordinator:
 
                     if logType == "Coordinator":
                         logPath = self.coordLog
+                        self.logWriter.flush()
                         open(logPath, "w").close()
 
                     elif logType == "Slave":
@@ -1151,16 +2741,22 @@ class PandoraCoordinator:
                         "Cleared log for %s %s (%s)" % (logType, logName, origin), 1
                     )
 
-                elif command[0] == "collectJob":
+                elif command[0] == "outputUpdate":
+                    # frames, which the slave uploaded while rendering, are collected early
                     jobCode = command[1]
+                    if self.localMode or self.jobIndex.getJob(jobCode) is None:
+                        continue
 
-                    jobConf = os.path.join(self.repPath, "Jobs", jobCode, "PandoraJob.json")
+                    self.outputIndex.addManifest(jobCode, origin, command[2])
+                    if origin not in self.collectTasks:
+                        self.collectTasks[origin] = {}
 
-                    jName = self.getConfig("information", "jobName", configPath=jobConf)
-                    if jName is not None:
-                        jobName = jName
-                    else:
-                        jobName = jobCode
+                    if jobCode not in self.collectTasks[origin]:
+                        self.collectTasks[origin][jobCode] = len(command[2])
+
+                elif command[0] == "collectJob":
+                    jobCode = command[1]
+                    jobName = self.jobIndex.getJobName(jobCode)
 
                     copiedNum, errors, targetPath = self.collectOutput(jobCode=jobCode)
 
@@ -1177,11 +2773,43 @@ class PandoraCoordinator:
 
                     self.writeLog(collectStr + " (%s)" % (origin), errorLvl)
 
+        return True
+
+    @err_decorator
+    def removeCmd(self, cmFile, origin=""):
         try:
             os.remove(cmFile)
         except:
             self.writeLog("ERROR - cannot remove file: %s (%s)" % (cmFile, origin), 3)
 
+    # compares the parsing speed of legacy str(list) commands and json commands. Can be
+    # executed with the "command" setting, e.g. self.benchmarkCmdParser(10000)
+    @err_decorator
+    def benchmarkCmdParser(self, cmdCount=10000):
+        commands = [
+            ["taskUpdate", "job%s" % (x % 50), "task%04d" % x, "finished", "0:01:%02d" % (x % 60), time.time(), time.time(), x % 5]
+            for x in range(cmdCount)
+        ]
+        legacyTexts = [str(x) for x in commands]
+        jsonTexts = [formatCmd(x) for x in commands]
+
+        results = []
+        for name, parser, texts in [
+            ["eval (legacy)", eval, legacyTexts],
+            ["parseCmds (legacy)", parseCmds, legacyTexts],
+            ["parseCmds (json)", parseCmds, jsonTexts],
+            ["parseCmds (json batch)", parseCmds, ["".join(jsonTexts)]],
+        ]:
+            startTime = time.time()
+            for text in texts:
+                parser(text)
+            results.append("%s: %.3fs" % (name, time.time() - startTime))
+
+        self.writeLog(
+            "Command parser benchmark (%s commands) - %s" % (cmdCount, ", ".join(results)), 1
+        )
+        return results
+
     @err_decorator
     def searchUncollectedRnd(self):
         uncollRnds = {}
@@ -1194,6 +2822,10 @@ class PandoraCoordinator:
                     if n not in uncollRnds:
                         uncollRnds[n] = 0
 
+                    if self.outputIndex.hasManifest(n, i[len("S_") :]):
+                        uncollRnds[n] += len(self.outputIndex.getPending(n, i[len("S_") :]))
+                        continue
+
                     jobPath = os.path.join(slOutput, n)
                     for k in os.walk(jobPath):
                         for m in k[2]:
@@ -1222,7 +2854,7 @@ class PandoraCoordinator:
         self.writeLog(collectStr, errorLvl)
 
     @err_decorator
-    def getJobAssignments(self):
+    def getJobAssignments(self, workstations=None):
         self.writeLog("Check job submissions")
 
         if not os.path.exists(os.path.join(self.slPath, "Workstations")):
@@ -1240,11 +2872,14 @@ class PandoraCoordinator:
                 ) or not i.startswith("WS_"):
                     continue
 
+                if workstations is not None and i not in workstations:
+                    continue
+
                 cmdDir = os.path.join(self.slPath, "Workstations", i, "Commands")
                 wsName = i[len("WS_") :]
 
                 if os.path.exists(cmdDir):
-                    for k in sorted(os.listdir(cmdDir)):
+                    for k in sorted(os.listdir(cmdDir), key=getCmdOrder):
                         cmFile = os.path.join(cmdDir, k)
 
                         if k == "Pandora_update.zip":
@@ -1322,6 +2957,22 @@ class PandoraCoordinator:
 
                         for m in cData["projectAssets"]:
                             aPath = os.path.join(wspaFolder, m[0])
+
+                            # assets with a hash are stored once by their content
+                            if len(m) >= 3:
+                                if os.path.exists(self.getAssetBlobPath(m[2])):
+                                    existingFiles += 1
+                                elif os.path.exists(aPath):
+                                    if self.copyAssetBlob(aPath, m[2]):
+                                        existingFiles += 1
+                                    else:
+                                        self.writeWarning(
+                                            "Could not copy file to ProjectAssets: %s %s %s %s"
+                                            % (wsName, cData["projectName"], jobName, m),
+                                            2,
+                                        )
+                                continue
+
                             if not os.path.exists(aPath):
                                 continue
 
@@ -1400,6 +3051,7 @@ class PandoraCoordinator:
                         "Job %s was added to the JobRepository from %s" % (jobName, wsName),
                         1,
                     )
+                    self.checkJobDependencies(jobCode)
 
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -1410,11 +3062,15 @@ class PandoraCoordinator:
                 )
 
     @err_decorator
-    def checkSlaves(self):
+    def checkSlaves(self, slaves=None):
         # checks for updated slave script and handles slaveout commands
         self.writeLog("Checking slave commands.")
 
+        cmdFiles = []
         for i in os.listdir(os.path.join(self.slPath, "Slaves")):
+            if slaves is not None and i not in slaves:
+                continue
+
             try:
                 slavePath = os.path.join(self.slPath, "Slaves", i)
                 if not (i.startswith("S_") and os.path.isdir(slavePath)):
@@ -1422,22 +3078,26 @@ class PandoraCoordinator:
                     continue
 
                 slaveName = i[len("S_") :]
-                slaveActivePath = os.path.join(slavePath, "slaveActive_%s" % slaveName)
                 slaveComPath = os.path.join(slavePath, "Communication")
 
                 file_mod_time = 0
 
-                if os.path.exists(slaveActivePath):
-                    file_mod_time = os.stat(slaveActivePath).st_mtime
+                heartbeat = self.slaveRegistry.loadHeartbeat(slaveName)
+                if heartbeat is not None:
+                    file_mod_time = heartbeat["mtime"]
+                else:
+                    slaveActivePath = os.path.join(slavePath, "slaveActive_%s" % slaveName)
+                    if os.path.exists(slaveActivePath):
+                        file_mod_time = os.stat(slaveActivePath).st_mtime
 
-                webapiPath = os.path.join(
-                    os.path.dirname(slavePath), "webapi", "slaveActive_%s" % slaveName
-                )
-                if (
-                    os.path.exists(webapiPath)
-                    and os.stat(webapiPath).st_mtime > file_mod_time
-                ):
-                    file_mod_time = os.stat(webapiPath).st_mtime
+                    webapiPath = os.path.join(
+                        os.path.dirname(slavePath), "webapi", "slaveActive_%s" % slaveName
+                    )
+                    if (
+                        os.path.exists(webapiPath)
+                        and os.stat(webapiPath).st_mtime > file_mod_time
+                    ):
+                        file_mod_time = os.stat(webapiPath).st_mtime
 
                 last_time = int((time.time() - file_mod_time) / 60)
 
@@ -1549,12 +3209,12 @@ class PandoraCoordinator:
                         )
                         continue
 
-                for k in sorted(os.listdir(slaveComPath)):
+                for k in sorted(os.listdir(slaveComPath), key=getCmdOrder):
                     if not k.startswith("slaveOut_"):
                         continue
 
                     cmFile = os.path.join(slaveComPath, k)
-                    self.handleCmd(cmFile, origin=slaveName)
+                    cmdFiles.append([cmFile, slaveName])
 
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -1564,6 +3224,8 @@ class PandoraCoordinator:
                     3,
                 )
 
+        self.handleCmdBatch(cmdFiles)
+
     @err_decorator
     def checkConnection(self):
         if not self.restartGDriveEnabled:
@@ -1622,16 +3284,16 @@ class PandoraCoordinator:
             jobCode = i[0]
             taskName = i[1]
 
-            confPath = os.path.join(self.jobPath, jobCode, "PandoraJob.json")
-
-            if not os.path.exists(confPath):
-                self.writeWarning("Job config does not exist: %s" % confPath, 2)
+            if self.jobIndex.getJob(jobCode) is None:
+                self.writeWarning(
+                    "Job config does not exist: %s" % self.jobIndex.getConfPath(jobCode), 2
+                )
                 removed.append(i)
                 continue
 
-            taskData = self.getConfig("jobtasks", taskName, configPath=confPath)
+            taskData = self.jobIndex.getTask(jobCode, taskName)
             if taskData is None:
-                self.writeWarning("no jobtasks in %s" % confPath)
+                self.writeWarning("no jobtasks in %s" % self.jobIndex.getConfPath(jobCode))
                 continue
 
             if taskData[2] != "rendering":
@@ -1639,15 +3301,12 @@ class PandoraCoordinator:
                 continue
 
             rSlave = taskData[3]
-            slaveSettings = os.path.join(
-                self.slPath, "Slaves", "S_%s" % rSlave, "slaveSettings_%s.json" % rSlave
-            )
-            if not os.path.exists(slaveSettings):
+            if self.slaveRegistry.getSlave(rSlave) is None:
                 self.writeWarning("slave settings does not exist: %s" % rSlave)
                 continue
 
-            sStatus = self.getConfig("slaveinfo", "status", configPath=slaveSettings)
-            sTasks = self.getConfig("slaveinfo", "curtasks", configPath=slaveSettings)
+            sStatus = self.slaveRegistry.getStatus(rSlave)
+            sTasks = self.slaveRegistry.getCurTasks(rSlave)
 
             if sStatus != "idle" and sTasks is not None:
                 for task in sTasks:
@@ -1659,7 +3318,7 @@ class PandoraCoordinator:
                     taskData[4] = ""
                     taskData[5] = ""
                     taskData[6] = ""
-                    self.setConfig("jobtasks", taskName, taskData, configPath=confPath)
+                    self.jobIndex.setTask(jobCode, taskName, taskData)
 
                     removed.append(i)
                     self.writeLog("Reset task %s of job %s" % (taskName, jobCode), 1)
@@ -1671,103 +3330,49 @@ class PandoraCoordinator:
     def getAvailableSlaves(self):
         self.writeLog("Getting available slaves.")
 
-        jobBase = os.path.join(self.repPath, "Jobs")
-        slaveAssignments = {}
-
-        if os.path.exists(jobBase):
-            for i in os.listdir(jobBase):
-                try:
-                    confPath = os.path.join(jobBase, i, "PandoraJob.json")
-
-                    if not os.path.exists(confPath):
-                        continue
-
-                    jobConfig = self.getConfig(configPath=confPath, getConf=True)
-
-                    if "jobtasks" not in jobConfig:
-                        self.writeWarning(
-                            "Job config does not contain jobtasks: %s" % confPath, 2
-                        )
-                        continue
-
-                    for k in jobConfig["jobtasks"]:
-                        taskData = jobConfig["jobtasks"][k]
-                        if taskData[2] in ["assigned", "rendering"]:
-                            try:
-                                startTime = float(taskData[5])
-                            except:
-                                pass
-                            else:
-                                elapsedTime = (time.time() - startTime) / 60.0
-
-                                taskTimedOut = False
-                                if taskData[2] == "assigned":
-                                    if elapsedTime > 15:
-                                        taskTimedOut = True
-
-                                elif taskData[2] == "rendering":
-                                    if "taskTimeout" in jobConfig["jobglobals"]:
-                                        timeout = jobConfig["jobglobals"]["taskTimeout"]
-                                        if elapsedTime > timeout:
-                                            taskTimedOut = True
-
-                                if "jobName" in jobConfig["information"]:
-                                    jName = jobConfig["information"]["jobName"]
-                                else:
-                                    jName = ""
-
-                                if taskTimedOut:
-                                    self.sendCommand(
-                                        taskData[3], ["cancelTask", jName, i, k]
-                                    )
-
-                                    taskData[2] = "ready"
-                                    taskData[3] = "unassigned"
-                                    taskData[4] = ""
-                                    taskData[5] = ""
-                                    taskData[6] = ""
-                                    self.setConfig(
-                                        "jobtasks", k, taskData, configPath=confPath
-                                    )
+        taskTracker = self.jobIndex.taskTracker
+        for jobCode, taskName in taskTracker.popExpired(time.time()):
+            try:
+                taskData = self.jobIndex.getTask(jobCode, taskName)
+                jName = self.jobIndex.getValue(jobCode, "information", "jobName") or ""
+                elapsedTime = (time.time() - float(taskData[5])) / 60.0
 
-                                    self.writeLog(
-                                        "Timeout of %s from Job %s (%s min)"
-                                        % (k, jName, elapsedTime),
-                                        1,
-                                    )
-                                    continue
+                self.sendCommand(taskData[3], ["cancelTask", jobCode, taskName])
 
-                            slaveName = taskData[3]
-                            if slaveName not in slaveAssignments:
-                                slaveAssignments[slaveName] = {"concurrent": []}
+                taskData[2] = "ready"
+                taskData[3] = "unassigned"
+                taskData[4] = ""
+                taskData[5] = ""
+                taskData[6] = ""
+                self.jobIndex.setTask(jobCode, taskName, taskData)
 
-                            jobCon = jobConfig["jobglobals"].get("concurrentTasks", 1)
-                            slaveAssignments[slaveName]["concurrent"].append(jobCon)
-                            # self.writeLog("DEBUG - unavailable slaves: %s - %s" % (taskData[3],i))
-                except Exception as e:
-                    exc_type, exc_obj, exc_tb = sys.exc_info()
-                    self.writeLog(
-                        "ERROR - getAvailableSlaves - %s - %s - %s"
-                        % (str(e), exc_type, exc_tb.tb_lineno),
-                        3,
-                    )
+                self.writeLog(
+                    "Timeout of %s from Job %s (%s min)" % (taskName, jName, elapsedTime), 1
+                )
+            except Exception as e:
+                exc_type, exc_obj, exc_tb = sys.exc_info()
+                self.writeLog(
+                    "ERROR - getAvailableSlaves - %s - %s - %s"
+                    % (str(e), exc_type, exc_tb.tb_lineno),
+                    3,
+                )
 
         # self.writeLog("DEBUG - unavailable slaves: %s" % unavailableSlaves)
 
         for slave in self.activeSlaves:
             try:
                 slaveData = {"name": slave}
-                slaveSettings = os.path.join(
-                    self.slPath, "Slaves", "S_%s" % slave, "slaveSettings_%s.json" % slave
-                )
-                if not os.path.exists(slaveSettings):
+                if self.slaveRegistry.getSlave(slave) is None:
                     self.writeWarning("slave settings does not exist: %s" % slave)
                     continue
 
-                maxSlaveTasks = self.getConfig("settings", "maxConcurrentTasks", configPath=slaveSettings)
+                maxSlaveTasks = self.slaveRegistry.getMaxTasks(slave)
 
-                if slave in slaveAssignments:
-                    concList = slaveAssignments[slave]["concurrent"]
+                concList = [
+                    self.jobIndex.getValue(x[0], "jobglobals", "concurrentTasks") or 1
+                    for x in taskTracker.getSlaveTasks(slave)
+                ]
+                if len(concList) > 0:
                     if len(concList) >= min(concList) or len(concList) >= maxSlaveTasks:
                         continue
 
@@ -1790,31 +3395,48 @@ class PandoraCoordinator:
     def assignJobs(self):
         self.writeLog("Start checking jobs")
 
-        jobPrios = self.getConfig(configPath=self.prioList, getConf=True)
+        readyQueue = self.jobIndex.readyQueue
+        jobPrios = self.getConfig(configPath=self.prioList, getConf=True) or {}
         self.jobDirs = [
             x
             for x in reversed(sorted(jobPrios, key=lambda x: jobPrios[x]["priority"]))
             if os.path.exists(os.path.join(self.repPath, "Jobs", x))
         ]
 
-        for jobDir in self.jobDirs:
-            confPath = os.path.join(self.jobPath, jobDir, "PandoraJob.json")
+        # jobs, which were submitted since the last refresh of the job index
+        for jobCode in self.jobDirs:
+            if jobCode not in self.jobIndex.jobs:
+                self.jobIndex.getJob(jobCode)
+
+        readyQueue.setPriorities(jobPrios)
 
-            if not os.path.exists(confPath):
+        for jobDir in readyQueue.getJobs():
+            if len(self.availableSlaves) == 0:
+                break
+
+            jobConfig = self.jobIndex.getJob(jobDir)
+
+            if jobConfig is None:
                 self.writeWarning("Job config does not exist: %s" % jobDir, 2)
                 continue
 
-            jobConfig = self.getConfig(configPath=confPath, getConf=True)
             cData = {}
-            cData["jobName"] = ["information", "jobName"]
-            cData["sceneName"] = ["information", "sceneName"]
-            cData["fileCount"] = ["information", "fileCount"]
-            cData["projectAssets"] = ["information", "projectAssets"]
-            cData["jobDependecies"] = ["jobglobals", "jobDependecies"]
-            cData["listSlaves"] = ["jobglobals", "listSlaves"]
-            cData["projectName"] = ["information", "projectName"]
-            cData["concurrentTasks"] = ["jobglobals", "concurrentTasks"]
-            cData = self.getConfig(data=cData, configPath=confPath)
+            cData["jobName"] = self.jobIndex.getValue(jobDir, "information", "jobName")
+            cData["sceneName"] = self.jobIndex.getValue(jobDir, "information", "sceneName")
+            cData["fileCount"] = self.jobIndex.getValue(jobDir, "information", "fileCount")
+            cData["projectAssets"] = self.jobIndex.getValue(
+                jobDir, "information", "projectAssets"
+            )
+            cData["jobDependecies"] = self.jobIndex.getValue(
+                jobDir, "jobglobals", "jobDependecies"
+            )
+            cData["listSlaves"] = self.jobIndex.getValue(jobDir, "jobglobals", "listSlaves")
+            cData["projectName"] = self.jobIndex.getValue(
+                jobDir, "information", "projectName"
+            )
+            cData["concurrentTasks"] = self.jobIndex.getValue(
+                jobDir, "jobglobals", "concurrentTasks"
+            )
 
             if cData["jobName"] is not None:
                 jobName = cData["jobName"]
@@ -1847,60 +3469,41 @@ class PandoraCoordinator:
                 self.writeWarning("Job tasks are missing: %s" % jobName, 2)
                 continue
 
-            dependentSlaves = []
+            dependentSlaves = set()
 
             if cData["jobDependecies"] is not None:
                 depsFinished = [True]
-                jobDeps = cData["jobDependecies"]
-                for jDep in jobDeps:
-                    if len(jDep) == 2:
-                        depName = jDep[0]
-                        depConf = os.path.join(self.jobPath, depName, "PandoraJob.json")
-                        if not os.path.exists(depConf):
-                            self.writeWarning(
-                                "For job %s the dependent job %s is missing."
-                                % (jobName, depName),
-                                2,
-                            )
-                            depsFinished = [False, depName]
-                            break
-
-                        depConfig = self.getConfig(configPath=depConf, getConf=True)
-
-                        if (
-                            "information" in depConfig
-                            and "jobName" in depConfig["information"]
-                        ):
-                            depJobName = depConfig["information"]["jobName"]
-                        else:
-                            depJobName = depName
+                depGraph = self.jobIndex.depGraph
+                for depName in depGraph.getDeps(jobDir):
+                    depConfig = self.jobIndex.getJob(depName)
+                    if depConfig is None:
+                        self.writeWarning(
+                            "For job %s the dependent job %s is missing." % (jobName, depName),
+                            2,
+                        )
+                        depsFinished = [False, depName]
+                        break
 
-                        if not "jobtasks" in depConfig:
-                            self.writeWarning(
-                                "For job %s the dependent job %s has no tasks."
-                                % (jobName, depJobName),
-                                2,
-                            )
-                            depsFinished = [False, depJobName]
-                            break
+                    depJobName = self.jobIndex.getJobName(depName)
 
-                        for dTask in depConfig["jobtasks"]:
-                            taskData = depConfig["jobtasks"][dTask]
+                    if not "jobtasks" in depConfig:
+                        self.writeWarning(
+                            "For job %s the dependent job %s has no tasks."
+                            % (jobName, depJobName),
+                            2,
+                        )
+                        depsFinished = [False, depJobName]
+                        break
 
-                            if not (
-                                type(taskData) == list
-                                and len(taskData) == 7
-                                and taskData[2] == "finished"
-                            ):
-                                depsFinished = [False, depJobName]
-                                break
-                            else:
-                                if taskData[3] not in dependentSlaves:
-                                    dependentSlaves.append(taskData[3])
+                    if depName in depGraph.getFrameDeps(jobDir):
+                        continue
 
-                    if not depsFinished[0]:
+                    if not depGraph.isFinished(depName):
+                        depsFinished = [False, depJobName]
                         break
 
+                    dependentSlaves |= depGraph.getFinishedSlaves(depName)
+
                 if not depsFinished[0]:
                     self.writeLog(
                         "For job %s the dependent job %s is not finished."
@@ -1919,6 +3522,10 @@ class PandoraCoordinator:
                 else:
                     whiteList = True
 
+                if listSlaves.startswith("groups: "):
+                    jGroups = listSlaves[len("groups: "):].split(", ")
+                    groupSlaves = self.slaveRegistry.getSlavesInGroups(jGroups, whiteList)
+
                 for slave in self.availableSlaves:
                     slaveName = slave["name"]
                     if len(dependentSlaves) > 0 and slaveName not in dependentSlaves:
@@ -1929,22 +3536,7 @@ class PandoraCoordinator:
                         continue
 
                     if listSlaves.startswith("groups: "):
-                        jGroups = listSlaves[len("groups: "):].split(", ")
-
-                        slaveSettings = os.path.join(
-                            self.slPath, "Slaves", "S_%s" % slaveName, "slaveSettings_%s.json" % slaveName
-                        )
-                        slaveGroups = self.getConfig(
-                            "settings", "slaveGroup", configPath=slaveSettings
-                        )
-
-                        if slaveGroups is None:
-                            continue
-
-                        for k in jGroups:
-                            if (k not in slaveGroups) == whiteList:
-                                break
-                        else:
+                        if slaveName in groupSlaves:
                             jobSlaves.append(slave)
                     else:
                         if (
@@ -1953,23 +3545,21 @@ class PandoraCoordinator:
                         ):
                             jobSlaves.append(slave)
 
-            for i in sorted(jobConfig["jobtasks"]):
-                taskData = jobConfig["jobtasks"][i]
+            for i, taskSlaves in self.getAssignableTasks(jobDir, jobName):
                 if len(jobSlaves) == 0:
                     break
 
-                if not (type(taskData) == list and len(taskData) == 7):
-                    continue
-
-                if taskData[2] != "ready":
-                    continue
+                if len(taskSlaves) > 0:
+                    assignableSlaves = [x for x in jobSlaves if x["name"] in taskSlaves]
+                    if len(assignableSlaves) == 0:
+                        continue
+                else:
+                    assignableSlaves = jobSlaves
 
-                assignedSlave = jobSlaves[0]
+                taskData = jobConfig["jobtasks"][i]
+                assignedSlave = assignableSlaves[0]
 
                 slavePath = os.path.join(self.slPath, "Slaves", "S_%s" % assignedSlave["name"])
-                slaveSettings = os.path.join(
-                    slavePath, "slaveSettings_%s.json" % assignedSlave["name"]
-                )
 
                 slaveJobPath = os.path.join(slavePath, "AssignedJobs", "%s" % jobDir)
 
@@ -1980,17 +3570,26 @@ class PandoraCoordinator:
                         "Copying job files for job %s to slave %s."
                         % (jobName, assignedSlave["name"])
                     )
-                    shutil.copytree(os.path.join(self.jobPath, jobDir), slaveJobPath)
+                    self.jobIndex.exportJob(jobDir)
+                    self.fileDistributor.copyTree(
+                        os.path.join(self.jobPath, jobDir), slaveJobPath
+                    )
 
                 if cData["projectAssets"] is not None:
                     jpAssets = cData["projectAssets"][1:]
                     pName = cData["projectName"]
                     sPAssetPath = os.path.join(slavePath, "ProjectAssets", pName)
-                    if not os.path.exists(sPAssetPath):
-                        os.makedirs(sPAssetPath)
+                    sBlobPath = os.path.join(slavePath, "ProjectAssets", "Blobs")
+                    for assetFolder in [sPAssetPath, sBlobPath]:
+                        if not os.path.exists(assetFolder):
+                            os.makedirs(assetFolder)
 
                     for k in jpAssets:
-                        paPath = os.path.join(self.pAssetPath, pName, k[0])
+                        if len(k) >= 3:
+                            paPath = self.getAssetBlobPath(k[2])
+                        else:
+                            paPath = os.path.join(self.pAssetPath, pName, k[0])
+
                         if not os.path.exists(paPath):
                             self.writeWarning(
                                 "Required ProjectAsset does not exist: %s %s"
@@ -1999,19 +3598,24 @@ class PandoraCoordinator:
                             )
                             continue
 
-                        sPAsset = os.path.join(sPAssetPath, k[0])
-                        if os.path.exists(sPAsset) and os.path.getmtime(
-                            paPath
-                        ) == os.path.getmtime(sPAsset):
-                            continue
+                        if len(k) >= 3:
+                            sPAsset = os.path.join(sBlobPath, k[2])
+                            if os.path.exists(sPAsset):
+                                continue
+                        else:
+                            sPAsset = os.path.join(sPAssetPath, k[0])
+                            if os.path.exists(sPAsset) and os.path.getmtime(
+                                paPath
+                            ) == os.path.getmtime(sPAsset):
+                                continue
 
                         self.writeLog(
                             "Copying project asset %s to slave %s." % (k[0], assignedSlave["name"])
                         )
 
-                        shutil.copy2(paPath, sPAsset)
+                        self.fileDistributor.copyFile(paPath, sPAsset)
 
-                cmd = str(["renderTask", jobDir, jobName, i])
+                cmd = ["renderTask", jobDir, jobName, i]
                 self.sendCommand(assignedSlave["name"], cmd)
 
                 taskData[2] = "assigned"
@@ -2027,40 +3631,110 @@ class PandoraCoordinator:
                     jobSlaves.remove(assignedSlave)
                     self.availableSlaves = [x for x in self.availableSlaves if x["name"] != assignedSlave["name"]]
 
-                self.setConfig("jobtasks", i, taskData, configPath=confPath)
+                self.jobIndex.setTask(jobDir, i, taskData)
                 self.writeLog(
                     "Assigned %s to %s in job %s" % (assignedSlave["name"], i, jobName), 1
                 )
 
-    @err_decorator
-    def sendCommand(self, slave, cmd):
-        cmdDir = os.path.join(self.slPath, "Slaves", "S_%s" % slave, "Communication")
-        curNum = 1
+    def getAssetBlobPath(self, fileHash):
+        return os.path.join(self.pAssetPath, "Blobs", fileHash)
 
-        for i in os.listdir(cmdDir):
-            if not i.startswith("slaveIn_"):
-                continue
+    # copies a project asset into the asset store and verifies its hash on the way. Returns
+    # False, if the content doesn't match the hash from the job manifest.
+    def copyAssetBlob(self, srcPath, fileHash):
+        blobPath = self.getAssetBlobPath(fileHash)
+        if not os.path.exists(os.path.dirname(blobPath)):
+            os.makedirs(os.path.dirname(blobPath))
 
-            num = i.split("_")[1]
-            if sys.version[0] == "2":
-                unum = unicode(num)
-            else:
-                unum = num
+        tmpPath = "%s.tmp%s" % (blobPath, os.getpid())
+        try:
+            copyHash = hashFile(srcPath, targetPath=tmpPath)
+            if copyHash != fileHash:
+                self.writeLog(
+                    "Project asset %s doesn't match the hash of the job manifest." % srcPath, 2
+                )
+                os.remove(tmpPath)
+                return False
 
-            if not unum.isnumeric():
-                continue
+            shutil.copystat(srcPath, tmpPath)
+            os.rename(tmpPath, blobPath)
+        except Exception as e:
+            self.writeLog("ERROR - could not store project asset %s - %s" % (srcPath, e), 2)
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
 
-            if int(num) >= curNum:
-                curNum = int(num) + 1
+            return os.path.exists(blobPath)
 
-        cmdFile = os.path.join(
-            cmdDir, "slaveIn_%s_%s.txt" % (format(curNum, "04"), time.time())
-        )
+        return True
+
+    # logs how many bytes were linked instead of copied to the slaves during this cycle
+    def reportDistribution(self):
+        if self.fileDistributor.linkedFiles > 0 or self.fileDistributor.copiedFiles > 0:
+            self.writeLog("Distributed job files - %s" % self.fileDistributor.getStats(), 1)
+
+        self.fileDistributor.resetStats()
+        self.fileDistributor.transfer.resetStats()
+
+    # yields the ready tasks of a job and the slaves, which can render them. Tasks with frame
+    # dependencies are only yielded, when the overlapping tasks of the dependent jobs are finished.
+    def getAssignableTasks(self, jobCode, jobName):
+        readyQueue = self.jobIndex.readyQueue
+        depGraph = self.jobIndex.depGraph
+        frameDeps = depGraph.getFrameDeps(jobCode)
+
+        if len(frameDeps) == 0:
+            while True:
+                taskName = readyQueue.getNextTask(jobCode)
+                if taskName is None:
+                    return
+
+                yield taskName, set()
+
+        for taskName in readyQueue.iterReadyTasks(jobCode):
+            taskData = self.jobIndex.getTask(jobCode, taskName)
+            taskSlaves = set()
+            for depName in frameDeps:
+                depFinished, depSlaves = depGraph.getRangeState(depName, taskData)
+                if not depFinished:
+                    self.writeLog(
+                        "For %s in job %s the frames of the dependent job %s are not finished."
+                        % (taskName, jobName, self.jobIndex.getJobName(depName)),
+                        0,
+                    )
+                    break
+
+                taskSlaves |= depSlaves
+            else:
+                yield taskName, taskSlaves
+
+    @err_decorator
+    def sendCommand(self, slave, cmd):
+        if slave not in self.cmdChannels:
+            cmdDir = os.path.join(self.slPath, "Slaves", "S_%s" % slave, "Communication")
+            self.cmdChannels[slave] = CommandChannel(cmdDir, "slaveIn")
 
         self.writeLog("Sending command: %s" % cmd)
+        self.cmdChannels[slave].queue(cmd)
 
-        with open(cmdFile, "w") as cFile:
-            cFile.write(str(cmd))
+    # writes the commands, which were sent during this cycle, with one file per slave
+    @err_decorator
+    def flushCommands(self):
+        for slave in sorted(self.cmdChannels):
+            channel = self.cmdChannels[slave]
+            try:
+                channel.flush()
+            except Exception as e:
+                if os.path.exists(channel.cmdDir):
+                    self.writeLog(
+                        "ERROR - could not write commands for %s - %s" % (slave, e), 3
+                    )
+                else:
+                    self.writeLog(
+                        "Communication folder of %s doesn't exist. Dropping %s commands."
+                        % (slave, len(channel.pending)),
+                        2,
+                    )
+                    del self.cmdChannels[slave]
 
     @err_decorator
     def checkTvRequests(self):
@@ -2107,26 +3781,36 @@ class PandoraCoordinator:
                     )
                     continue
 
-                fileCount = 0
-                for i in os.walk(outputPath):
-                    fileCount += len(i[2])
-
-                if fileCount != expNum:
-                    self.writeLog(
-                        "Can't collect output. The fileCount doesn't match: %s from %s for %s"
-                        % (fileCount, expNum, outputPath)
-                    )
-                    continue
+                if self.outputIndex.hasManifest(job, slave):
+                    result = self.collectManifest(slave, job)
+                    if result is None:
+                        continue
 
-                copiedNum, errors, targetPath = self.collectOutput(slave=slave, jobCode=job)
+                    copiedNum, errors, targetPath, missingNum = result
+                    if missingNum > 0:
+                        # the remaining files get collected in one of the next cycles
+                        self.writeLog(
+                            "Can't collect all output. %s files are not synced yet for %s"
+                            % (missingNum, outputPath)
+                        )
+                        continue
+                else:
+                    # unfinished uploads aren't output yet
+                    fileCount = 0
+                    for i in os.walk(outputPath):
+                        fileCount += len([x for x in i[2] if not isTransferTemp(x)])
 
-                jobConf = os.path.join(self.repPath, "Jobs", job, "PandoraJob.json")
-                jName = self.getConfig("information", "jobName", configPath=jobConf)
+                    if fileCount != expNum:
+                        self.writeLog(
+                            "Can't collect output. The fileCount doesn't match: %s from %s for %s"
+                            % (fileCount, expNum, outputPath)
+                        )
+                        continue
 
-                if jName is not None:
-                    jobName = jName
-                else:
-                    jobName = job
+                    copiedNum, errors, targetPath = self.collectOutput(
+                        slave=slave, jobCode=job
+                    )
+                jobName = self.jobIndex.getJobName(job)
 
                 collectStr = ""
                 if copiedNum != 0 or errors != 0:
@@ -2149,33 +3833,69 @@ class PandoraCoordinator:
         for i in removeTasks:
             del self.collectTasks[i[0]][i[1]]
 
+    # collects the files from the output manifests of a slave, which weren't collected yet.
+    # Files, which aren't synced completely to the slave output folder, are counted as missing.
     @err_decorator
-    def collectOutput(self, slave=None, jobCode=None):
-        jobConf = os.path.join(self.repPath, "Jobs", jobCode, "PandoraJob.json")
-        if os.path.exists(jobConf):
-            jconfig = self.getConfig(configPath=jobConf, getConf=True)
-            cData = {}
-            cData["submitWorkstation"] = ["information", "submitWorkstation"]
-            cData["projectName"] = ["information", "projectName"]
-            cData = self.getConfig(data=cData, configPath=jobConf)
-        else:
-            self.writeWarning("Job config does not exist for job: %s" % (jobCode), 2)
-            return [0, 0, ""]
+    def collectManifest(self, slave, jobCode):
+        targetBase = self.getCollectTarget(jobCode)
+        if targetBase is None:
+            return None
+
+        outputPath = os.path.join(self.slPath, "Slaves", "S_" + slave, "Output", jobCode)
+        jobFiles = self.outputIndex.getJob(jobCode)
+        transfer = FileTransfer(threads=self.transferThreads)
+        queued = {}
+        missingNum = 0
+        for relPath in self.outputIndex.getPending(jobCode, slave):
+            filePath = os.path.join(outputPath, *relPath.split("/"))
+            try:
+                fileSize = os.path.getsize(filePath)
+            except OSError:
+                missingNum += 1
+                continue
 
-        copiedNum = 0
-        errors = 0
-        targetPath = "None"
-        if cData["submitWorkstation"] is not None:
-            targetBase = os.path.join(
-                self.slPath,
-                "Workstations",
-                "WS_" + cData["submitWorkstation"],
-                "RenderOutput",
-                cData["projectName"],
-                jobCode,
+            if fileSize != jobFiles[relPath][0]:
+                missingNum += 1
+                continue
+
+            transfer.add(filePath, os.path.join(targetBase, *relPath.split("/")))
+            queued[filePath] = relPath
+
+        errors = transfer.run()
+        failedFiles = set(x[0] for x in transfer.errors)
+        for filePath in queued:
+            if filePath not in failedFiles:
+                self.outputIndex.setCollected(jobCode, queued[filePath])
+
+        self.outputIndex.save()
+        if transfer.copiedFiles > 0 or errors > 0:
+            self.writeLog(
+                "Collected output of job %s from %s - %s" % (jobCode, slave, transfer.getStats()),
+                1,
             )
-        else:
-            return [0, 0, ""]
+
+        return [transfer.copiedFiles, errors, targetBase, missingNum]
+
+    # returns the output folder of a job on its workstation and copies the job config there
+    def getCollectTarget(self, jobCode):
+        jobConf = self.jobIndex.getConfPath(jobCode)
+        if self.jobIndex.getJob(jobCode) is None:
+            self.writeWarning("Job config does not exist for job: %s" % (jobCode), 2)
+            return None
+
+        submitWorkstation = self.jobIndex.getValue(jobCode, "information", "submitWorkstation")
+        projectName = self.jobIndex.getValue(jobCode, "information", "projectName")
+        if submitWorkstation is None:
+            return None
+
+        targetBase = os.path.join(
+            self.slPath,
+            "Workstations",
+            "WS_" + submitWorkstation,
+            "RenderOutput",
+            projectName,
+            jobCode,
+        )
 
         jfolderExists = True
         if not os.path.exists(targetBase):
@@ -2185,11 +3905,32 @@ class PandoraCoordinator:
                 jfolderExists = False
 
         if jfolderExists:
+            self.jobIndex.exportJob(jobCode)
             try:
                 shutil.copy2(jobConf, targetBase)
             except:
                 pass
 
+        return targetBase
+
+    @err_decorator
+    def collectOutput(self, slave=None, jobCode=None):
+        jconfig = self.jobIndex.getJob(jobCode)
+        targetBase = self.getCollectTarget(jobCode)
+        if targetBase is None:
+            return [0, 0, ""]
+
+        cData = {}
+        cData["submitWorkstation"] = self.jobIndex.getValue(
+            jobCode, "information", "submitWorkstation"
+        )
+        cData["projectName"] = self.jobIndex.getValue(jobCode, "information", "projectName")
+
+        copiedNum = 0
+        errors = 0
+        targetPath = "None"
+        collected = {}
+        transfer = FileTransfer(threads=self.transferThreads)
         slaveSyncPath = os.path.join(self.slPath, "Slaves")
         for i in os.listdir(slaveSyncPath):
             slaveName = i[len("S_") :]
@@ -2200,35 +3941,48 @@ class PandoraCoordinator:
             if os.path.exists(jobOutput):
                 for k in os.walk(jobOutput):
                     for m in k[2]:
+                        # unfinished upload of a slave
+                        if isTransferTemp(m):
+                            continue
+
                         filePath = os.path.join(k[0], m)
                         relFilePath = filePath.replace(jobOutput, "")
                         while relFilePath.startswith("\\") or relFilePath.startswith("/"):
                             relFilePath = relFilePath[1:]
                         targetPath = os.path.join(targetBase, relFilePath)
 
+                        fileStat = os.stat(filePath)
+                        fileInfo = [relFilePath, fileStat.st_size, fileStat.st_mtime, slaveName]
+                        if self.outputIndex.isCollected(jobCode, *fileInfo[:3]):
+                            continue
+
                         copyFile = True
 
                         if os.path.exists(targetPath):
-                            curFileDate = int(os.path.getmtime(os.path.abspath(filePath)))
+                            curFileDate = int(fileStat.st_mtime)
                             targetFileDate = int(os.path.getmtime(targetPath))
 
                             if curFileDate <= targetFileDate:
                                 copyFile = False
 
                         if copyFile:
-                            folderExists = True
-                            if not os.path.exists(os.path.dirname(targetPath)):
-                                try:
-                                    os.makedirs(os.path.dirname(targetPath))
-                                except:
-                                    errors += 1
-                                    folderExists = False
-                            if folderExists:
-                                try:
-                                    shutil.copy2(filePath, targetPath)
-                                    copiedNum += 1
-                                except:
-                                    errors += 1
+                            transfer.add(filePath, targetPath)
+
+                        collected[filePath] = fileInfo
+
+        errors += transfer.run()
+        copiedNum += transfer.copiedFiles
+
+        failedFiles = set(x[0] for x in transfer.errors)
+        for filePath in collected:
+            if filePath not in failedFiles:
+                self.outputIndex.setCollected(jobCode, *collected[filePath])
+
+        self.outputIndex.save()
+        if transfer.copiedFiles > 0 or errors > 0:
+            self.writeLog(
+                "Collected output of job %s - %s" % (jobCode, transfer.getStats()), 1
+            )
 
         if "jobtasks" in jconfig["jobtasks"]:
             for k in jconfig["jobtasks"]:
@@ -2259,6 +4013,7 @@ class PandoraCoordinator:
     @err_decorator
     def notifyWorkstations(self):
         self.writeLog("Notify workstations")
+        self.logWriter.flush()
 
         logDir = os.path.join(self.slPath, "Workstations", "Logs")
 
@@ -2271,12 +4026,15 @@ class PandoraCoordinator:
                 )
                 return
 
+        self.logShipStats = {"append": 0, "copy": 0, "bytes": 0, "lag": 0}
         validLogs = []
-        validLogs += self.copyLogs(
-            [self.coordLog, self.coordConf, self.actSlvPath, self.coordWarningsConf],
-            os.path.join(logDir, "Coordinator"),
-        )
+        coordFiles = [self.coordLog, self.coordConf, self.actSlvPath, self.coordWarningsConf]
+        if os.path.exists(getLogIndexPath(self.coordLog)):
+            coordFiles += [getLogIndexPath(self.coordLog)] + getLogArchives(self.coordLog)
 
+        validLogs += self.copyLogs(coordFiles, os.path.join(logDir, "Coordinator"))
+
+        self.jobIndex.exportJobs()
         filesToCopy = []
         for jobDir in self.jobDirs:
             jobConf = os.path.join(self.jobPath, jobDir, "PandoraJob.json")
@@ -2298,6 +4056,11 @@ class PandoraCoordinator:
                     os.path.dirname(slaveLog), "slaveWarnings_%s.json" % slaveName
                 )
                 filesToCopy += [slaveLog, slaveSettings, slaveWarnings]
+                slaveHeartbeat = self.slaveRegistry.getHeartbeatPath(slaveName)
+                if os.path.exists(slaveHeartbeat):
+                    filesToCopy.append(slaveHeartbeat)
+                if os.path.exists(getLogIndexPath(slaveLog)):
+                    filesToCopy += [getLogIndexPath(slaveLog)] + getLogArchives(slaveLog)
 
         validLogs += self.copyLogs(filesToCopy, os.path.join(logDir, "Slaves"))
         for log in validLogs:
@@ -2305,6 +4068,13 @@ class PandoraCoordinator:
 
         self.setConfig(configPath=self.logCache, confData=validLogs)
 
+        stats = self.logShipStats
+        if stats["append"] > 0 or stats["copy"] > 0:
+            self.writeLog(
+                "Shipped logs - %s appended, %s copied, %.1f KB, max lag %.1f s"
+                % (stats["append"], stats["copy"], stats["bytes"] / 1024.0, stats["lag"])
+            )
+
     @err_decorator
     def notifySlaves(self):
         if self.localMode:
@@ -2352,7 +4122,9 @@ class PandoraCoordinator:
             origTime = int(os.path.getmtime(i))
 
             if os.path.basename(i) == "PandoraJob.json":
-                jobName = self.getConfig("information", "jobName", configPath=i)
+                jobName = self.jobIndex.getValue(
+                    os.path.basename(os.path.dirname(i)), "information", "jobName"
+                )
 
                 if jobName is not None:
                     origjobName = jobName
@@ -2377,7 +4149,20 @@ class PandoraCoordinator:
                 or int(os.path.getmtime(targetPath)) != origTime
             ):
                 try:
-                    shutil.copy2(i, targetPath)
+                    # logs only grow, so only the new part needs to be shipped
+                    if os.path.splitext(i)[1] == ".txt":
+                        shipMode, shipBytes = shipLog(i, targetPath)
+                    else:
+                        shutil.copy2(i, targetPath)
+                        shipMode, shipBytes = "copy", os.path.getsize(targetPath)
+
+                    # time between the change of the file and the update of the mirror
+                    shipLag = max(0, time.time() - os.path.getmtime(i))
+                    validLogs[-1]["lag"] = shipLag
+                    if shipMode is not None:
+                        self.logShipStats[shipMode] += 1
+                        self.logShipStats["bytes"] += shipBytes
+                        self.logShipStats["lag"] = max(self.logShipStats["lag"], shipLag)
                 except Exception as e:
                     exc_type, exc_obj, exc_tb = sys.exc_info()
                     self.writeLog(
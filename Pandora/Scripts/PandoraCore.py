@@ -32,7 +32,8 @@
 
 
 import sys, os, shutil, time, socket, traceback, imp, platform, json, random, string, errno, stat, datetime
-import logging
+import logging, hashlib, threading, gzip, io, atexit, ast
+from collections import OrderedDict
 from functools import wraps
 import subprocess
 
@@ -100,12 +101,685 @@ logging.basicConfig()
 # logging.root.setLevel("DEBUG")
 
 
+# version of the command format, which is written by formatCmd. Commands of newer versions
+# are rejected by parseCmds.
+cmdVersion = 1
+strTypes = (str, type(u""))
+
+
+# returns the text of a command file. Every command is a json object on its own line.
+def formatCmd(cmd):
+    return json.dumps({"version": cmdVersion, "command": cmd}, default=str) + "\n"
+
+
+# returns the sort key of a command file like "slaveIn_0012_1571234567.89.txt", so that
+# the commands are read in the order they were written
+def getCmdOrder(fileName):
+    parts = os.path.splitext(fileName)[0].split("_")
+    try:
+        return (int(parts[1]), float(parts[2]), fileName)
+    except (IndexError, ValueError):
+        return (0, 0, fileName)
+
+
+# writes the commands for one reader into a command folder. The next file number is read from
+# the folder only once and counted in memory afterwards. Queued commands are written together
+# into one file, which is renamed into place, so that the reader never sees a partial file.
+class CommandChannel(object):
+    def __init__(self, cmdDir, prefix):
+        self.cmdDir = cmdDir
+        self.prefix = prefix
+        self.nextNum = None
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def recoverNum(self):
+        nextNum = 1
+        for i in os.listdir(self.cmdDir):
+            if not i.startswith(self.prefix + "_"):
+                continue
+
+            num = getCmdOrder(i)[0]
+            if num >= nextNum:
+                nextNum = num + 1
+
+        return nextNum
+
+    def queue(self, cmd):
+        with self.lock:
+            self.pending.append(cmd)
+
+    def send(self, cmd):
+        self.queue(cmd)
+        return self.flush()
+
+    # writes all queued commands into one file and returns its path. Commands are queued from
+    # the render and watcher threads too, so the list is swapped before it is written.
+    def flush(self):
+        with self.lock:
+            if len(self.pending) == 0:
+                return None
+
+            pending = self.pending
+            self.pending = []
+
+            try:
+                if self.nextNum is None:
+                    self.nextNum = self.recoverNum()
+
+                cmdText = "".join(formatCmd(x) for x in pending)
+                cmdFile = os.path.join(
+                    self.cmdDir,
+                    "%s_%s_%s.txt" % (self.prefix, format(self.nextNum, "04"), time.time()),
+                )
+                tmpFile = os.path.join(self.cmdDir, "tmp_" + os.path.basename(cmdFile))
+
+                with open(tmpFile, "w") as cFile:
+                    cFile.write(cmdText)
+
+                os.rename(tmpFile, cmdFile)
+            except:
+                self.pending = pending + self.pending
+                raise
+
+            self.nextNum += 1
+            return cmdFile
+
+
+# parses the content of a command file and returns the list of commands. Files, which were
+# written with str(list) by older versions are still accepted. Raises ValueError for invalid
+# commands. The schemas contain the types of the required arguments of every accepted command.
+def parseCmds(cmdText, schemas):
+    cmdText = cmdText.strip()
+    commands = []
+    if cmdText.startswith("{"):
+        for line in cmdText.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            cmdData = json.loads(line)
+            if not isinstance(cmdData, dict) or "command" not in cmdData:
+                raise ValueError("invalid command line: %s" % line)
+
+            if cmdData.get("version", 0) > cmdVersion:
+                raise ValueError("unsupported command version: %s" % cmdData["version"])
+
+            commands.append(cmdData["command"])
+    else:
+        commands.append(ast.literal_eval(cmdText))
+
+    for command in commands:
+        if not isinstance(command, list) or len(command) == 0:
+            raise ValueError("command is not a list: %s" % (command,))
+
+        if command[0] not in schemas:
+            raise ValueError("unknown command: %s" % (command,))
+
+        argTypes = schemas[command[0]]
+        if len(command) - 1 < len(argTypes):
+            raise ValueError("not enough arguments: %s" % (command,))
+
+        for arg, argType in zip(command[1:], argTypes):
+            if not isinstance(arg, argType):
+                raise ValueError("invalid argument %s in command: %s" % (arg, command))
+
+    return commands
+
+
+# parses a method call like "self.restartLogic()" from the command setting of the coordinator
+# or a slave. Only literal arguments are allowed. Returns the method name, args and kwargs.
+def parseMethodCall(text):
+    node = ast.parse(text.strip(), mode="eval").body
+    if not isinstance(node, ast.Call):
+        raise ValueError("not a method call: %s" % text)
+
+    func = node.func
+    if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+        methodName = func.attr
+    elif isinstance(func, ast.Name):
+        methodName = func.id
+    else:
+        raise ValueError("not a method call: %s" % text)
+
+    if methodName.startswith("_"):
+        raise ValueError("private methods can't be called: %s" % text)
+
+    args = [ast.literal_eval(x) for x in node.args]
+    kwargs = dict((x.arg, ast.literal_eval(x.value)) for x in node.keywords)
+    return methodName, args, kwargs
+
+
+# returns the sha1 hash of a file, which is read in chunks. If targetPath is set, the file is
+# copied there in the same pass.
+def hashFile(filePath, targetPath=None, chunkSize=1024 * 1024):
+    fileHash = hashlib.sha1()
+    targetFile = open(targetPath, "wb") if targetPath is not None else None
+    try:
+        with open(filePath, "rb") as f:
+            while True:
+                chunk = f.read(chunkSize)
+                if not chunk:
+                    break
+
+                fileHash.update(chunk)
+                if targetFile is not None:
+                    targetFile.write(chunk)
+    finally:
+        if targetFile is not None:
+            targetFile.close()
+
+    return fileHash.hexdigest()
+
+
+# caches the hashes of files by path, size and modification time, so that only new or
+# modified files get read again
+class HashCache(object):
+    def __init__(self, cachePath):
+        self.cachePath = cachePath
+        self.hashes = None
+        self.dirty = False
+
+    def load(self):
+        self.hashes = {}
+        if not os.path.exists(self.cachePath):
+            return
+
+        try:
+            with open(self.cachePath, "r") as f:
+                self.hashes = json.load(f)
+        except Exception:
+            self.hashes = {}
+
+    def getHash(self, filePath):
+        if self.hashes is None:
+            self.load()
+
+        fstat = os.stat(filePath)
+        key = os.path.normcase(os.path.abspath(filePath))
+        entry = self.hashes.get(key)
+        if entry is not None and entry[0] == fstat.st_size and entry[1] == fstat.st_mtime:
+            return entry[2]
+
+        fileHash = hashFile(filePath)
+        self.hashes[key] = [fstat.st_size, fstat.st_mtime, fileHash]
+        self.dirty = True
+        return fileHash
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        tmpPath = "%s.tmp%s" % (self.cachePath, os.getpid())
+        try:
+            with open(tmpPath, "w") as f:
+                json.dump(self.hashes, f)
+
+            if os.path.exists(self.cachePath):
+                os.remove(self.cachePath)
+            os.rename(tmpPath, self.cachePath)
+            self.dirty = False
+        except Exception:
+            try:
+                os.remove(tmpPath)
+            except OSError:
+                pass
+
+
+# returns the path of the file, which lists the compressed generations of a rotated log
+def getLogIndexPath(logPath):
+    return os.path.splitext(logPath)[0] + "_index.json"
+
+
+# returns the compressed generations of a rotated log, the newest first
+def getLogArchives(logPath):
+    try:
+        with open(getLogIndexPath(logPath), "r") as f:
+            logIndex = json.load(f)
+    except Exception:
+        return []
+
+    logDir = os.path.dirname(logPath)
+    return [os.path.join(logDir, x["file"]) for x in logIndex.get("generations", [])]
+
+
+# rotates log files, when they reach a size or age. The compressed generations are listed in
+# an index file next to the log.
+class LogRotation(object):
+    def __init__(self):
+        self.maxSize = 10 * 1024 * 1024  # bytes, 0 disables the rotation by size
+        self.maxAge = 0  # seconds, 0 disables the rotation by age
+        self.generations = 5  # number of compressed logs, which are kept
+        self.segmentStarts = {}
+
+    def readIndex(self, logPath):
+        try:
+            with open(getLogIndexPath(logPath), "r") as f:
+                return json.load(f)
+        except Exception:
+            return {"liveStart": None, "generations": []}
+
+    def needsRotation(self, logPath):
+        try:
+            logSize = os.path.getsize(logPath)
+        except OSError:
+            return False
+
+        if self.maxSize > 0 and logSize >= self.maxSize:
+            return True
+
+        if self.maxAge > 0:
+            if logPath not in self.segmentStarts:
+                liveStart = self.readIndex(logPath).get("liveStart")
+                self.segmentStarts[logPath] = liveStart or time.time()
+
+            return time.time() - self.segmentStarts[logPath] >= self.maxAge
+
+        return False
+
+    # compresses the current log to "<name>_<date>.txt.gz" and starts a new one. The archives
+    # are listed in "<name>_index.json" and only the latest generations are kept.
+    def rotate(self, logPath):
+        basePath = os.path.splitext(logPath)[0]
+        stamp = time.strftime("%y%m%d_%H%M%S")
+        rotatingPath = "%s_%s.rotating" % (basePath, stamp)
+        archivePath = "%s_%s.txt.gz" % (basePath, stamp)
+        if os.path.exists(archivePath):
+            return
+
+        try:
+            os.rename(logPath, rotatingPath)
+        except OSError:
+            # the log is opened by a reader. It gets rotated with one of the next flushes.
+            return
+
+        try:
+            logSize = os.path.getsize(rotatingPath)
+            with open(rotatingPath, "rb") as srcFile:
+                with gzip.open(archivePath + ".tmp", "wb") as archiveFile:
+                    shutil.copyfileobj(srcFile, archiveFile)
+
+            os.rename(archivePath + ".tmp", archivePath)
+            os.remove(rotatingPath)
+
+            logIndex = self.readIndex(logPath)
+            logIndex["generations"].insert(
+                0,
+                {
+                    "file": os.path.basename(archivePath),
+                    "start": logIndex.get("liveStart"),
+                    "end": time.time(),
+                    "size": logSize,
+                },
+            )
+            for generation in logIndex["generations"][self.generations :]:
+                try:
+                    os.remove(os.path.join(os.path.dirname(logPath), generation["file"]))
+                except OSError:
+                    pass
+
+            logIndex["generations"] = logIndex["generations"][: self.generations]
+            logIndex["liveStart"] = self.segmentStarts[logPath] = time.time()
+
+            indexPath = getLogIndexPath(logPath)
+            with open(indexPath + ".tmp", "w") as f:
+                json.dump(logIndex, f, indent=4)
+
+            if os.path.exists(indexPath):
+                os.remove(indexPath)
+            os.rename(indexPath + ".tmp", indexPath)
+        except Exception:
+            pass
+
+
+# buffers log lines and appends them to the log files in batches from a background thread, so
+# that logging doesn't reopen the log file for every line. Lines, which can't be written to
+# their log, are written to the fallbackPath.
+class LogWriter(LogRotation):
+    def __init__(self, fallbackPath=None, flushInterval=1.0):
+        LogRotation.__init__(self)
+        self.fallbackPath = fallbackPath
+        self.flushInterval = flushInterval
+        self.lines = []
+        self.queueLock = threading.Lock()
+        self.writeLock = threading.Lock()
+        self.flushEvent = threading.Event()
+        self.closed = False
+
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, logPath, line):
+        with self.queueLock:
+            self.lines.append((logPath, line))
+
+    def run(self):
+        while not self.closed:
+            self.flushEvent.wait(self.flushInterval)
+            self.flushEvent.clear()
+            self.flush()
+
+    def flush(self):
+        with self.writeLock:
+            with self.queueLock:
+                lines = self.lines
+                self.lines = []
+
+            logFiles = OrderedDict()
+            for logPath, line in lines:
+                logFiles.setdefault(logPath, []).append(line)
+
+            for logPath in logFiles:
+                targets = [logPath]
+                if self.fallbackPath is not None and self.fallbackPath != logPath:
+                    targets.append(self.fallbackPath)
+
+                for target in targets:
+                    if self.writeLines(target, logFiles[logPath]):
+                        break
+
+    # appends the lines to a log and returns False, if the log couldn't be written
+    def writeLines(self, logPath, lines):
+        try:
+            if not os.path.exists(os.path.dirname(logPath)):
+                os.makedirs(os.path.dirname(logPath))
+
+            if self.needsRotation(logPath):
+                self.rotate(logPath)
+
+            with io.open(logPath, "a", encoding="utf-16") as log:
+                log.write("".join(lines))
+        except Exception:
+            return False
+
+        return True
+
+    def close(self):
+        self.closed = True
+        self.flushEvent.set()
+        self.thread.join()
+        self.flush()
+
+
+# keeps the warnings in memory. Repeated warnings are merged into one entry with an occurrence
+# count and the file is rewritten only when the store was flushed after a change.
+class WarningStore(object):
+    def __init__(self, maxWarnings=500):
+        self.maxWarnings = maxWarnings
+        self.warnings = OrderedDict()
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    def load(self, warningConfig):
+        if not isinstance(warningConfig, dict) or "warnings" not in warningConfig:
+            return
+
+        warnings = [
+            x
+            for x in warningConfig["warnings"].values()
+            if type(x) == list and len(x) >= 3
+        ]
+        with self.lock:
+            for warning in sorted(warnings, key=lambda x: x[1]):
+                count = warning[3] if len(warning) > 3 else 1
+                self.warnings.pop(warning[0], None)
+                self.warnings[warning[0]] = [warning[0], warning[1], warning[2], count]
+
+            while len(self.warnings) > self.maxWarnings:
+                self.warnings.popitem(last=False)
+
+    def add(self, text, level):
+        with self.lock:
+            warning = self.warnings.pop(text, None)
+            if warning is None:
+                warning = [text, time.time(), level, 1]
+            else:
+                warning[1] = time.time()
+                warning[2] = level
+                warning[3] += 1
+
+            self.warnings[text] = warning
+            if len(self.warnings) > self.maxWarnings:
+                self.warnings.popitem(last=False)
+
+            self.dirty = True
+
+    # recurring warnings are merged and get a new time, so they are deleted by their text
+    def delete(self, text, warnTime):
+        with self.lock:
+            if text in self.warnings:
+                del self.warnings[text]
+                self.dirty = True
+                return True
+
+        return False
+
+    def clear(self):
+        with self.lock:
+            self.warnings.clear()
+            self.dirty = True
+
+    # returns the warnings in the format, which is read by the RenderHandler. The newest warning
+    # is "warning0".
+    def getConfig(self):
+        with self.lock:
+            warningConfig = {"warnings": {}}
+            for idx, val in enumerate(reversed(list(self.warnings.values()))):
+                warningConfig["warnings"]["warning%s" % idx] = list(val)
+
+            self.dirty = False
+            return warningConfig
+
+
+# mirrors a growing log file by appending only the new bytes to the target. The target gets
+# copied completely, if the source was truncated or replaced by a new file. Returns "append",
+# "copy" or None and the number of bytes, which were written.
+def shipLog(srcPath, targetPath, checkSize=256, chunkSize=1024 * 1024):
+    srcSize = os.path.getsize(srcPath)
+    try:
+        targetSize = os.path.getsize(targetPath)
+    except OSError:
+        targetSize = 0
+
+    isAppended = False
+    if 0 < targetSize <= srcSize:
+        with open(srcPath, "rb") as srcFile:
+            with open(targetPath, "rb") as targetFile:
+                headSize = min(checkSize, targetSize)
+                isAppended = srcFile.read(headSize) == targetFile.read(headSize)
+
+                tailStart = max(0, targetSize - checkSize)
+                srcFile.seek(tailStart)
+                targetFile.seek(tailStart)
+                tailSize = targetSize - tailStart
+                isAppended = isAppended and srcFile.read(tailSize) == targetFile.read(tailSize)
+
+    if not isAppended:
+        shutil.copy2(srcPath, targetPath)
+        return "copy", srcSize
+
+    shippedBytes = 0
+    if srcSize > targetSize:
+        with open(srcPath, "rb") as srcFile:
+            with open(targetPath, "ab") as targetFile:
+                srcFile.seek(targetSize)
+                while shippedBytes < srcSize - targetSize:
+                    chunk = srcFile.read(min(chunkSize, srcSize - targetSize - shippedBytes))
+                    if not chunk:
+                        break
+
+                    targetFile.write(chunk)
+                    shippedBytes += len(chunk)
+
+    shutil.copystat(srcPath, targetPath)
+    return ("append" if shippedBytes > 0 else None), shippedBytes
+
+
+# returns if the file is an unfinished file of a FileTransfer. These files aren't output and
+# must not be counted or collected.
+def isTransferTemp(path):
+    return os.path.basename(path).endswith(".part")
+
+
+# copies files with a bounded number of threads. Every file is written to a ".part" file next
+# to the target and renamed, when it is complete. The size and modification time of the source
+# are stored next to the part file, so that an interrupted copy is only resumed, if the source
+# didn't change since then. Failed copies are retried with a growing delay.
+class FileTransfer(object):
+    def __init__(self, threads=4, retries=3, retryDelay=1.0, chunkSize=4 * 1024 * 1024):
+        self.threads = threads
+        self.retries = retries
+        self.retryDelay = retryDelay
+        self.chunkSize = chunkSize
+        self.pending = []
+        self.lock = threading.Lock()
+        self.resetStats()
+
+    def resetStats(self):
+        self.copiedFiles = 0
+        self.copiedBytes = 0
+        self.resumedBytes = 0
+        self.errors = []
+        self.duration = 0.0
+
+    def add(self, srcPath, targetPath):
+        self.pending.append((srcPath, targetPath))
+
+    def replaceFile(self, srcPath, targetPath):
+        if hasattr(os, "replace"):
+            os.replace(srcPath, targetPath)
+        else:
+            if os.path.exists(targetPath):
+                os.remove(targetPath)
+            os.rename(srcPath, targetPath)
+
+    # returns the [size, modification time] of the source, which a part file was copied from
+    def readSourceKey(self, sourcePath):
+        try:
+            with open(sourcePath, "r") as sourceFile:
+                return json.load(sourceFile)
+        except Exception:
+            return None
+
+    # copies one file and returns the number of bytes, which were written
+    def copyFile(self, srcPath, targetPath):
+        if not os.path.exists(os.path.dirname(targetPath)):
+            try:
+                os.makedirs(os.path.dirname(targetPath))
+            except OSError:
+                if not os.path.exists(os.path.dirname(targetPath)):
+                    raise
+
+        partPath = targetPath + ".part"
+        # ends with ".part" too, so that isTransferTemp skips it like the part file
+        sourcePath = targetPath + ".source.part"
+        srcStat = os.stat(srcPath)
+        srcSize = srcStat.st_size
+        srcKey = [srcStat.st_size, srcStat.st_mtime]
+        offset = 0
+        if os.path.exists(partPath) and self.readSourceKey(sourcePath) == srcKey:
+            partSize = os.path.getsize(partPath)
+            if partSize <= srcSize:
+                offset = partSize
+
+        if offset == 0:
+            with open(sourcePath, "w") as sourceFile:
+                json.dump(srcKey, sourceFile)
+
+        with open(srcPath, "rb") as srcFile:
+            with open(partPath, "ab" if offset > 0 else "wb") as partFile:
+                srcFile.seek(offset)
+                while True:
+                    chunk = srcFile.read(self.chunkSize)
+                    if not chunk:
+                        break
+
+                    partFile.write(chunk)
+
+        shutil.copystat(srcPath, partPath)
+        self.replaceFile(partPath, targetPath)
+        try:
+            os.remove(sourcePath)
+        except OSError:
+            pass
+
+        with self.lock:
+            self.copiedFiles += 1
+            self.copiedBytes += srcSize - offset
+            self.resumedBytes += offset
+
+        return srcSize - offset
+
+    def copyWithRetries(self, srcPath, targetPath):
+        for attempt in range(self.retries + 1):
+            try:
+                self.copyFile(srcPath, targetPath)
+                return True
+            except Exception as e:
+                if attempt == self.retries or not os.path.exists(srcPath):
+                    with self.lock:
+                        self.errors.append([srcPath, targetPath, str(e)])
+                    return False
+
+                time.sleep(self.retryDelay * (2 ** attempt))
+
+    # copies all added files and returns the number of files, which couldn't be copied
+    def run(self):
+        files = self.pending
+        self.pending = []
+        if len(files) == 0:
+            return 0
+
+        startTime = time.time()
+        errorNum = len(self.errors)
+        nextFile = [0]
+
+        def worker():
+            while True:
+                with self.lock:
+                    if nextFile[0] >= len(files):
+                        return
+
+                    srcPath, targetPath = files[nextFile[0]]
+                    nextFile[0] += 1
+
+                self.copyWithRetries(srcPath, targetPath)
+
+        workers = [
+            threading.Thread(target=worker) for x in range(min(self.threads, len(files)))
+        ]
+        for thread in workers:
+            thread.daemon = True
+            thread.start()
+
+        for thread in workers:
+            thread.join()
+
+        self.duration += time.time() - startTime
+        return len(self.errors) - errorNum
+
+    def getStats(self):
+        mBytes = self.copiedBytes / 1024.0 / 1024.0
+        return "%s files, %.1f MB in %.1f s (%.1f MB/s), %.1f MB resumed, %s errors" % (
+            self.copiedFiles,
+            mBytes,
+            self.duration,
+            mBytes / max(self.duration, 0.001),
+            self.resumedBytes / 1024.0 / 1024.0,
+            len(self.errors),
+        )
+
+
 # Pandora core class, which holds various functions
 class PandoraCore:
     def __init__(self, app="Standalone"):
         try:
             # set some general variables
             self.version = "v1.1.0.11"
+            self.configBackups = {}  # configs, which couldn't be replaced atomically
+            self.fsyncConfigs = False  # flush config writes to disk before replacing
             self.pandoraRoot = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 
             self.pluginPathApp = os.path.join(self.pandoraRoot, "Plugins", "Apps")
@@ -133,6 +807,10 @@ class PandoraCore:
             if not os.path.exists(self.configPath):
                 self.createUserPrefs()
 
+            self.assetHashes = HashCache(
+                os.path.join(os.path.dirname(self.configPath), "AssetHashes.json")
+            )
+
             self.updatePlugins(app)
 
             if sys.argv[-1] == "setupStartMenu":
@@ -713,8 +1391,13 @@ class PandoraCore:
             cmdDir, "slaveIn_%s_%s.txt" % (format(curNum, "04"), time.time())
         )
 
-        with open(cmdFile, "w") as cFile:
-            cFile.write(str(cmd))
+        tmpFile = os.path.join(cmdDir, "tmp_" + os.path.basename(cmdFile))
+
+        cmdText = formatCmd(cmd)
+
+        with open(tmpFile, "w") as cFile:
+            cFile.write(cmdText)
+        os.rename(tmpFile, cmdFile)
 
     @err_decorator
     def startCoordinator(self, restart=False):
@@ -857,21 +1540,13 @@ class PandoraCore:
         if not os.path.exists(os.path.dirname(configPath)):
             return
 
-        if len(
-            [
-                x
-                for x in os.listdir(os.path.dirname(configPath))
-                if x.startswith(os.path.basename(configPath) + ".bak")
-            ]
-        ):
+        if configPath in self.configBackups:
             self.restoreConfig(configPath)
 
         userConfig = {}
 
         try:
-            if os.path.exists(configPath):
-                with open(configPath, "r") as f:
-                    userConfig = json.load(f)
+            userConfig = self.readConfigFile(configPath)
         except:
             if silent:
                 return "Error"
@@ -980,18 +1655,13 @@ class PandoraCore:
                     QMessageBox.warning(self.messageParent, "Pandora", errStr)
                     return
 
-        fcontent = os.listdir(os.path.dirname(configPath))
-        if len(
-            [x for x in fcontent if x.startswith(os.path.basename(configPath) + ".bak")]
-        ):
+        if configPath in self.configBackups:
             self.restoreConfig(configPath)
 
         if confData is None:
             userConfig = {}
             try:
-                if os.path.exists(configPath):
-                    with open(configPath, "r") as f:
-                        userConfig = json.load(f)
+                userConfig = self.readConfigFile(configPath)
             except:
                 if silent:
                     return "Error - Cannot read the following file:\n\n%s" % configPath
@@ -1039,41 +1709,72 @@ class PandoraCore:
             userConfig = confData
 
         try:
-            with open(configPath, "w") as confFile:
-                try:
-                    json.dump(userConfig, confFile, indent=4)
-                except UnicodeEncodeError:
-                    errStr = (
-                        "Cannot save config because it contains illegal characters:\n\n%s"
-                        % userConfig
-                    )
-                    if silent:
-                        return "Error - " + errStr
-                    else:
-                        QMessageBox.warning(
-                            self.messageParent, "Pandora", errStr, QMessageBox.Ok
-                        )
+            self.writeConfigFile(configPath, userConfig)
+        except UnicodeEncodeError:
+            errStr = (
+                "Cannot save config because it contains illegal characters:\n\n%s"
+                % userConfig
+            )
+            if silent:
+                return "Error - " + errStr
+            else:
+                QMessageBox.warning(self.messageParent, "Pandora", errStr, QMessageBox.Ok)
+        except (IOError, OSError) as e:
+            return "Error - " + str(e)
+
+    # reads a json config. If the file can't be parsed, the latest backup gets restored
+    def readConfigFile(self, configPath):
+        if not os.path.exists(configPath):
+            return {}
+
+        try:
+            with open(configPath, "r") as f:
+                return json.load(f)
+        except Exception:
+            if not self.restoreConfig(configPath):
+                raise
 
+        with open(configPath, "r") as f:
+            return json.load(f)
+
+    # writes a json config to a temp file and replaces the original file with it, so that
+    # readers never see a partially written config
+    def writeConfigFile(self, configPath, userConfig):
+        tmpPath = "%s.tmp%s" % (configPath, os.getpid())
+        try:
+            with open(tmpPath, "w") as confFile:
+                json.dump(userConfig, confFile, indent=4)
+                if self.fsyncConfigs:
+                    confFile.flush()
+                    os.fsync(confFile.fileno())
+        except Exception:
             try:
-                with open(configPath, "r") as f:
-                    testConfig = json.load(f)
-                for i in userConfig:
-                    for k in userConfig[i]:
-                        if k not in testConfig[i]:
-                            raise RuntimeError
-            except:
-                backupPath = configPath + ".bak" + str(random.randint(1000000, 9999999))
-                with open(backupPath, "w") as confFile:
-                    json.dump(userConfig, confFile, indent=4)
-        except IOError as e:
-            return "Error - " + str(e)
+                os.remove(tmpPath)
+            except Exception:
+                pass
+            raise
+
+        try:
+            if pVersion == 3:
+                os.replace(tmpPath, configPath)
+            else:
+                if os.path.exists(configPath):
+                    os.remove(configPath)
+                os.rename(tmpPath, configPath)
+        except Exception:
+            # the config is probably locked by another process or a sync client. The new
+            # content is kept as a backup and restored on the next access of this config
+            backupPath = configPath + ".bak" + str(random.randint(1000000, 9999999))
+            os.rename(tmpPath, backupPath)
+            self.configBackups[configPath] = backupPath
 
     @err_decorator
     def restoreConfig(self, configPath):
+        self.configBackups.pop(configPath, None)
         path = os.path.dirname(configPath)
         backups = []
         for i in os.listdir(path):
-            if not i.startswith(os.path.basename(configPath) + "."):
+            if not i.startswith(os.path.basename(configPath) + ".bak"):
                 continue
 
             try:
@@ -1303,6 +2004,7 @@ class PandoraCore:
         jobData["framesPerTask"] = 5
         jobData["suspended"] = False
         jobData["submitDependendFiles"] = False
+        jobData["frameDependencies"] = False
         jobData["uploadOutput"] = True
         jobData["timeout"] = 180
         jobData["concurrentTasks"] = 1
@@ -1382,6 +2084,27 @@ class PandoraCore:
 
         return slaveData
 
+    def getFileTransfer(self, threads=4):
+        return FileTransfer(threads=threads)
+
+    def getHashCache(self, cachePath):
+        return HashCache(cachePath)
+
+    def shipLog(self, srcPath, targetPath):
+        return shipLog(srcPath, targetPath)
+
+    def getLogArchives(self, logPath):
+        return getLogArchives(logPath)
+
+    # returns the manifest entry of a project asset: [name, modification time, hash, size]
+    def getAssetEntry(self, filePath):
+        return [
+            os.path.basename(filePath),
+            os.path.getmtime(filePath),
+            self.assetHashes.getHash(filePath),
+            os.path.getsize(filePath),
+        ]
+
     @err_decorator
     def submitJob(self, jobData={}):
         osFolder = self.getSubmissionPath()
@@ -1469,7 +2192,20 @@ class PandoraCore:
                             continue
 
                         tPath = os.path.join(assetPath, os.path.basename(i))
+                        if submitData["useProjectAssets"]:
+                            assetEntry = self.getAssetEntry(i)
+                        else:
+                            assetEntry = [os.path.basename(i), os.path.getmtime(i)]
+
                         if os.path.exists(tPath):
+                            # assets with the same content are reused, even if they were touched
+                            if (
+                                submitData["useProjectAssets"]
+                                and self.assetHashes.getHash(tPath) == assetEntry[2]
+                            ):
+                                jobFiles.append(assetEntry)
+                                continue
+
                             if tFilesState != "Overwrite":
                                 if tFilesState == "Skip":
                                     continue
@@ -1484,15 +2220,13 @@ class PandoraCore:
                                     ):
                                         tFiles.append(i)
                                     if os.path.basename(i) not in jobFiles:
-                                        jobFiles.append(
-                                            [os.path.basename(i), os.path.getmtime(i)]
-                                        )
+                                        jobFiles.append(assetEntry)
                                     continue
 
                         try:
                             shutil.copy2(i, assetPath)
                             if os.path.basename(i) not in jobFiles:
-                                jobFiles.append([os.path.basename(i), os.path.getmtime(i)])
+                                jobFiles.append(assetEntry)
                         except:
                             erFiles.append(i)
 
@@ -1562,6 +2296,8 @@ class PandoraCore:
                 else:
                     break
 
+            self.assetHashes.save()
+
         while True:
             try:
                 copyScene = getattr(self.appPlugin, "copyScene", lambda x, y, z: False)(
@@ -1633,7 +2369,12 @@ class PandoraCore:
             cData.append(["jobglobals", "height", submitData["resolutionHeight"]])
 
         if "jobDependecies" in submitData:
-            cData.append(["jobglobals", "jobDependecies", submitData["jobDependecies"]])
+            jobDeps = submitData["jobDependecies"]
+            # the tasks of this job wait only for the overlapping frames of the dependent jobs
+            if "frameDependencies" in submitData and submitData["frameDependencies"]:
+                jobDeps = [list(x[:2]) + ["frames"] for x in jobDeps if len(x) >= 2]
+
+            cData.append(["jobglobals", "jobDependecies", jobDeps])
 
         curFrame = submitData["startFrame"]
         tasksNum = 0
@@ -32,6 +32,7 @@
 
 
 import sys, os, io, subprocess, time, shutil, traceback, socket, threading, logging
+import gzip
 from functools import wraps
 
 pandoraRoot = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
@@ -93,6 +94,9 @@ else:
 
 import qdarkstyle
 
+# the command format is shared with the coordinator and the slaves
+from PandoraCore import formatCmd
+
 
 logger = logging.getLogger(__name__)
 
@@ -163,6 +167,7 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
             )
 
             self.logDir = self.localLogDir
+            self.logArchiveCache = {}  # decompressed log generations per log
 
             self.writeSettings = True
 
@@ -933,6 +938,10 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
                             slaveLogPath.replace("slaveLog_", "slaveWarnings_")[:-3]
                             + "json"
                         )
+                        slaveHeartbeatPath = (
+                            slaveLogPath.replace("slaveLog_", "slaveHeartbeat_")[:-3]
+                            + "json"
+                        )
                         self.tw_slaves.insertRow(rc)
                         self.tw_slaves.setItem(rc, 0, QTableWidgetItem(slaveName))
 
@@ -953,6 +962,16 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
                                 configPath=slaveSettingsPath, data=scData
                             )
 
+                            # slaves write their infos to the heartbeat file
+                            if os.path.exists(slaveHeartbeatPath):
+                                heartbeat = self.getConfig(
+                                    configPath=slaveHeartbeatPath, getConf=True, silent=True
+                                )
+                                if isinstance(heartbeat, dict):
+                                    scData["status"] = heartbeat.get("state")
+                                    for key in ["curtasks", "cpucount", "ram", "slaveScriptVersion"]:
+                                        scData[key] = heartbeat.get(key)
+
                             if scData["status"] is not None:
                                 slaveStatus = scData["status"]
                                 rowColorStyle = slaveStatus
@@ -1075,6 +1094,8 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
 
             for task in tasks:
                 curTasksStr += "%s (%s)" % (task["jobname"], task["taskname"])
+                if task.get("progress"):
+                    curTasksStr += " %s%%" % int(task["progress"] * 100)
         else:
             curTasksStr = ""
 
@@ -1803,36 +1824,50 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
                 )
                 return
 
-        curNum = 1
+        # the folder is only searched for the highest command number once per folder
+        if not hasattr(self, "cmdNums"):
+            self.cmdNums = {}
 
-        for i in os.listdir(cmdDir):
-            if not i.startswith("handlerOut_"):
-                continue
+        if cmdDir not in self.cmdNums:
+            curNum = 1
 
-            num = i.split("_")[1]
-            if pVersion == 2:
-                if not unicode(num).isnumeric():
-                    continue
-            else:
-                if not num.isnumeric():
+            for i in os.listdir(cmdDir):
+                if not i.startswith("handlerOut_"):
                     continue
 
-            if int(num) >= curNum:
-                curNum = int(num) + 1
+                num = i.split("_")[1]
+                if pVersion == 2:
+                    if not unicode(num).isnumeric():
+                        continue
+                else:
+                    if not num.isnumeric():
+                        continue
+
+                if int(num) >= curNum:
+                    curNum = int(num) + 1
+
+            self.cmdNums[cmdDir] = curNum
 
         cmdFile = os.path.join(
-            cmdDir, "handlerOut_%s_%s.txt" % (format(curNum, "04"), time.time())
+            cmdDir,
+            "handlerOut_%s_%s.txt" % (format(self.cmdNums[cmdDir], "04"), time.time()),
         )
+        tmpFile = os.path.join(cmdDir, "tmp_" + os.path.basename(cmdFile))
+
+        cmdText = formatCmd(cmd)
 
         try:
-            with open(cmdFile, "w") as cFile:
-                cFile.write(str(cmd))
+            with open(tmpFile, "w") as cFile:
+                cFile.write(cmdText)
+            os.rename(tmpFile, cmdFile)
         except Exception as e:
-            if e.errno == 13:
+            if getattr(e, "errno", None) == 13:
                 self.core.popup("Permission denied to write to file:\n\n%s" % cmdFile)
             else:
                 raise
 
+        self.cmdNums[cmdDir] += 1
+
     @err_decorator
     def updateLogCache(self):
         if hasattr(self, "updateLogThread") and self.updateLogThread.is_alive():
@@ -1869,11 +1904,18 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
 
         for remoteLog in remoteLogs:
             localLog = remoteLog.replace(self.remoteLogDir, self.logDir)
+            if remoteLog.endswith(".gz"):
+                # log archives are only copied, when they are viewed
+                continue
+
             try:
                 if not os.path.exists(os.path.dirname(localLog)):
                     os.makedirs(os.path.dirname(localLog))
 
-                shutil.copy2(remoteLog, localLog)
+                if os.path.splitext(remoteLog)[1] == ".txt":
+                    self.core.shipLog(remoteLog, localLog)
+                else:
+                    shutil.copy2(remoteLog, localLog)
                 #print("copy log %s" % localLog)
             except Exception:
                 logger.warning("failed to copy log %s to %s" % (remoteLog, localLog))
@@ -2020,6 +2062,7 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
                 try:
                     lvl = self.sp_slaveFilter.value()
                     logLines = self.getConfig(configPath=logPath, readlines=True)
+                    logLines = self.loadLogArchives(logPath, logLines)
 
                     if self.sp_logLimit.value() == 0 or self.sp_logLimit.value() > len(
                         logLines
@@ -2061,6 +2104,7 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
 
         if os.path.exists(logPath):
             logLines = self.getConfig(configPath=logPath, readlines=True) or []
+            logLines = self.loadLogArchives(logPath, logLines)
 
             lvl = self.sp_coordFilter.value()
             if self.sp_logLimit.value() == 0 or self.sp_logLimit.value() > len(logLines):
@@ -2094,6 +2138,42 @@ class RenderHandler(QMainWindow, RenderHandler_ui.Ui_mw_RenderHandler):
 
         self.te_coordLog.verticalScrollBar().setValue(sliderPos)
 
+    # prepends lines of the compressed log generations, when the log limit is higher than the
+    # number of lines in the current log. A limit of 0 shows the current log only.
+    @err_decorator
+    def loadLogArchives(self, logPath, logLines):
+        limit = self.sp_logLimit.value()
+        if limit == 0 or limit <= len(logLines):
+            return logLines
+
+        # only the current generations of the log stay cached
+        cachedArchives = self.logArchiveCache.get(logPath, {})
+        usedArchives = {}
+        for archivePath in self.core.getLogArchives(logPath):
+            if not os.path.exists(archivePath) and self.logDir == self.localLogDir:
+                remotePath = archivePath.replace(self.localLogDir, self.remoteLogDir)
+                try:
+                    shutil.copy2(remotePath, archivePath)
+                except Exception:
+                    logger.warning("failed to copy log %s to %s" % (remotePath, archivePath))
+                    break
+
+            archiveMtime = int(os.path.getmtime(archivePath))
+            archive = cachedArchives.get(archivePath)
+            if archive is None or archive[0] != archiveMtime:
+                with gzip.open(archivePath, "rb") as archiveFile:
+                    archiveData = archiveFile.read().decode("utf-16")
+
+                archive = (archiveMtime, archiveData.splitlines(True))
+
+            usedArchives[archivePath] = archive
+            logLines = archive[1] + logLines
+            if len(logLines) >= limit:
+                break
+
+        self.logArchiveCache[logPath] = usedArchives
+        return logLines
+
     @err_decorator
     def getCoordLogPath(self):
         logDir = os.path.join(self.logDir, "Coordinator")
@@ -32,6 +32,7 @@
 
 
 import sys, os, shutil, time, io, multiprocessing, threading, socket, subprocess, traceback
+import json, re, hashlib
 from functools import wraps
 
 pandoraRoot = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
@@ -67,6 +68,553 @@ import qdarkstyle
 import psutil
 from PIL import ImageGrab
 
+# the log and warning helpers and the command format are shared with the coordinator
+from PandoraCore import LogWriter, WarningStore, isTransferTemp
+from PandoraCore import strTypes, getCmdOrder, CommandChannel, parseCmds
+from PandoraCore import parseMethodCall
+
+
+# types of the required arguments of every command, which the slave accepts.
+# Additional arguments are allowed.
+cmdSchemas = {
+    "clearLog": [],
+    "setSetting": [strTypes, object],
+    "renderTask": [strTypes, strTypes, strTypes],
+    "cancelTask": [strTypes, object],
+    "deleteWarning": [strTypes, object],
+    "clearWarnings": [],
+    "deleteJob": [strTypes],
+    "checkConnection": [],
+    "exitSlave": [],
+}
+
+
+# keeps the job files of the slave in "Jobs/<jobcode>" with a size budget. Jobs are evicted in
+# least recently used order, but never while a task of the job is assigned or rendering.
+# Repeated tasks of a cached job don't copy the job files again. A job, which is rendering, is
+# never replaced, even if its files changed.
+class JobCache(object):
+    def __init__(self, cachePath, maxSize=50 * 1024 ** 3, getActiveJobs=None):
+        self.cachePath = cachePath
+        self.indexPath = os.path.join(os.path.dirname(cachePath), "JobCache.json")
+        self.maxSize = maxSize  # bytes, 0 disables the eviction
+        self.getActiveJobs = getActiveJobs or set
+        self.jobs = None
+        self.lock = threading.Condition()
+        self.staging = set()  # jobs, which are copied at the moment
+        self.urgent = set()  # staging jobs, which are waited for and copied without limit
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self.evictions = 0
+
+    def getFolderSize(self, folderPath):
+        folderSize = 0
+        for root, folders, files in os.walk(folderPath):
+            for fileName in files:
+                try:
+                    folderSize += os.path.getsize(os.path.join(root, fileName))
+                except OSError:
+                    pass
+
+        return folderSize
+
+    def load(self):
+        self.jobs = {}
+        try:
+            with open(self.indexPath, "r") as f:
+                self.jobs = json.load(f)
+        except Exception:
+            self.jobs = {}
+
+        if not os.path.exists(self.cachePath):
+            return
+
+        # jobs, which were copied before the index existed, are added once
+        jobCodes = os.listdir(self.cachePath)
+        for jobCode in jobCodes:
+            jobPath = os.path.join(self.cachePath, jobCode)
+            if (
+                jobCode in self.jobs
+                or not os.path.isdir(jobPath)
+                or os.path.splitext(jobCode)[1] in [".tmp", ".old"]
+            ):
+                continue
+
+            self.jobs[jobCode] = {
+                "size": self.getFolderSize(jobPath),
+                "lastUsed": os.path.getmtime(jobPath),
+                "hits": 0,
+            }
+
+        for jobCode in list(self.jobs):
+            if jobCode not in jobCodes:
+                del self.jobs[jobCode]
+
+        self.save()
+
+    def getJobPath(self, jobCode):
+        return os.path.join(self.cachePath, jobCode)
+
+    # returns a hash of the paths, sizes and modification times of the job files, so that
+    # added, removed and replaced files are noticed without reading them
+    def getFilesKey(self, srcPath):
+        filesPath = os.path.join(srcPath, "JobFiles")
+        fileStats = []
+        for root, folders, files in os.walk(filesPath):
+            for fileName in files:
+                filePath = os.path.join(root, fileName)
+                try:
+                    fstat = os.stat(filePath)
+                except OSError:
+                    continue
+
+                relPath = os.path.relpath(filePath, filesPath).replace("\\", "/")
+                fileStats.append([relPath, fstat.st_size, int(fstat.st_mtime)])
+
+        return hashlib.sha1(json.dumps(sorted(fileStats)).encode("utf-8")).hexdigest()
+
+    # a cached job is copied again, when the job files of the assigned job changed since then
+    def isCached(self, jobCode, srcPath):
+        if self.jobs is None:
+            self.load()
+
+        entry = self.jobs.get(jobCode)
+        if entry is None or not os.path.exists(self.getJobPath(jobCode)):
+            return False
+
+        return "filesKey" not in entry or self.getFilesKey(srcPath) == entry["filesKey"]
+
+    # returns if the job has files in the cache, which can't be replaced, because a task of the
+    # job is rendering
+    def isLocked(self, jobCode):
+        return jobCode in self.jobs and jobCode in self.getActiveJobs()
+
+    # copies the job to the cache, if it isn't cached already. Returns True, when no files were
+    # copied. If the job is prefetched at the moment, the prefetch is finished without bandwidth
+    # limit.
+    def fetch(self, jobCode, srcPath, copyFunction=None, prefetch=False):
+        with self.lock:
+            while jobCode in self.staging:
+                if prefetch:
+                    return False
+
+                self.urgent.add(jobCode)
+                self.lock.wait(1)
+
+            if self.isCached(jobCode, srcPath) or self.isLocked(jobCode):
+                if not prefetch:
+                    self.jobs[jobCode]["lastUsed"] = time.time()
+                    self.jobs[jobCode]["hits"] += 1
+                    self.hits += 1
+                    self.save()
+
+                return True
+
+            self.staging.add(jobCode)
+
+        jobPath = self.getJobPath(jobCode)
+        newPath = jobPath + ".tmp"
+        oldPath = jobPath + ".old"
+        copied = False
+        try:
+            filesKey = self.getFilesKey(srcPath)
+
+            # the job is copied to a new folder first, so that an interrupted copy is never used,
+            # and swapped with the cached folder afterwards
+            for folderPath in [newPath, oldPath]:
+                if os.path.exists(folderPath):
+                    shutil.rmtree(folderPath)
+
+            (copyFunction or shutil.copytree)(srcPath, newPath)
+
+            with self.lock:
+                # a task of the job started rendering during the copy
+                if self.isLocked(jobCode):
+                    shutil.rmtree(newPath, ignore_errors=True)
+                    return True
+
+                if os.path.exists(jobPath):
+                    os.rename(jobPath, oldPath)
+
+                try:
+                    os.rename(newPath, jobPath)
+                except OSError:
+                    if os.path.exists(oldPath):
+                        os.rename(oldPath, jobPath)
+                    raise
+
+                copied = True
+
+            shutil.rmtree(oldPath, ignore_errors=True)
+        finally:
+            with self.lock:
+                self.staging.discard(jobCode)
+                self.urgent.discard(jobCode)
+                if copied:
+                    self.jobs[jobCode] = {
+                        "size": self.getFolderSize(jobPath),
+                        "lastUsed": time.time(),
+                        "hits": 0,
+                        "filesKey": filesKey,
+                    }
+                    if prefetch:
+                        self.prefetches += 1
+                    else:
+                        self.misses += 1
+
+                    self.save()
+
+                self.lock.notify_all()
+
+        return False
+
+    def updateSize(self, jobCode):
+        with self.lock:
+            if self.jobs is None or jobCode not in self.jobs:
+                return
+
+            self.jobs[jobCode]["size"] = self.getFolderSize(self.getJobPath(jobCode))
+            self.save()
+
+    def removeJob(self, jobCode):
+        with self.lock:
+            if self.jobs is None:
+                self.load()
+
+            jobPath = self.getJobPath(jobCode)
+            if os.path.exists(jobPath):
+                shutil.rmtree(jobPath)
+
+            if self.jobs.pop(jobCode, None) is not None:
+                self.save()
+
+    def getSize(self):
+        with self.lock:
+            if self.jobs is None:
+                self.load()
+
+            return sum(x["size"] for x in self.jobs.values())
+
+    # removes the least recently used jobs until the cache fits into the size budget. Returns
+    # the codes of the removed jobs.
+    def evict(self, protectedJobs):
+        if self.maxSize <= 0:
+            return []
+
+        with self.lock:
+            cacheSize = self.getSize()
+            protectedJobs = set(protectedJobs) | set(self.getActiveJobs())
+            evicted = []
+            for jobCode in sorted(self.jobs, key=lambda x: self.jobs[x]["lastUsed"]):
+                if cacheSize <= self.maxSize:
+                    break
+
+                if jobCode in protectedJobs or jobCode in self.staging:
+                    continue
+
+                try:
+                    shutil.rmtree(self.getJobPath(jobCode))
+                except Exception:
+                    if os.path.exists(self.getJobPath(jobCode)):
+                        continue
+
+                cacheSize -= self.jobs.pop(jobCode)["size"]
+                evicted.append(jobCode)
+                self.evictions += 1
+
+            if evicted:
+                self.save()
+
+        return evicted
+
+    def getStats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefetches": self.prefetches,
+            "evictions": self.evictions,
+            "size": self.getSize() // (1024 ** 2),
+        }
+
+    def save(self):
+        tmpPath = "%s.tmp%s" % (self.indexPath, os.getpid())
+        try:
+            with open(tmpPath, "w") as f:
+                json.dump(self.jobs, f)
+
+            if os.path.exists(self.indexPath):
+                os.remove(self.indexPath)
+            os.rename(tmpPath, self.indexPath)
+        except Exception:
+            try:
+                os.remove(tmpPath)
+            except OSError:
+                pass
+
+
+# copies the job files of queued jobs to the job cache in a background thread, while the slave
+# is rendering. The copy rate is limited, so that the running render isn't slowed down.
+class JobPrefetcher(object):
+    def __init__(self, jobCache, maxRate=20 * 1024 ** 2, chunkSize=1024 * 1024):
+        self.jobCache = jobCache
+        self.maxRate = maxRate  # bytes per second, 0 disables the limit
+        self.chunkSize = chunkSize
+        self.jobs = []
+        self.stagingTimes = {}
+        self.errors = []
+        self.queueLock = threading.Lock()
+        self.queueEvent = threading.Event()
+
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def add(self, jobCode, srcPath):
+        with self.queueLock:
+            if jobCode in [x[0] for x in self.jobs]:
+                return
+
+            self.jobs.append([jobCode, srcPath])
+
+        self.queueEvent.set()
+
+    def run(self):
+        while True:
+            self.queueEvent.wait()
+            self.queueEvent.clear()
+
+            while True:
+                with self.queueLock:
+                    if not self.jobs:
+                        break
+
+                    jobCode, srcPath = self.jobs.pop(0)
+
+                # the fetch returns False too, when the job is staged by a task start already.
+                # The time is only recorded, when the files were copied here.
+                startTime = time.time()
+                copied = []
+
+                def copyFunction(src, dst):
+                    self.copyTree(jobCode, src, dst)
+                    copied.append(dst)
+
+                try:
+                    self.jobCache.fetch(jobCode, srcPath, copyFunction, prefetch=True)
+                    if copied:
+                        self.stagingTimes[jobCode] = time.time() - startTime
+                except Exception as e:
+                    self.errors.append([jobCode, str(e)])
+
+    def copyTree(self, jobCode, srcPath, targetPath):
+        for root, folders, files in os.walk(srcPath):
+            targetRoot = os.path.join(targetPath, os.path.relpath(root, srcPath))
+            if not os.path.exists(targetRoot):
+                os.makedirs(targetRoot)
+
+            for fileName in files:
+                self.copyFile(
+                    jobCode, os.path.join(root, fileName), os.path.join(targetRoot, fileName)
+                )
+
+    def copyFile(self, jobCode, srcPath, targetPath):
+        startTime = time.time()
+        copiedBytes = 0
+        with open(srcPath, "rb") as srcFile:
+            with open(targetPath, "wb") as targetFile:
+                while True:
+                    chunk = srcFile.read(self.chunkSize)
+                    if not chunk:
+                        break
+
+                    targetFile.write(chunk)
+                    copiedBytes += len(chunk)
+
+                    # a job, which is needed for a task start, is copied at full speed
+                    if self.maxRate > 0 and jobCode not in self.jobCache.urgent:
+                        delay = copiedBytes / float(self.maxRate) - (time.time() - startTime)
+                        if delay > 0:
+                            time.sleep(delay)
+
+        shutil.copystat(srcPath, targetPath)
+
+    def popErrors(self):
+        errors = self.errors
+        self.errors = []
+        return errors
+
+
+# uploads the output of the rendering tasks of a job while they render. A file is uploaded, when
+# its size and modification time didn't change for settleTime seconds, so that only frames,
+# which the renderer closed already, are copied. Output of earlier tasks is ignored. The uploaded
+# files are tracked per task, because the tasks of a job render to the same folder.
+class OutputWatcher(object):
+    def __init__(
+        self,
+        basePath,
+        syncPath,
+        startTime,
+        getTransfer,
+        onUpload=None,
+        interval=5,
+        settleTime=3,
+    ):
+        self.basePath = basePath
+        self.syncPath = syncPath
+        self.startTime = startTime
+        self.getTransfer = getTransfer
+        self.onUpload = onUpload
+        self.interval = interval
+        self.settleTime = settleTime
+        self.tasks = {}  # [start frame, end frame, start time] of every rendering task
+        self.fileKeys = {}  # last seen (size, mtime) of every file
+        self.uploaded = {}  # uploaded files with their (size, mtime)
+        self.taskFiles = {}  # uploaded files of every task
+        self.manifests = {}  # uploaded files of every task, which weren't reported in a taskUpdate yet
+        self.errors = []
+        self.scanLock = threading.Lock()
+        self.taskLock = threading.Lock()
+        self.stopEvent = threading.Event()
+
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        while not self.stopEvent.wait(self.interval):
+            try:
+                self.scan()
+            except Exception as e:
+                self.errors.append([self.basePath, self.syncPath, str(e)])
+
+    def addTask(self, taskName, startFrame, endFrame, startTime):
+        with self.taskLock:
+            self.tasks[taskName] = [startFrame, endFrame, startTime]
+            self.taskFiles[taskName] = set()
+            self.manifests[taskName] = []
+
+    def removeTask(self, taskName):
+        with self.taskLock:
+            self.tasks.pop(taskName, None)
+            self.taskFiles.pop(taskName, None)
+            self.manifests.pop(taskName, None)
+
+    # returns the tasks, which wrote a file. The frame number is taken from the last digits of the
+    # filename. A file without the frame of a task belongs to every task, which started before it.
+    def getFileTasks(self, filePath, fileTime):
+        with self.taskLock:
+            tasks = dict((x, y) for x, y in self.tasks.items() if y[2] <= fileTime)
+
+        frameMatch = re.search(r"(\d+)\D*$", os.path.splitext(os.path.basename(filePath))[0])
+        if frameMatch:
+            frame = int(frameMatch.group(1))
+            frameTasks = [x for x in tasks if tasks[x][0] <= frame <= tasks[x][1]]
+            if frameTasks:
+                return frameTasks
+
+        return list(tasks)
+
+    # uploads the new files. With final=True the files don't need to be settled, because the
+    # renderer exited already. If taskName is set, this applies only to the files of that task.
+    def scan(self, final=False, taskName=None):
+        with self.scanLock:
+            transfer = self.getTransfer(threads=2)
+            queued = {}
+            now = time.time()
+            for root, folders, files in os.walk(self.basePath):
+                for fileName in files:
+                    filePath = os.path.join(root, fileName)
+                    if fileName.endswith(".lock") or os.path.exists(filePath + ".lock"):
+                        continue
+
+                    try:
+                        fstat = os.stat(filePath)
+                    except OSError:
+                        continue
+
+                    if fstat.st_mtime < self.startTime:
+                        continue
+
+                    fileKey = (fstat.st_size, fstat.st_mtime)
+                    if self.uploaded.get(filePath) == fileKey:
+                        continue
+
+                    lastKey = self.fileKeys.get(filePath)
+                    self.fileKeys[filePath] = fileKey
+                    fileTasks = self.getFileTasks(filePath, fstat.st_mtime)
+                    isSettled = lastKey == fileKey and now - fstat.st_mtime >= self.settleTime
+                    isFinished = final and (taskName is None or taskName in fileTasks)
+                    if not isSettled and not isFinished:
+                        continue
+
+                    targetPath = os.path.join(
+                        self.syncPath, os.path.relpath(filePath, self.basePath)
+                    )
+                    transfer.add(filePath, targetPath)
+                    queued[filePath] = [targetPath, fileKey, fileTasks]
+
+            transfer.run()
+            self.errors += transfer.errors
+            failedFiles = set(x[0] for x in transfer.errors)
+
+            entries = []
+            for filePath in sorted(queued):
+                if filePath in failedFiles:
+                    continue
+
+                targetPath, fileKey, fileTasks = queued[filePath]
+                self.uploaded[filePath] = fileKey
+                entry = [
+                    os.path.relpath(targetPath, self.syncPath).replace("\\", "/"),
+                    fileKey[0],
+                    fileKey[1],
+                ]
+                entries.append(entry)
+
+                with self.taskLock:
+                    for fileTask in fileTasks:
+                        if fileTask in self.manifests:
+                            self.taskFiles[fileTask].add(filePath)
+                            self.manifests[fileTask].append(entry)
+
+        if entries and self.onUpload is not None:
+            self.onUpload(entries)
+
+        return entries
+
+    # returns the number of files, which the task wrote so far
+    def getFileNum(self, taskName):
+        return len(
+            [
+                x
+                for x, y in list(self.fileKeys.items())
+                if taskName in self.getFileTasks(x, y[1])
+            ]
+        )
+
+    def getUploadNum(self, taskName):
+        with self.taskLock:
+            return len(self.taskFiles.get(taskName, []))
+
+    def popManifest(self, taskName):
+        with self.taskLock:
+            manifest = self.manifests.get(taskName, [])
+            if taskName in self.manifests:
+                self.manifests[taskName] = []
+
+            return manifest
+
+    def popErrors(self):
+        errors = self.errors
+        self.errors = []
+        return errors
+
+    def stop(self):
+        self.stopEvent.set()
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+
 
 # custom messagebox, which closes after some seconds. It is used to ask wether this PC is currently used by a person.
 class counterMessageBox(QMessageBox):
@@ -106,12 +654,116 @@ class counterMessageBox(QMessageBox):
             QMessageBox.close(self)
 
 
+# holds the parsed slaveSettings file. The file is only parsed again, when its (mtime, size)
+# key changed and during a slave cycle it is checked only once. Changed settings are
+# collected and written back with one config write. The render thread uses the snapshot too,
+# so the cycle depth and the changes are only accessed with the lock.
+class SettingsSnapshot(object):
+    def __init__(self, core, confPath):
+        self.core = core
+        self.confPath = confPath
+        self.config = None
+        self.fileKey = None
+        self.changes = []
+        self.cycleDepth = 0
+        self.validated = False
+        self.loads = 0
+        self.lock = threading.RLock()
+
+    def getFileKey(self):
+        try:
+            fstat = os.stat(self.confPath)
+        except OSError:
+            return None
+
+        return (fstat.st_mtime, fstat.st_size)
+
+    def load(self):
+        with self.lock:
+            if self.validated and self.config is not None:
+                return True
+
+            fileKey = self.getFileKey()
+            if fileKey is None:
+                self.reset()
+                return False
+
+            if fileKey != self.fileKey or self.config is None:
+                config = self.core.getConfig(configPath=self.confPath, getConf=True, silent=True)
+                if not isinstance(config, dict):
+                    return False
+
+                for change in self.changes:
+                    config.setdefault(change[0], {})[change[1]] = change[2]
+
+                self.config = config
+                self.fileKey = fileKey
+                self.loads += 1
+
+            self.validated = self.cycleDepth > 0
+            return True
+
+    def reset(self):
+        with self.lock:
+            self.config = None
+            self.fileKey = None
+            self.validated = False
+
+    def get(self, section, setting):
+        with self.lock:
+            if not self.load():
+                return "Error"
+
+            return self.config.get(section, {}).get(setting)
+
+    def set(self, section, setting, value):
+        with self.lock:
+            if (
+                self.load()
+                and setting in self.config.get(section, {})
+                and self.config[section][setting] == value
+            ):
+                return False
+
+            self.changes = [x for x in self.changes if x[:2] != [section, setting]]
+            self.changes.append([section, setting, value])
+            if self.config is not None:
+                self.config.setdefault(section, {})[setting] = value
+
+            return True
+
+    def popChanges(self):
+        with self.lock:
+            changes = self.changes
+            self.changes = []
+            if changes:
+                # the written file gets parsed again, because other processes might have changed it
+                self.reset()
+
+            return changes
+
+    def startCycle(self):
+        with self.lock:
+            if self.cycleDepth == 0:
+                self.validated = False
+
+            self.cycleDepth += 1
+
+    def endCycle(self):
+        with self.lock:
+            self.cycleDepth = max(0, self.cycleDepth - 1)
+            if self.cycleDepth == 0:
+                self.validated = False
+
+
 # main class for handling rendering
 class SlaveLogic(QDialog):
     def __init__(self, core):
         QDialog.__init__(self)
         self.core = core
         self.slaveLogicVersion = "v1.1.0.6"
+        self.logWriter = LogWriter()
+        self.warningStore = WarningStore()
 
         # define some initial variables
         self.slaveState = "idle"  # slave render status
@@ -141,6 +793,8 @@ class SlaveLogic(QDialog):
         self.interrupted = False  # holds wether the current rendering was interrupted
         self.assignedTasks = []  # stores new job assigments from the coordinator
         self.curTasks = []  # list of currently rendering tasks
+        self.outputWatchers = {}  # upload the output of the rendering jobs
+        self.heartbeatLock = threading.Lock()  # the render thread writes the heartbeat too
         self.waitingForFiles = False
         #       self.lastConnectionTime = time.time()
         #       self.connectionTimeout = 15
@@ -182,6 +836,13 @@ class SlaveLogic(QDialog):
                 return
 
         self.localSlavePath = repoDir
+        self.assetHashes = self.core.getHashCache(
+            os.path.join(self.localSlavePath, "AssetHashes.json")
+        )
+        self.jobCache = JobCache(
+            os.path.join(self.localSlavePath, "Jobs"), getActiveJobs=self.getRenderingJobCodes
+        )
+        self.jobPrefetcher = JobPrefetcher(self.jobCache)
 
         if self.localMode:
             if cData["rootPath"] is None:
@@ -213,6 +874,7 @@ class SlaveLogic(QDialog):
         self.slaveConf = os.path.join(
             self.slavePath, "slaveSettings_%s.json" % socket.gethostname()
         )  # path for the file with the RenderSlave settings
+        self.settings = SettingsSnapshot(self.core, self.slaveConf)
         self.slaveLog = os.path.join(
             self.slavePath, "slaveLog_%s.txt" % socket.gethostname()
         )  # path for the RenderSlave Log file
@@ -222,6 +884,7 @@ class SlaveLogic(QDialog):
         self.slaveComPath = os.path.join(
             self.slavePath, "Communication"
         )  # path where the in- and out-commands are stored
+        self.cmdChannel = CommandChannel(self.slaveComPath, "slaveOut")
 
         # create the communication folder if it doesn't exist already
         if not os.path.exists(self.slaveComPath):
@@ -232,10 +895,14 @@ class SlaveLogic(QDialog):
                     "could not create Communication folder for %s" % socket.gethostname(), 2
                 )
 
-        if not os.path.exists(self.slaveWarningsConf):
-            warningConfig = {"warnings": {}}
+        if os.path.exists(self.slaveWarningsConf):
+            self.warningStore.load(
+                self.core.getConfig(
+                    configPath=self.slaveWarningsConf, getConf=True, silent=True
+                )
+            )
 
-            self.setConfig(configPath=self.slaveWarningsConf, confData=warningConfig)
+        self.flushWarnings()
 
         # save the default slave settings to the settings file if they don't exist already
         self.createSettings(complement=True)
@@ -295,7 +962,7 @@ class SlaveLogic(QDialog):
                     kwargs,
                 )
                 args[0].writeLog(erStr, 3)
-                if func == args[0].checkAssignments:
+                if func.__name__ == "checkAssignmentsCycle":
                     args[0].logicTimer.start(args[0].updateTime * 1000)
 
         return func_wrapper
@@ -444,6 +1111,9 @@ class SlaveLogic(QDialog):
         if hasattr(self, "msgStart") and self.msgStart.isVisible():
             self.msgStart.close()
 
+        self.flushCommands()
+        self.flushWarnings()
+
         if restart:
             self.setState("restarting")
             self.writeLog("slave restarting", 1)
@@ -473,14 +1143,6 @@ class SlaveLogic(QDialog):
     @err_decorator
     def writeLog(self, text, level=0, writeWarning=True):
         try:
-            if not os.path.exists(self.slaveLog):
-                try:
-                    if not os.path.exists(os.path.dirname(self.slaveLog)):
-                        os.makedirs(os.path.dirname(self.slaveLog))
-                    open(self.slaveLog, "a").close()
-                except:
-                    return None
-
             if level == 0 and not self.debugMode:
                 return
 
@@ -489,71 +1151,41 @@ class SlaveLogic(QDialog):
 
             #   print text
 
-            with io.open(self.slaveLog, "a", encoding="utf-16") as log:
-                log.write(
-                    "[%s] %s : %s\n" % (level, time.strftime("%d.%m.%y %X"), text)
-                )
+            self.logWriter.write(
+                self.slaveLog,
+                "[%s] %s : %s\n" % (level, time.strftime("%d.%m.%y %X"), text),
+            )
         except:
             pass
 
-    # writes warning to a file. A higher level means more importance.
+    # adds a warning to the warning store. A higher level means more importance.
     def writeWarning(self, text, level=1):
-        if not os.path.exists(self.slaveWarningsConf):
+        self.warningStore.add(text, level)
+
+    # writes the warnings to file, if they changed since the last flush
+    @err_decorator
+    def flushWarnings(self):
+        if not self.warningStore.dirty and os.path.exists(self.slaveWarningsConf):
+            return
+
+        if not os.path.exists(os.path.dirname(self.slaveWarningsConf)):
             try:
-                if not os.path.exists(os.path.dirname(self.slaveWarningsConf)):
-                    os.makedirs(os.path.dirname(self.slaveWarningsConf))
-                confData = {}
-                result = self.setConfig(
-                    configPath=self.slaveWarningsConf, confData=confData
-                )
-                if result:
-                    self.writeLog("writeWarning %s" % result, 2, writeWarning=False)
+                os.makedirs(os.path.dirname(self.slaveWarningsConf))
             except:
                 self.writeLog("cannot create warningConfig", 2, writeWarning=False)
-                self.writeLog(text, level)
-                return None
+                return
 
-        warningConfig = self.core.getConfig(
-            configPath=self.slaveWarningsConf, getConf=True, silent=True
+        self.setConfig(
+            configPath=self.slaveWarningsConf, confData=self.warningStore.getConfig()
         )
-        warnings = []
-
-        if warningConfig == "Error":
-            self.writeLog("cannot read warningConfig", 2, writeWarning=False)
-        else:
-            if "warnings" in warningConfig:
-                for i in warningConfig["warnings"]:
-                    warnings.append(warningConfig["warnings"][i])
-
-                warnings = [x for x in warnings if x[0] != text]
-
-        warnings.insert(0, [text, time.time(), level])
-
-        warningConfig = {"warnings": {}}
-        for idx, val in enumerate(warnings):
-            warningConfig["warnings"]["warning%s" % idx] = val
-
-        result = self.setConfig(configPath=self.slaveWarningsConf, confData=warningConfig)
-        if result:
-            self.writeLog("writeWarning %s" % result, 2, writeWarning=False)
 
-    # writes slave infos to file
+    # collects the static slave infos, which are written with every heartbeat
     @err_decorator
     def setSlaveInfo(self):
-        self.getConfSetting(
-            "status", section="slaveinfo", setval=True, value=self.slaveState
-        )
-
-        self.getConfSetting("curtasks", section="slaveinfo", setval=True, value=self.getCurTasksData())
-        self.getConfSetting(
-            "cpucount", section="slaveinfo", setval=True, value=multiprocessing.cpu_count()
-        )
-        self.getConfSetting(
-            "slaveScriptVersion",
-            section="slaveinfo",
-            setval=True,
-            value=self.slaveLogicVersion,
-        )
+        self.slaveInfo = {
+            "cpucount": multiprocessing.cpu_count(),
+            "slaveScriptVersion": self.slaveLogicVersion,
+        }
 
         process = os.popen("wmic memorychip get capacity | findstr [0-9]")
         result = process.read()
@@ -564,21 +1196,22 @@ class SlaveLogic(QDialog):
         except ValueError:
             totalMem = 0
 
-        self.getConfSetting(
-            "ram", section="slaveinfo", setval=True, value=(totalMem // (1024 ** 3))
-        )
+        self.slaveInfo["ram"] = totalMem // (1024 ** 3)
+        self.writeActive()
 
     # reads a slave setting from file and returns the value
     @err_decorator
     def getConfSetting(
         self, setting, section="settings", stype="string", setval=False, value=""
     ):
-        if not os.path.exists(self.slaveConf):
+        if not self.settings.load() and not os.path.exists(self.slaveConf):
             self.writeLog("create config", 1)
             self.createSettings()
 
         if setval:
-            self.setConfig(section, setting, value, configPath=self.slaveConf)
+            self.settings.set(section, setting, value)
+            if self.settings.cycleDepth == 0:
+                self.flushSettings()
 
             if setting == "debugMode":
                 self.debugMode = value
@@ -588,9 +1221,7 @@ class SlaveLogic(QDialog):
                 if self.slaveState == "userActive":
                     self.setState("idle")
         else:
-            val = self.core.getConfig(
-                section, setting, configPath=self.slaveConf, silent=True
-            )
+            val = self.settings.get(section, setting)
             if val == "Error":
                 self.writeLog(
                     "Failed to read config setting: %s %s" % (setting, section), 2
@@ -599,6 +1230,13 @@ class SlaveLogic(QDialog):
 
             return val
 
+    # writes the changed settings of the snapshot with one config write
+    @err_decorator
+    def flushSettings(self):
+        changes = self.settings.popChanges()
+        if changes:
+            self.setConfig(data=changes, configPath=self.slaveConf)
+
     @err_decorator
     def setConfig(
         self,
@@ -654,6 +1292,7 @@ class SlaveLogic(QDialog):
     @err_decorator
     def clearLog(self):
         try:
+            self.logWriter.flush()
             open(self.slaveLog, "w").close()
             self.writeLog("SlaveLog cleared", 1)
         except:
@@ -681,37 +1320,17 @@ class SlaveLogic(QDialog):
         saveas = os.path.join(self.slavePath, filename)
         img.save(saveas)
 
-    # writes out a command to the coordinator
+    # queues a command to the coordinator. The commands are written with flushCommands.
     @err_decorator
     def communicateOut(self, cmd):
-        curNum = 1
-
-        for i in os.listdir(self.slaveComPath):
-            if not i.startswith("slaveOut_"):
-                continue
-
-            num = i.split("_")[1]
-            if sys.version[0] == "2":
-                unum = unicode(num)
-            else:
-                unum = num
-
-            if not unum.isnumeric():
-                continue
-
-            if int(num) >= curNum:
-                curNum = int(num) + 1
-
-        cmdFile = os.path.join(
-            self.slaveComPath, "slaveOut_%s_%s.txt" % (format(curNum, "04"), time.time())
-        )
-
-        open(cmdFile, "a").close()
-        with open(cmdFile, "w") as cFile:
-            cFile.write(str(cmd))
-
+        self.cmdChannel.queue(cmd)
         self.writeLog("communicate out: %s" % cmd, 0)
 
+    # writes all queued commands to the coordinator in one file
+    @err_decorator
+    def flushCommands(self):
+        self.cmdChannel.flush()
+
     # opens a specified folder in the windows explorer
     @err_decorator
     def openFolder(self, path):
@@ -732,6 +1351,7 @@ class SlaveLogic(QDialog):
     # writes the slave settings to file
     @err_decorator
     def createSettings(self, complement=False):
+        self.flushSettings()
         sConfig = {
             "settings": {
                 "updateTime": 10,
@@ -747,6 +1367,11 @@ class SlaveLogic(QDialog):
                 "showSlaveWindow": False,
                 "showInterruptWindow": False,
                 "maxConcurrentTasks": 2,
+                "logMaxSize": 10,
+                "logMaxAge": 0,
+                "logGenerations": 5,
+                "jobCacheSize": 50,
+                "prefetchRate": 20,
             },
             "slaveinfo": {},
         }
@@ -773,21 +1398,53 @@ class SlaveLogic(QDialog):
             sConfig = curConfig
 
         self.setConfig(configPath=self.slaveConf, confData=sConfig)
+        self.settings.reset()
 
-    # sets the slavestate and writes it to file
+    # sets the slavestate and writes it to the heartbeat. The settings are written immediately,
+    # when the slave is about to quit.
     @err_decorator
     def setState(self, state):
         if self.slaveState != state:
             self.slaveState = state
-            self.getConfSetting(
-                "status", section="slaveinfo", setval=True, value=self.slaveState
-            )
+            self.writeActive()
+
+        if state in ["restarting", "shut down"]:
+            self.flushSettings()
 
-    # checks if the slave can start rendering
+    # applies the log rotation settings to the log writer
     @err_decorator
+    def updateLogSettings(self):
+        logSettings = {"logMaxSize": 10, "logMaxAge": 0, "logGenerations": 5}
+        for setting in logSettings:
+            value = self.getConfSetting(setting)
+            if value is None:
+                self.getConfSetting(setting, setval=True, value=logSettings[setting])
+            else:
+                logSettings[setting] = value
+
+        self.logWriter.maxSize = int(logSettings["logMaxSize"] * 1024 * 1024)
+        self.logWriter.maxAge = logSettings["logMaxAge"] * 3600
+        self.logWriter.generations = logSettings["logGenerations"]
+
+    # checks if the slave can start rendering. The settings file is read once per cycle and
+    # the changed settings and queued commands are written at the end of the cycle.
     def checkAssignments(self):
+        self.settings.startCycle()
+        try:
+            return self.checkAssignmentsCycle()
+        finally:
+            self.settings.endCycle()
+            if self.settings.cycleDepth == 0:
+                self.flushSettings()
+
+            self.flushCommands()
+
+    @err_decorator
+    def checkAssignmentsCycle(self):
         self.writeLog("start checking assignments")
         self.writeActive()
+        self.flushCommands()
+        self.flushWarnings()
 
         debug = self.getConfSetting("debugMode")
         if debug is None:
@@ -796,6 +1453,20 @@ class SlaveLogic(QDialog):
         else:
             self.debugMode = debug
 
+        self.updateLogSettings()
+
+        cacheSize = self.getConfSetting("jobCacheSize")
+        if cacheSize is None:
+            self.getConfSetting("jobCacheSize", setval=True, value=50)
+        else:
+            self.jobCache.maxSize = int(cacheSize * 1024 ** 3)
+
+        prefetchRate = self.getConfSetting("prefetchRate")
+        if prefetchRate is None:
+            self.getConfSetting("prefetchRate", setval=True, value=20)
+        else:
+            self.jobPrefetcher.maxRate = int(prefetchRate * 1024 ** 2)
+
         slaveEnabled = self.getConfSetting("enabled")
         if slaveEnabled is None:
             self.getConfSetting("enabled", setval=True, value=True)
@@ -851,6 +1522,9 @@ class SlaveLogic(QDialog):
             self.writeLog("Pause ended. Changed slavestate to idle.")
             self.setState("idle")
 
+        if self.slaveState == "rendering":
+            self.prefetchJobs()
+
         if slaveEnabled and len(self.assignedTasks) > 0:
             for task in self.assignedTasks:
                 rcheck = self.preRenderCheck()
@@ -894,21 +1568,71 @@ class SlaveLogic(QDialog):
 
         self.logicTimer.start(self.updateTime * 1000)
 
-    # tells the server that this slave is currently running
+    # tells the server that this slave is currently running. The heartbeat file contains the
+    # state, the current tasks and the load of the slave and gets replaced atomically.
     @err_decorator
     def writeActive(self):
-        slaveActive = (
-            self.slavePath + "\\slaveActive_%s" % socket.gethostname()
-        )  # path for the RenderSlave active file. The modifing date is used to tell wether the slave is running
+        heartbeatPath = os.path.join(
+            self.slavePath, "slaveHeartbeat_%s.json" % socket.gethostname()
+        )
 
-        if (
-            os.path.exists(slaveActive)
-            and float(os.stat(slaveActive).st_size / 1024.0) > 10
-        ):
-            open(slaveActive, "w").close()
+        heartbeat = {
+            "time": time.time(),
+            "state": self.slaveState,
+            "curtasks": self.getCurTasksData(),
+            "cpuLoad": psutil.cpu_percent(),
+            "memLoad": psutil.virtual_memory().percent,
+            "jobCache": self.jobCache.getStats(),
+        }
+        heartbeat.update(getattr(self, "slaveInfo", {}))
+
+        try:
+            heartbeat["freeDisk"] = psutil.disk_usage(self.localSlavePath).free // (1024 ** 2)
+        except Exception:
+            heartbeat["freeDisk"] = None
 
-        with open(slaveActive, "a") as actFile:
-            actFile.write(" ")
+        with self.heartbeatLock:
+            tmpPath = "%s.tmp%s" % (heartbeatPath, os.getpid())
+            with open(tmpPath, "w") as heartbeatFile:
+                json.dump(heartbeat, heartbeatFile)
+
+            if pVersion == 3:
+                os.replace(tmpPath, heartbeatPath)
+            else:
+                if os.path.exists(heartbeatPath):
+                    os.remove(heartbeatPath)
+                os.rename(tmpPath, heartbeatPath)
+
+    # returns the fraction of the frames of a task, which were written to the output folder. The
+    # files are counted by the output watcher or at most every progressInterval seconds.
+    @err_decorator
+    def getTaskProgress(self, task, progressInterval=30):
+        if "existingOutputFileNum" not in task:
+            return 0
+
+        watcher = self.outputWatchers.get(task["jobcode"])
+        if watcher is not None:
+            newFiles = watcher.getFileNum(task["taskname"])
+        else:
+            if time.time() - task.get("outputCountTime", 0) >= progressInterval:
+                if self.localMode:
+                    basePath = task["outputFolder"]
+                else:
+                    basePath = os.path.join(
+                        self.localSlavePath, "RenderOutput", task["jobcode"]
+                    )
+
+                fileNum = 0
+                for i in os.walk(basePath):
+                    fileNum += len(i[2])
+
+                task["outputFileNum"] = fileNum
+                task["outputCountTime"] = time.time()
+
+            newFiles = max(0, task["outputFileNum"] - task["existingOutputFileNum"])
+
+        frameNum = task["taskEndframe"] - task["taskStartframe"] + 1
+        return round(min(1.0, newFiles / float(max(1, frameNum))), 2)
 
     # open a questionbox, which asks the user if this PC should start rendering.
     @err_decorator
@@ -956,9 +1680,17 @@ class SlaveLogic(QDialog):
         val = self.getConfSetting("command")
         self.getConfSetting("command", setval=True)
         if val is not None and val != "":
+            # the reset has to be written before the command runs. Otherwise a command, which
+            # restarts the slave or the PC, is executed again after the restart.
+            self.flushSettings()
             self.writeLog("checkCommands - execute: %s" % val, 1)
             try:
-                exec(val)
+                methodName, args, kwargs = parseMethodCall(val)
+                method = getattr(self, methodName, None)
+                if not callable(method):
+                    raise ValueError("unknown method: %s" % methodName)
+
+                method(*args, **kwargs)
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
                 self.writeLog(
@@ -975,7 +1707,7 @@ class SlaveLogic(QDialog):
             self.logicTimer.start(self.updateTime * 1000)
             return False
 
-        for i in sorted(os.listdir(self.slaveComPath)):
+        for i in sorted(os.listdir(self.slaveComPath), key=getCmdOrder):
             if not i.startswith("slaveIn_"):
                 continue
 
@@ -983,9 +1715,9 @@ class SlaveLogic(QDialog):
             with open(cmFile, "r") as comFile:
                 cmdText = comFile.read()
 
-            command = None
+            commands = []
             try:
-                command = eval(cmdText)
+                commands = parseCmds(cmdText, cmdSchemas)
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
                 self.writeLog(
@@ -994,7 +1726,8 @@ class SlaveLogic(QDialog):
                     3,
                 )
 
-            self.handleCmd(command, cmFile)
+            for command in commands:
+                self.handleCmd(command, cmFile)
 
             #           self.lastConnectionTime = time.time()
 
@@ -1057,46 +1790,11 @@ class SlaveLogic(QDialog):
                 warnText = command[1]
                 warnTime = command[2]
 
-                if not os.path.exists(self.slaveWarningsConf):
-                    self.writeLog(
-                        "ERROR - handle cmd - slave warningfile doesn't exist.", 2
-                    )
-                    return None
+                if self.warningStore.delete(warnText, warnTime):
+                    self.writeLog("warning deleted", 1)
 
-                warningConfig = self.core.getConfig(
-                    configPath=self.slaveWarningsConf, getConf=True, silent=True
-                )
-                if warningConfig == "Error":
-                    self.writeLog("Failed to read config: %s" % self.slaveWarningsConf, 2)
-                    warningConfig = {}
-
-                warnings = []
-                if "warnings" in warningConfig:
-                    for i in warningConfig["warnings"]:
-                        warnings.append(warningConfig["warnings"][i])
-
-                    warnPrev = len(warnings)
-                    warnings = [
-                        x for x in warnings if not (x[0] == warnText and x[1] == warnTime)
-                    ]
-
-                    if warnPrev != len(warnings):
-                        self.writeLog("warning deleted", 1)
-
-                warningConfig = {"warnings": {}}
-                for idx, val in enumerate(warnings):
-                    warningConfig["warnings"]["warning%s" % idx] = val
-
-                self.setConfig(configPath=self.slaveWarningsConf, confData=warningConfig)
             elif command[0] == "clearWarnings":
-                if not os.path.exists(self.slaveWarningsConf):
-                    self.writeLog(
-                        "ERROR - handle cmd - slave warningfile doesn't exist.", 2
-                    )
-                    return None
-
-                warnData = {"warnings": {}}
-                self.setConfig(configPath=self.slaveWarningsConf, confData=warnData)
+                self.warningStore.clear()
             elif command[0] == "deleteJob":
                 jobCode = command[1]
                 jobName = command[1]
@@ -1115,7 +1813,7 @@ class SlaveLogic(QDialog):
                             jobName = cData["jobName"]
 
                 if os.path.exists(jobPath):
-                    shutil.rmtree(jobPath)
+                    self.jobCache.removeJob(jobCode)
                     self.writeLog("deleted local job %s" % (jobName), 1)
                 else:
                     self.writeLog("job %s did not exist before deletion" % (jobName), 0)
@@ -1246,12 +1944,51 @@ class SlaveLogic(QDialog):
 
         return 0
 
+    # returns the frames of the task, which the dependent job renders, but which don't exist in
+    # its output yet. The frame number is taken from the last digits of the filename.
+    @err_decorator
+    def getMissingDepFrames(self, depName, depPath, taskData):
+        depConf = os.path.join(self.localSlavePath, "Jobs", depName, "PandoraJob.json")
+        if not os.path.exists(depConf):
+            depConf = os.path.join(self.slavePath, "AssignedJobs", depName, "PandoraJob.json")
+
+        depTasks = self.core.getConfig(
+            "jobtasks", configPath=depConf, getItems=True, silent=True
+        )
+        if type(depTasks) != dict:
+            return None
+
+        taskStart = int(taskData[0])
+        taskEnd = int(taskData[1])
+        depFrames = set()
+        for depTask in depTasks.values():
+            try:
+                start = max(int(depTask[0]), taskStart)
+                end = min(int(depTask[1]), taskEnd)
+            except:
+                continue
+
+            depFrames.update(range(start, end + 1))
+
+        existingFrames = set()
+        for i in os.walk(depPath):
+            for k in i[2]:
+                if isTransferTemp(k) or k.endswith(".lock"):
+                    continue
+
+                frameMatch = re.search(r"(\d+)\D*$", os.path.splitext(k)[0])
+                if frameMatch:
+                    existingFrames.add(int(frameMatch.group(1)))
+
+        return sorted(depFrames - existingFrames)
+
     # starts a render job
     @err_decorator
     def startRenderJob(self, command):
         jobCode = command["code"]
         jobName = command["name"]
         taskName = command["task"]
+        stagingStart = time.time()
 
         if self.interrupted:
             self.interrupted = False
@@ -1311,7 +2048,7 @@ class SlaveLogic(QDialog):
         if "jobDependecies" in jobData:
             depsFinished = [True]
             for jDep in jobData["jobDependecies"]:
-                if len(jDep) == 2:
+                if len(jDep) >= 2:
                     depName = jDep[0]
                     if self.localMode:
                         depConf = os.path.join(
@@ -1319,6 +2056,11 @@ class SlaveLogic(QDialog):
                                 self.localSlavePath, "Jobs", depName, "PandoraJob.json"
                             )
                         )
+                        if not os.path.exists(depConf):
+                            # the dependent job might be evicted from the job cache
+                            depConf = os.path.join(
+                                self.slavePath, "AssignedJobs", depName, "PandoraJob.json"
+                            )
                         if not os.path.exists(depConf):
                             self.writeLog(
                                 "Warning - dependent JobConfig does not exist %s" % depConf,
@@ -1352,6 +2094,26 @@ class SlaveLogic(QDialog):
                         )
                         return True
 
+                    # the dependent job can still be rendering. The coordinator assigns the task
+                    # only after the overlapping frames are finished, so they have to exist here.
+                    if len(jDep) >= 3 and jDep[2] == "frames":
+                        missingFrames = self.getMissingDepFrames(depName, depPath, tData)
+                        if missingFrames is None:
+                            self.writeLog(
+                                "Warning - For %s in job %s the tasks of the dependent job %s can't be read."
+                                % (taskName, jobName, depName),
+                                2,
+                            )
+                            return True
+
+                        if len(missingFrames) > 0:
+                            self.writeLog(
+                                "Warning - For %s in job %s the frames %s of the dependent job %s don't exist."
+                                % (taskName, jobName, missingFrames, depName),
+                                2,
+                            )
+                            return True
+
         sceneFile = os.path.join(localPath, sceneName)
         self.waitingForFiles = False
 
@@ -1365,6 +2127,26 @@ class SlaveLogic(QDialog):
 
                 epAssets = []
                 for m in passets:
+                    # assets with a hash are stored by their content and verified here
+                    if len(m) >= 3:
+                        aPath = os.path.join(self.slavePath, "ProjectAssets", "Blobs", m[2])
+                        if not os.path.exists(aPath):
+                            self.writeLog("Project asset missing: %s" % (m[0]))
+                            continue
+
+                        if self.assetHashes.getHash(aPath) != m[2]:
+                            self.writeLog(
+                                "Project asset is corrupt and gets removed: %s" % (m[0]), 2
+                            )
+                            try:
+                                os.remove(aPath)
+                            except:
+                                pass
+                            continue
+
+                        epAssets.append([aPath, m[0], m[2]])
+                        continue
+
                     aPath = os.path.join(paFolder, m[0])
 
                     if not os.path.exists(aPath) or int(os.path.getmtime(aPath)) != int(
@@ -1373,8 +2155,9 @@ class SlaveLogic(QDialog):
                         self.writeLog("Project asset missing or outdated: %s" % (aPath))
                         continue
 
-                    epAssets.append(aPath)
+                    epAssets.append([aPath, m[0], None])
 
+                self.assetHashes.save()
                 expNum -= len(epAssets)
 
             if os.path.exists(jobPath):
@@ -1402,6 +2185,9 @@ class SlaveLogic(QDialog):
         taskData.update(jobData)
         self.curTasks.append(taskData)
 
+        # the time in dialogs doesn't count as staging time
+        stagingTime = time.time() - stagingStart
+
         if not self.userAsked:
             result = self.openActiveQuestion()
             if result == 0:
@@ -1430,30 +2216,47 @@ class SlaveLogic(QDialog):
             bugButton.setVisible(False)
             self.msg.show()
 
-        if not os.path.exists(localPath):
-            shutil.copytree(
-                os.path.join(self.slavePath, "AssignedJobs", jobCode),
-                os.path.dirname(localPath),
+        stagingStart = time.time()
+        filesCopied = False
+        if self.jobCache.fetch(jobCode, os.path.join(self.slavePath, "AssignedJobs", jobCode)):
+            self.writeLog("job files of %s are cached already" % jobName)
+        else:
+            filesCopied = True
+
+        if jobCode in self.jobPrefetcher.stagingTimes:
+            self.writeLog(
+                "job files of %s were prefetched in %.1f s"
+                % (jobName, self.jobPrefetcher.stagingTimes.pop(jobCode))
             )
 
         if "projectAssets" in taskData:
-            for k in epAssets:
-                local_asset = os.path.join(localPath, os.path.basename(k))
-                if os.path.exists(local_asset) and os.path.getmtime(k) == os.path.getmtime(
-                    local_asset
-                ):
-                    continue
+            for k, assetName, assetHash in epAssets:
+                local_asset = os.path.join(localPath, assetName)
+                if os.path.exists(local_asset):
+                    if assetHash is not None:
+                        if self.assetHashes.getHash(local_asset) == assetHash:
+                            continue
+                    elif os.path.getmtime(k) == os.path.getmtime(local_asset):
+                        continue
 
                 try:
-                    shutil.copy2(k, localPath)
-                    self.writeLog("copy asset to slave repository: %s" % k)
+                    shutil.copy2(k, local_asset)
+                    filesCopied = True
+                    self.writeLog("copy asset to slave repository: %s" % assetName)
                 except:
                     self.writeLog(
                         "Could not copy file to Job folder: %s %s %s"
-                        % (taskData["projectName"], k, jobName),
+                        % (taskData["projectName"], assetName, jobName),
                         2,
                     )
 
+            self.assetHashes.save()
+            self.jobCache.updateSize(jobCode)
+
+        evicted = self.jobCache.evict(self.getActiveJobCodes())
+        if evicted:
+            self.writeLog("removed jobs from the job cache: %s" % ", ".join(evicted), 1)
+
         if self.localMode:
             basePath = taskData["outputFolder"]
         else:
@@ -1468,14 +2271,18 @@ class SlaveLogic(QDialog):
 
         taskData["existingOutputFileNum"] = fileNum
         self.taskStartTime = time.time()
+        taskData["startTime"] = self.taskStartTime
+        # the staging time is only reported, when files were copied for the task
+        if filesCopied:
+            taskData["stagingTime"] = stagingTime + self.taskStartTime - stagingStart
+        else:
+            taskData["stagingTime"] = 0
+
+        if not self.localMode and taskData.get("uploadOutput"):
+            self.startOutputWatcher(taskData, basePath)
 
         self.setState("rendering")
-        self.getConfSetting(
-            "curtasks",
-            section="slaveinfo",
-            setval=True,
-            value=self.getCurTasksData(),
-        )
+        self.writeActive()
 
         self.communicateOut(
             ["taskUpdate", jobCode, taskName, self.slaveState, "", self.taskStartTime, ""]
@@ -1503,6 +2310,46 @@ class SlaveLogic(QDialog):
 
         return True
 
+    # queues the job files of the assigned tasks, which can't start yet, and of the jobs, which
+    # were assigned to the slave recently, for the prefetch
+    @err_decorator
+    def prefetchJobs(self):
+        for jobCode, error in self.jobPrefetcher.popErrors():
+            self.writeLog("failed to prefetch the job files of %s: %s" % (jobCode, error), 2)
+
+        assignedPath = os.path.join(self.slavePath, "AssignedJobs")
+        jobCodes = [x["code"] for x in self.assignedTasks]
+        if os.path.exists(assignedPath):
+            for jobCode in os.listdir(assignedPath):
+                jobPath = os.path.join(assignedPath, jobCode)
+                if jobCode not in jobCodes and time.time() - os.path.getmtime(jobPath) < 3600:
+                    jobCodes.append(jobCode)
+
+        renderingJobs = self.getRenderingJobCodes()
+        for jobCode in jobCodes:
+            srcPath = os.path.join(assignedPath, jobCode)
+            if jobCode in renderingJobs or not os.path.exists(srcPath):
+                continue
+
+            with self.jobCache.lock:
+                if self.jobCache.isCached(jobCode, srcPath) or jobCode in self.jobCache.staging:
+                    continue
+
+            self.writeLog("prefetching the job files of %s" % jobCode)
+            self.jobPrefetcher.add(jobCode, srcPath)
+
+    # returns the codes of the jobs, which have a rendering task. A task, which is staged at the
+    # moment, has no start time yet. This is called from the prefetch thread too.
+    def getRenderingJobCodes(self):
+        return set(x["jobcode"] for x in list(self.curTasks) if "startTime" in x)
+
+    # returns the codes of the jobs, which have an assigned or rendering task
+    @err_decorator
+    def getActiveJobCodes(self):
+        jobCodes = set(x["jobcode"] for x in self.curTasks)
+        jobCodes.update(x["code"] for x in self.assignedTasks)
+        return jobCodes
+
     @err_decorator
     def getCurTasksData(self):
         curTasksData = []
@@ -1511,6 +2358,8 @@ class SlaveLogic(QDialog):
                 "jobname": task["jobname"],
                 "jobcode": task["jobcode"],
                 "taskname": task["taskname"],
+                "startTime": task.get("startTime"),
+                "progress": self.getTaskProgress(task),
             }
             curTasksData.append(data)
 
@@ -1771,16 +2620,24 @@ class SlaveLogic(QDialog):
         syncPath = os.path.join(self.slavePath, "Output", task["jobcode"])
 
         hasNewOutput = False
-        fileNum = 0
-        for i in os.walk(basePath):
-            for k in i[2]:
-                fpath = os.path.join(i[0], k)
-                if int(os.path.getmtime(fpath)) > self.taskStartTime:
-                    hasNewOutput = True
-                fileNum += 1
+        outputManifest = None
+        watcher = self.outputWatchers.get(task["jobcode"])
+        if watcher is not None:
+            # the frames were uploaded while rendering. Only the remaining files of this task are
+            # uploaded here, also if they aren't settled yet, because its renderer exited already.
+            watcher.scan(final=True, taskName=task["taskname"])
+            hasNewOutput = watcher.getUploadNum(task["taskname"]) > 0
+        else:
+            fileNum = 0
+            for i in os.walk(basePath):
+                for k in i[2]:
+                    fpath = os.path.join(i[0], k)
+                    if int(os.path.getmtime(fpath)) > self.taskStartTime:
+                        hasNewOutput = True
+                    fileNum += 1
 
-        if fileNum > task["existingOutputFileNum"]:
-            hasNewOutput = True
+            if fileNum > task["existingOutputFileNum"]:
+                hasNewOutput = True
 
         if program == "Python":
             hasNewOutput = True
@@ -1804,12 +2661,27 @@ class SlaveLogic(QDialog):
                 "rendering finished - %s - %s" % (task["taskname"], task["jobname"]), 1
             )
 
-        if (
+        if watcher is not None:
+            for filePath, targetPath, e in watcher.popErrors():
+                self.writeLog(
+                    "ERROR occured while copying files %s %s %s" % (e, filePath, targetPath),
+                    3,
+                )
+
+            outputManifest = watcher.popManifest(task["taskname"])
+            self.writeLog(
+                "uploaded files while rendering - %s files"
+                % watcher.getUploadNum(task["taskname"]),
+                1,
+            )
+            self.stopOutputWatcher(task)
+        elif (
             hasNewOutput
             and not self.localMode
             and "uploadOutput" in task
             and task["uploadOutput"]
         ):
+            transfer = self.core.getFileTransfer()
             for i in os.walk(basePath):
                 for k in i[2]:
                     if k.endswith(".exr.lock"):
@@ -1828,25 +2700,33 @@ class SlaveLogic(QDialog):
                             copyFile = False
 
                     if copyFile:
-                        folderExists = True
-                        if not os.path.exists(os.path.dirname(targetPath)):
-                            try:
-                                os.makedirs(os.path.dirname(targetPath))
-                            except:
-                                self.writeLog("could not create upload folder", 2)
-                                folderExists = False
+                        transfer.add(filePath, targetPath)
 
-                        if folderExists:
-                            try:
-                                shutil.copy2(filePath, targetPath)
-                            except Exception as e:
-                                self.writeLog(
-                                    "ERROR occured while copying files %s %s %s"
-                                    % (e, filePath, targetPath),
-                                    3,
-                                )
+            uploadFiles = list(transfer.pending)
+            transfer.run()
+            for filePath, targetPath, e in transfer.errors:
+                self.writeLog(
+                    "ERROR occured while copying files %s %s %s" % (e, filePath, targetPath),
+                    3,
+                )
 
-            self.writeLog("uploading files", 1)
+            # the files of this task, so that the coordinator doesn't need to search for them
+            failedFiles = set(x[0] for x in transfer.errors)
+            outputManifest = []
+            for filePath, targetPath in uploadFiles:
+                if filePath in failedFiles:
+                    continue
+
+                fileStat = os.stat(filePath)
+                outputManifest.append(
+                    [
+                        os.path.relpath(targetPath, syncPath).replace("\\", "/"),
+                        fileStat.st_size,
+                        fileStat.st_mtime,
+                    ]
+                )
+
+            self.writeLog("uploading files - %s" % transfer.getStats(), 1)
 
         if self.interrupted:
             self.communicateOut(
@@ -1878,7 +2758,7 @@ class SlaveLogic(QDialog):
 
                 if program not in ['Python']:
                     for i in os.walk(syncPath):
-                        outputNum += len(i[2])
+                        outputNum += len([x for x in i[2] if not isTransferTemp(x)])
 
                         for k in i[2]:
                             if os.path.splitext(k)[1] not in [
@@ -1903,6 +2783,10 @@ class SlaveLogic(QDialog):
                 time.time(),
                 outputNum,
             ]
+            cmd.append(outputManifest if status == "finished" else None)
+            if task.get("stagingTime"):
+                cmd.append(round(task["stagingTime"], 2))
+
             self.communicateOut(cmd)
 
             self.setState("idle")
@@ -1917,13 +2801,13 @@ class SlaveLogic(QDialog):
             self.msg.close()
 
         self.curTasks = [x for x in self.curTasks if not (x["jobcode"] == task["jobcode"] and x["taskname"] == task["taskname"])]
-        self.getConfSetting("curtasks", section="slaveinfo", setval=True, value=self.getCurTasksData())
+        self.writeActive()
+        self.flushCommands()
 
     # called by the user, if he wants to upload all renderings from the current job, before the job is finished
     @err_decorator
     def uploadCurJob(self):
         for task in self.curTasks:
-            uploadedFiles = 0
             syncPath = os.path.join(self.slavePath, "Output", task["jobcode"])
 
             basePath = os.path.join(
@@ -1932,41 +2816,71 @@ class SlaveLogic(QDialog):
                 task["jobcode"],
                 task["projectName"],
             )
+            transfer = self.core.getFileTransfer()
             for i in os.walk(basePath):
                 for k in i[2]:
                     filePath = os.path.join(i[0], k)
                     targetPath = filePath.replace(basePath, syncPath)
                     if not os.path.exists(targetPath):
-                        folderExists = True
-                        if not os.path.exists(os.path.dirname(targetPath)):
-                            try:
-                                os.makedirs(os.path.dirname(targetPath))
-                            except:
-                                self.writeLog("could not create upload folder", 2)
-                                folderExists = False
-                        if folderExists:
-                            try:
-                                shutil.copy2(filePath, targetPath)
-                                uploadedFiles += 1
-                            except:
-                                self.writeLog("ERROR occured while copying files", 3)
+                        transfer.add(filePath, targetPath)
+
+            if transfer.run() > 0:
+                self.writeLog("ERROR occured while copying files", 3)
 
+            uploadedFiles = transfer.copiedFiles
             self.writeLog(
-                "uploaded files from current job (%s): %s"
-                % (task["jobname"], uploadedFiles),
+                "uploaded files from current job (%s): %s - %s"
+                % (task["jobname"], uploadedFiles, transfer.getStats()),
                 1,
             )
 
+    # starts the upload of the output of a task while it renders. Tasks of the same job share one
+    # watcher, because they render to the same folder.
+    @err_decorator
+    def startOutputWatcher(self, task, basePath):
+        jobCode = task["jobcode"]
+        watcher = self.outputWatchers.get(jobCode)
+        if watcher is None:
+            syncPath = os.path.join(self.slavePath, "Output", jobCode)
+            watcher = OutputWatcher(
+                basePath,
+                syncPath,
+                task["startTime"],
+                self.core.getFileTransfer,
+                onUpload=lambda entries: self.communicateOut(["outputUpdate", jobCode, entries]),
+            )
+            self.outputWatchers[jobCode] = watcher
+
+        watcher.addTask(
+            task["taskname"], task["taskStartframe"], task["taskEndframe"], task["startTime"]
+        )
+
+    # removes the task from the output watcher of its job and returns the watcher. The watcher
+    # stops, when no other task of the job is rendering.
+    @err_decorator
+    def stopOutputWatcher(self, task):
+        watcher = self.outputWatchers.get(task["jobcode"])
+        if watcher is None:
+            return None
+
+        watcher.removeTask(task["taskname"])
+        if not watcher.tasks:
+            watcher.stop()
+            self.outputWatchers.pop(task["jobcode"], None)
+
+        return watcher
+
     # called when the rendering failed and writes out the error
     @err_decorator
     def renderingFailed(self, task):
+        self.stopOutputWatcher(task)
         self.stopRender()
         self.communicateOut(
             ["taskUpdate", task["jobcode"], task["taskname"], "ready", "", "", ""]
         )
         self.interrupted = False
         self.curTasks = [x for x in self.curTasks if not (x["jobcode"] == task["jobcode"] and x["taskname"] == task["taskname"])]
-        self.getConfSetting("curtasks", section="slaveinfo", setval=True, value=self.getCurTasksData())
+        self.writeActive()
         self.checkAssignments()
 
 
@@ -111,7 +111,7 @@ try:
     if "jobDependecies" in jobData:
         jobDeps = jobData["jobDependecies"]
         for jDep in jobDeps:
-            if len(jDep) == 2:
+            if len(jDep) >= 2:
                 depName = jDep[0]
 
                 if "localMode" in jobData and jobData["localMode"]:
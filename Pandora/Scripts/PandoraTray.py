@@ -56,6 +56,9 @@ from PySide2.QtWidgets import *
 
 from UserInterfacesPandora import qdarkstyle
 
+# unfinished transfers are skipped like in the coordinator
+from PandoraCore import isTransferTemp
+
 
 class PandoraTray:
     def __init__(self, core, silent=False):
@@ -364,12 +367,11 @@ class PandoraTray:
                             waitmsg.show()
                             QCoreApplication.processEvents()
 
-                            copiedNum = 0
-                            errors = 0
+                            transfer = self.core.getFileTransfer()
 
                             for o in os.walk(jobDir):
                                 for m in o[2]:
-                                    if m == "PandoraJob.json":
+                                    if m == "PandoraJob.json" or isTransferTemp(m):
                                         continue
 
                                     filePath = os.path.join(o[0], m)
@@ -392,20 +394,10 @@ class PandoraTray:
                                             copyFile = False
 
                                     if copyFile:
-                                        folderExists = True
-                                        if not os.path.exists(os.path.dirname(targetPath)):
-                                            try:
-                                                os.makedirs(os.path.dirname(targetPath))
-                                            except:
-                                                errors += 1
-                                                folderExists = False
-
-                                        if folderExists:
-                                            try:
-                                                shutil.copy2(filePath, targetPath)
-                                                copiedNum += 1
-                                            except:
-                                                errors += 1
+                                        transfer.add(filePath, targetPath)
+
+                            errors = transfer.run()
+                            copiedNum = transfer.copiedFiles
 
                             result["%s - %s" % (prj, job)] = [copiedNum, errors]
 